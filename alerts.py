@@ -0,0 +1,207 @@
+import bisect
+import collections
+import json
+import math
+import os
+import re
+import threading
+import time
+
+import tracing
+
+ALERTS_PATH = os.path.join(os.path.expanduser("~"), ".stockist", "alerts.json")
+
+# 알림 항목 -> 표시 이름
+FIELDS = {
+    "price": "현재가",
+    "rsi": "RSI",
+    "macd_hist": "MACD-시그널",
+    "bb_position": "볼린저 위치",
+    "discount": "적정주가 괴리율(%)",
+}
+
+# 규칙 입력에서 쓸 수 있는 다른 이름
+FIELD_ALIASES = {
+    "현재가": "price",
+    "macd": "macd_hist",
+    "bb": "bb_position",
+    "볼린저": "bb_position",
+    "괴리율": "discount",
+    "적정주가": "discount",
+}
+
+RULE_PATTERN = re.compile(r"^\s*([A-Za-z0-9.\-^=]+)\s+(\S+)\s*([<>])\s*(-?\d+(?:\.\d+)?)\s*$")
+
+Rule = collections.namedtuple("Rule", "id ticker field op threshold")
+Alert = collections.namedtuple("Alert", "rule previous value at")
+
+
+def alert_values(values, suitable_price=None):
+    """지표 값(compute_indicators/IndicatorState 형식) -> 알림 항목 값
+
+    볼린저 위치는 하단 밴드 0, 상단 밴드 1 (밴드 밖 종가는 0 미만/1 초과),
+    MACD-시그널이 0 을 지나면 교차, 괴리율이 0 을 지나면 적정주가를 지난 것이다.
+    """
+    result = {}
+    price = values.get("price")
+    if price is not None:
+        result["price"] = price
+    if values.get("rsi") is not None:
+        result["rsi"] = values["rsi"]
+    if values.get("macd") is not None and values.get("macd_signal") is not None:
+        result["macd_hist"] = values["macd"] - values["macd_signal"]
+    upper, lower = values.get("bb_upper"), values.get("bb_lower")
+    if price is not None and upper is not None and lower is not None and upper > lower:
+        result["bb_position"] = (price - lower) / (upper - lower)
+    if price is not None and suitable_price is not None and suitable_price > 0:
+        result["discount"] = (price - suitable_price) / suitable_price * 100
+    return {field: float(value) for field, value in result.items() if not math.isnan(value)}
+
+
+def parse_rule(text):
+    """'AAPL rsi > 70' -> (티커, 항목, 방향, 기준값)"""
+    match = RULE_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"알림 규칙 형식이 올바르지 않습니다: '{text}' (예: AAPL rsi > 70)")
+    ticker, field, op, threshold = match.groups()
+    field = FIELD_ALIASES.get(field, FIELD_ALIASES.get(field.lower(), field.lower()))
+    if field not in FIELDS:
+        raise ValueError(f"알 수 없는 알림 항목입니다: '{match.group(2)}' ({', '.join(FIELDS)})")
+    return ticker.upper(), field, op, float(threshold)
+
+
+def parse_rules(text):
+    # 세미콜론/줄바꿈으로 여러 규칙 입력
+    return [parse_rule(part) for part in re.split(r"[;\n]+", text) if part.strip()]
+
+
+def rule_text(rule):
+    return f"{rule.ticker} {rule.field} {rule.op} {rule.threshold:g}"
+
+
+class ThresholdIndex:
+    """한 (티커, 항목)의 기준값을 방향별로 정렬해 두고, 값이 움직인 구간의 규칙만 찾는다"""
+
+    def __init__(self):
+        # 방향 -> (정렬된 기준값, 같은 순서의 규칙 id)
+        self.sides = {">": ([], []), "<": ([], [])}
+
+    def __len__(self):
+        return sum(len(keys) for keys, _ in self.sides.values())
+
+    def add(self, rule):
+        keys, ids = self.sides[rule.op]
+        pos = bisect.bisect_right(keys, rule.threshold)
+        keys.insert(pos, rule.threshold)
+        ids.insert(pos, rule.id)
+
+    def remove(self, rule):
+        keys, ids = self.sides[rule.op]
+        pos = bisect.bisect_left(keys, rule.threshold)
+        while pos < len(keys) and keys[pos] == rule.threshold:
+            if ids[pos] == rule.id:
+                del keys[pos]
+                del ids[pos]
+                return
+            pos += 1
+
+    def crossed(self, previous, value):
+        """previous -> value 로 바뀔 때 기준값을 지난 규칙 id"""
+        if value > previous:
+            # 위로 돌파: previous <= 기준값 < value
+            keys, ids = self.sides[">"]
+            return ids[bisect.bisect_left(keys, previous):bisect.bisect_left(keys, value)]
+        if value < previous:
+            # 아래로 이탈: value < 기준값 <= previous
+            keys, ids = self.sides["<"]
+            return ids[bisect.bisect_right(keys, value):bisect.bisect_right(keys, previous)]
+        return []
+
+
+class AlertEngine:
+    """(티커, 항목)별 기준값 인덱스로 값이 바뀔 때 영향을 받는 규칙만 검사하는 알림 엔진
+
+    규칙은 값이 기준값을 지나는 순간(교차)에 한 번 울리고, 반대로 되돌아갔다가 다시 지나면 또 울린다.
+    처음 받은 값은 비교할 이전 값이 없으므로 기준으로만 쓴다.
+    """
+
+    def __init__(self):
+        self.rules = {}
+        self.indexes = collections.defaultdict(ThresholdIndex)
+        self.last_values = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rules)
+
+    def add_rule(self, ticker, field, op, threshold):
+        if op not in (">", "<"):
+            raise ValueError(f"알림 방향은 > 또는 < 입니다: '{op}'")
+        if field not in FIELDS:
+            raise ValueError(f"알 수 없는 알림 항목입니다: '{field}'")
+        with self._lock:
+            rule = Rule(self._next_id, ticker.upper(), field, op, float(threshold))
+            self._next_id += 1
+            self.rules[rule.id] = rule
+            self.indexes[(rule.ticker, field)].add(rule)
+        return rule
+
+    def remove_rule(self, rule_id):
+        with self._lock:
+            rule = self.rules.pop(rule_id, None)
+            if rule is not None:
+                self.indexes[(rule.ticker, rule.field)].remove(rule)
+        return rule
+
+    def clear(self):
+        with self._lock:
+            self.rules.clear()
+            self.indexes.clear()
+
+    def tickers(self):
+        with self._lock:
+            return sorted({rule.ticker for rule in self.rules.values()})
+
+    def update(self, ticker, values, at=None):
+        """티커의 새 항목 값들을 반영하고 이번에 울린 알림 목록을 반환"""
+        at = at if at is not None else time.time()
+        alerts = []
+        with self._lock:
+            for field, value in values.items():
+                key = (ticker, field)
+                previous = self.last_values.get(key)
+                self.last_values[key] = value
+                index = self.indexes.get(key)
+                if previous is None or index is None:
+                    continue
+                for rule_id in index.crossed(previous, value):
+                    alerts.append(Alert(self.rules[rule_id], previous, value, at))
+        if alerts:
+            tracing.count("alerts.fired", len(alerts))
+        return alerts
+
+    def save(self, path=None):
+        path = path or ALERTS_PATH
+        with self._lock:
+            rules = [rule_text(rule) for rule in self.rules.values()]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"rules": rules}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+
+    def load(self, path=None):
+        """저장된 규칙을 추가 (파일이 없거나 깨졌으면 무시)"""
+        path = path or ALERTS_PATH
+        try:
+            with open(path, encoding="utf-8") as f:
+                rules = json.load(f).get("rules", [])
+        except (OSError, ValueError):
+            return 0
+        for text in rules:
+            try:
+                self.add_rule(*parse_rule(text))
+            except ValueError:
+                continue
+        return len(rules)
@@ -0,0 +1,181 @@
+import tracing
+from lazy import lazy_import
+
+# 지표 계산(NumPy)은 실제로 쓸 때 import
+indicators = lazy_import("indicators")
+
+# 1분기 = 약 63 거래일
+QUARTER_DAYS = 63
+
+# 적정주가 계산에 반영하는 성장률(%)의 상한/하한
+GROWTH_CAP = 30
+# 적정주가 계산에 쓰는 PER 상한선
+PER_CAP = 50
+
+# RSI 과매수/과매도 기준
+RSI_OVERBOUGHT = 70
+RSI_OVERSOLD = 30
+
+
+def technical_indicators(close):
+    """종가 시리즈로 기술적 분석 탭에 표시하는 최신 지표 값을 계산"""
+    with tracing.span("indicators", "compute", bars=len(close)):
+        values = indicators.latest(indicators.compute_indicators(close.to_numpy()))
+    return {name: float(value) for name, value in values.items()}
+
+
+def technical_indicators_batch(closes):
+    """여러 종목의 종가 시리즈를 (종목 x 시간) 배열 하나로 묶어 한 번에 계산"""
+    tickers = list(closes)
+    if not tickers:
+        return {}
+    with tracing.span("indicators (batch)", "compute", tickers=len(tickers)):
+        matrix = indicators.stack_closes([closes[ticker].to_numpy() for ticker in tickers])
+        values = indicators.latest(indicators.compute_indicators(matrix))
+    return {
+        ticker: {name: float(arr[i]) for name, arr in values.items()}
+        for i, ticker in enumerate(tickers)
+    }
+
+
+def rsi_signal(rsi):
+    return "과매수" if rsi > RSI_OVERBOUGHT else "과매도" if rsi < RSI_OVERSOLD else "중립"
+
+
+def macd_signal(macd, signal):
+    return "매수" if macd > signal else "매도"
+
+
+def quarterly_growth_rates(close):
+    # 1년 데이터를 앞에서부터 63일씩 잘라 분기별 성장률(%) 계산
+    rates = []
+    for i in range(4):
+        if len(close) >= (i + 1) * QUARTER_DAYS:
+            start_price = close.iloc[i * QUARTER_DAYS]
+            end_price = close.iloc[(i + 1) * QUARTER_DAYS - 1]
+            rates.append(((end_price - start_price) / start_price) * 100)
+    return rates
+
+
+def period_growth_rate(close):
+    start_price = close.iloc[0]
+    end_price = close.iloc[-1]
+    return ((end_price - start_price) / start_price) * 100
+
+
+def clamp_growth_rate(growth_rate, cap=GROWTH_CAP):
+    return min(max(growth_rate, -cap), cap)
+
+
+def average_growth_rate(yearly_close, recent_close):
+    # 분기별 성장률 평균, 1년치 데이터가 부족하면 최근 구간 성장률로 대체
+    rates = quarterly_growth_rates(yearly_close)
+    if rates:
+        return sum(rates) / len(rates)
+    return period_growth_rate(recent_close)
+
+
+def estimate_growth_rate(yearly_close, recent_close, cap=GROWTH_CAP):
+    return clamp_growth_rate(average_growth_rate(yearly_close, recent_close), cap)
+
+
+def fair_price(eps, per, growth_rate):
+    """PEG 비율을 고려한 적정주가 계산. (조정된 PER, 적정주가) 반환"""
+    # PER 상한선 설정
+    adjusted_per = min(per, PER_CAP)
+
+    if growth_rate > 0:
+        peg_ratio = adjusted_per / growth_rate
+        if peg_ratio > 2:  # PEG 비율이 2 이상이면 고평가
+            suitable_price = eps * (adjusted_per * 0.8)  # 20% 할인
+        else:
+            suitable_price = eps * (adjusted_per + growth_rate * 0.5)  # 성장률의 50%만 반영
+    else:
+        suitable_price = eps * adjusted_per  # 성장률이 없거나 마이너스일 경우
+
+    return adjusted_per, suitable_price
+
+
+def price_diff_ratio(current_price, suitable_price):
+    """현재가와 적정주가의 차이(%). 적정주가가 0 이하(EPS 적자)면 비교할 수 없으므로 None"""
+    if suitable_price <= 0:
+        return None
+    return abs(current_price - suitable_price) / suitable_price * 100
+
+
+def discount_ratio(current_price, suitable_price):
+    """적정주가 대비 현재가 괴리율(%, 음수면 저평가). 적정주가가 0 이하면 None"""
+    if suitable_price <= 0:
+        return None
+    return (current_price - suitable_price) / suitable_price * 100
+
+
+VERDICT_TEXTS = {
+    "적정": "적정 가격대에서 거래되고 있습니다.",
+    "매우 고평가": "매우 고평가 되어 있습니다. 투자에 신중을 기해야 합니다.",
+    "다소 고평가": "다소 고평가 되어 있습니다.",
+    "매우 저평가": "매우 저평가 되어 있습니다. 단, 해당 기업의 재무상태와 시장 상황을 추가로 검토하세요.",
+    "다소 저평가": "다소 저평가 되어 있습니다.",
+}
+
+
+def valuation_category(current_price, suitable_price):
+    # 고평가/저평가 판단 기준
+    diff_ratio = price_diff_ratio(current_price, suitable_price)
+
+    if diff_ratio is None:
+        return None
+    elif diff_ratio <= 10:
+        return "적정"
+    elif current_price > suitable_price:
+        return "매우 고평가" if diff_ratio > 30 else "다소 고평가"
+    else:
+        return "매우 저평가" if diff_ratio > 30 else "다소 저평가"
+
+
+def valuation_verdict(current_price, suitable_price):
+    category = valuation_category(current_price, suitable_price)
+    if category is None:
+        return "적정주가가 0 이하(EPS 적자)라 판단할 수 없습니다."
+    return VERDICT_TEXTS[category]
+
+
+def industry_per_comparison(per, industry_per):
+    per_ratio = per / industry_per
+    text = f"\n\n업종 평균 PER과의 비교:"
+    if per_ratio > 1.5:
+        text += f"\n현재 PER이 업종 평균 대비 {per_ratio:.1f}배로 매우 고평가 상태입니다."
+    elif per_ratio > 1.2:
+        text += f"\n현재 PER이 업종 평균 대비 {per_ratio:.1f}배로 다소 고평가 상태입니다."
+    elif per_ratio > 0.8:
+        text += f"\n현재 PER이 업종 평균 대비 적정 수준입니다. (업종 평균의 {per_ratio:.1f}배)"
+    else:
+        text += f"\n현재 PER이 업종 평균 대비 {per_ratio:.1f}배로 저평가 상태입니다."
+    return text
+
+
+def valuation_report(eps, per, current_price, growth_rate, industry_per=None, growth_cap=GROWTH_CAP):
+    """이미 받은 값(EPS, PER, 현재가, 상한 적용 전 성장률)만으로 적정주가 분석 텍스트를 만든다 (I/O 없음)"""
+    growth_rate = clamp_growth_rate(growth_rate, growth_cap)
+
+    # PEG 비율을 고려한 적정주가 계산
+    adjusted_per, suitable_price = fair_price(eps, per, growth_rate)
+
+    valuation_text = f"""
+            EPS (주당순이익): ${eps:.2f}
+            PER (주가수익비율): {per:.2f} {'(고평가 위험)' if per > PER_CAP else ''}
+            조정된 PER: {adjusted_per:.2f}
+            1년 평균 분기 성장률: {growth_rate:.2f}%
+            현재 주가: ${current_price:.2f}
+            적정주가: ${suitable_price:.2f}
+            
+            PEG 비율: {(per/growth_rate if growth_rate > 0 else 'N/A')}
+            
+            분석 결과: """
+
+    valuation_text += valuation_verdict(current_price, suitable_price)
+
+    if industry_per:
+        valuation_text += industry_per_comparison(per, industry_per)
+
+    return valuation_text
@@ -0,0 +1,237 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import indicators
+import tracing
+from analysis import RSI_OVERBOUGHT, RSI_OVERSOLD
+
+# 1년 거래일 수 (연환산 수익률)
+TRADING_DAYS = 252
+
+# 전략별 기본 파라미터 조합 (기술적 분석 탭의 기본값 포함)
+DEFAULT_GRIDS = {
+    # RSI 과매도에서 매수, 과매수에서 매도
+    "rsi": {
+        "window": (7, indicators.RSI_WINDOW, 21),
+        "lower": (20, 25, RSI_OVERSOLD),
+        "upper": (RSI_OVERBOUGHT, 75, 80),
+    },
+    # MACD 가 시그널선 위에 있는 동안 보유 ("매수" 신호)
+    "macd": {
+        "fast": (5, 8, indicators.MACD_FAST),
+        "slow": (indicators.MACD_SLOW, 35),
+        "signal": (5, indicators.MACD_SIGNAL),
+    },
+    # 종가가 하단 밴드 아래면 매수, 상단 밴드 위면 매도
+    "bollinger": {
+        "window": (10, indicators.BB_WINDOW, 30),
+        "dev": (1.5, indicators.BB_DEV, 2.5),
+    },
+}
+STRATEGIES = tuple(DEFAULT_GRIDS)
+
+METRICS = ("total_return", "annual_return", "buy_hold_return", "max_drawdown", "hit_rate", "trades", "exposure")
+
+
+def param_grid(grid):
+    """{이름: 값 목록} -> 모든 조합의 파라미터 dict 목록"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def params_label(params):
+    return " ".join(f"{name}={value}" for name, value in params.items())
+
+
+def last_seen(mask):
+    """봉마다 mask 가 마지막으로 True 였던 위치 (없으면 -1)"""
+    steps = np.where(mask, np.arange(mask.shape[-1]), -1)
+    return np.maximum.accumulate(steps, axis=-1, out=steps)
+
+
+def hold_between(entries, exits):
+    """진입 신호부터 청산 신호 전까지 True 인 보유 배열 (봉마다 Python 루프 없이 마지막 신호 위치를 비교)"""
+    return last_seen(entries) > last_seen(exits)
+
+
+class Indicators:
+    """여러 파라미터 조합이 같은 지표를 다시 계산하지 않도록 윈도우별로 보관"""
+
+    def __init__(self, closes):
+        self.closes = closes
+        self.sums = indicators.RollingSums(closes)
+        self._cache = {}
+
+    def _get(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def rsi(self, window):
+        return self._get(("rsi", window), lambda: indicators.rsi(self.closes, window))
+
+    def ema(self, span):
+        return self._get(("ema", span), lambda: indicators.ema(self.closes, 2 / (span + 1), span))
+
+    def macd(self, fast, slow, signal):
+        # 단기/장기 EMA 는 여러 조합이 함께 쓴다
+        macd_line = self._get(("macd", fast, slow), lambda: self.ema(fast) - self.ema(slow))
+        signal_line = self._get(("macd_signal", fast, slow, signal),
+                                lambda: indicators.ema(macd_line, 2 / (signal + 1), signal))
+        return macd_line, signal_line
+
+    def bollinger(self, window, dev):
+        middle = self._get(("bb_middle", window), lambda: self.sums.mean(window))
+        std = self._get(("bb_std", window), lambda: self.sums.std(window))
+        return middle + dev * std, middle - dev * std
+
+
+def rsi_positions(ind, window, lower, upper):
+    # analysis.rsi_signal 과 같은 기준: 과매도(< lower) 진입, 과매수(> upper) 청산
+    values = ind.rsi(window)
+    return hold_between(values < lower, values > upper)
+
+
+def macd_positions(ind, fast, slow, signal):
+    # analysis.macd_signal 과 같은 기준: MACD > 시그널 이면 보유
+    macd_line, signal_line = ind.macd(fast, slow, signal)
+    return macd_line > signal_line
+
+
+def bollinger_positions(ind, window, dev):
+    upper, lower = ind.bollinger(window, dev)
+    return hold_between(ind.closes < lower, ind.closes > upper)
+
+
+POSITION_FUNCTIONS = {
+    "rsi": rsi_positions,
+    "macd": macd_positions,
+    "bollinger": bollinger_positions,
+}
+
+
+def log_returns(closes):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = np.diff(np.log(closes), axis=-1, prepend=np.nan)
+    # 상장 전/빠진 봉은 수익률 0
+    return np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def evaluate(positions, returns, cost=0.0, bars=None):
+    """(종목 x 시간) 보유 여부 배열과 로그수익률로 성과 지표를 종목별로 계산
+
+    신호는 봉 종가에서 확인하고 다음 봉부터 보유한다고 가정 (미래 정보 사용 없음).
+    cost 는 매수/매도 한 번당 비용 비율. bars 는 종목별 실제 봉 수 (없으면 배열 길이).
+    """
+    rows, length = positions.shape
+    held = np.zeros_like(positions)
+    held[:, 1:] = positions[:, :-1]
+    strategy = np.where(held, returns, 0.0)
+    if cost:
+        strategy[positions != held] += np.log1p(-cost)
+    equity = np.cumsum(strategy, axis=-1)
+
+    # 최대 낙폭: 누적 최고점(시작 자본 포함) 대비 하락률의 최솟값
+    peak = np.maximum.accumulate(equity, axis=-1)
+    np.maximum(peak, 0.0, out=peak)
+    max_drawdown = np.expm1((equity - peak).min(axis=-1))
+
+    # 거래별 수익: 진입 직전부터 청산 봉(또는 마지막 봉)까지의 누적 로그수익 (진입/청산 비용 포함)
+    # 진입과 청산은 종목마다 번갈아 나오므로 위치 순서대로 짝이 맞는다
+    entries = positions & ~held
+    exits = held & ~positions
+    exits[:, -1] |= positions[:, -1]
+    entry_at = np.flatnonzero(entries)
+    exit_at = np.flatnonzero(exits)
+    flat_equity = equity.ravel()
+    trade_returns = flat_equity[exit_at] - (flat_equity[entry_at] - strategy.ravel()[entry_at])
+    trade_rows = exit_at // length
+    trades = np.bincount(trade_rows, minlength=rows)
+    wins = np.bincount(trade_rows, weights=trade_returns > 0, minlength=rows)
+
+    # 상장 전 NaN 으로 채운 구간은 빼고 종목마다 자기 기간으로 연환산
+    bars = np.full(rows, length) if bars is None else np.asarray(bars)
+    days = np.maximum(bars - 1, 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "total_return": np.expm1(equity[:, -1]) * 100,
+            "annual_return": np.expm1(equity[:, -1] * TRADING_DAYS / days) * 100,
+            "buy_hold_return": np.expm1(returns.sum(axis=-1)) * 100,
+            "max_drawdown": max_drawdown * 100,
+            "hit_rate": np.where(trades > 0, wins / trades * 100, np.nan),
+            "trades": trades,
+            "exposure": held.sum(axis=-1) / bars * 100,
+        }
+
+
+def run(closes, grids=None, cost=0.0):
+    """(종목 x 시간) 종가 배열에 전략/파라미터 조합을 모두 적용. [(전략, 파라미터, 지표 dict)] 반환"""
+    grids = grids or DEFAULT_GRIDS
+    ind = Indicators(closes)
+    returns = log_returns(closes)
+    bars = np.isfinite(closes).sum(axis=-1)
+    results = []
+    for strategy, grid in grids.items():
+        for params in param_grid(grid):
+            with tracing.span(f"backtest {strategy}", "compute", params=params_label(params)):
+                positions = POSITION_FUNCTIONS[strategy](ind, **params)
+                results.append((strategy, params, evaluate(positions, returns, cost, bars)))
+    return results
+
+
+def _run_task(task):
+    closes, grids, cost = task
+    return run(closes, grids, cost)
+
+
+def backtest(closes, grids=None, cost=0.0, workers=1):
+    """{티커: 종가 시리즈} 전체를 백테스트해 (티커, 전략, 파라미터)별 성과 DataFrame 으로 반환
+
+    workers > 1 이면 종목을 나눠 프로세스 풀에서 계산한다.
+    """
+    tickers = list(closes)
+    if not tickers:
+        return pd.DataFrame(columns=["ticker", "strategy", "params", *METRICS])
+    matrix = indicators.stack_closes([closes[ticker].to_numpy() for ticker in tickers])
+
+    workers = min(workers or os.cpu_count() or 1, len(tickers))
+    if workers <= 1:
+        results = run(matrix, grids, cost)
+    else:
+        rows = np.array_split(np.arange(len(tickers)), workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(_run_task, [(matrix[r], grids, cost) for r in rows]))
+        # 조각마다 같은 순서로 전략/파라미터를 돌렸으므로 같은 위치끼리 종목 방향으로 이어 붙인다
+        results = [
+            (strategy, params, {name: np.concatenate([output[i][2][name] for output in outputs])
+                                for name in metrics})
+            for i, (strategy, params, metrics) in enumerate(outputs[0])
+        ]
+
+    frames = []
+    for strategy, params, metrics in results:
+        frame = pd.DataFrame(metrics)
+        frame.insert(0, "params", params_label(params))
+        frame.insert(0, "strategy", strategy)
+        frame.insert(0, "ticker", tickers)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def summarize(results):
+    """전략/파라미터별 종목 평균 성과 (평균 수익률이 높은 순서)"""
+    summary = results.groupby(["strategy", "params"], sort=False).agg(
+        tickers=("ticker", "count"),
+        total_return=("total_return", "mean"),
+        annual_return=("annual_return", "mean"),
+        buy_hold_return=("buy_hold_return", "mean"),
+        max_drawdown=("max_drawdown", "mean"),
+        hit_rate=("hit_rate", "mean"),
+        trades=("trades", "sum"),
+        exposure=("exposure", "mean"),
+    )
+    return summary.sort_values("total_return", ascending=False).reset_index()
@@ -0,0 +1,280 @@
+"""가짜 데이터 공급자(fake_provider)로 네트워크 없이 주요 작업의 실행 시간을 측정해 JSON 으로 출력
+
+    python bench.py                      # 전체 (20년 일봉 x 500종목 포함)
+    python bench.py --quick              # 큰 데이터 제외
+    python bench.py --only chart --repeat 10 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+# 화면이 없는 서버에서도 표/차트를 그릴 수 있도록
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+import pandas as pd
+
+import alerts
+import analysis
+import backtest
+import core
+import fake_provider
+import resample
+import screener
+import symbols
+from market_data import TickerSession
+
+# 이름 -> (봉 간격, 봉 수): 15분봉 1개월 ~ 일봉 20년
+SIZES = {
+    "15m_1mo": ("15m", fake_provider.period_bars("1mo", "15m")),
+    "1h_3mo": ("1h", fake_provider.period_bars("3mo", "1h")),
+    "1d_1y": ("1d", fake_provider.period_bars("1y", "1d")),
+    "1d_5y": ("1d", fake_provider.period_bars("5y", "1d")),
+    "1d_20y": ("1d", fake_provider.period_bars("20y", "1d")),
+}
+
+# 여러 종목을 한 번에 계산하는 벤치마크의 종목 수
+UNIVERSE = 500
+
+
+def measure(fn, repeat, setup=None):
+    """fn 을 repeat 번 실행한 시간(ms) 목록 (setup 은 매번 fn 전에 실행되며 시간에 포함하지 않는다)"""
+    fn(*(setup() if setup else ()))  # 첫 실행(import, 캐시 준비)은 제외
+    times = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        fn(*args)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+class Bench:
+    def __init__(self, repeat, only=None):
+        self.repeat = repeat
+        self.only = only
+        self.results = []
+
+    def run(self, name, fn, size=None, bars=None, setup=None, repeat=None):
+        if self.only and not any(name.startswith(prefix) for prefix in self.only):
+            return
+        times = measure(fn, repeat or self.repeat, setup)
+        result = {
+            "name": name,
+            "size": size,
+            "bars": bars,
+            "repeat": len(times),
+            "min_ms": min(times),
+            "median_ms": statistics.median(times),
+            "mean_ms": statistics.fmean(times),
+        }
+        self.results.append(result)
+        print(f"{name:<28} {size or '':<16} {result['median_ms']:10.3f} ms (min {result['min_ms']:.3f})",
+              file=sys.stderr)
+
+
+def bench_indicators(bench, sizes):
+    for size, (interval, bars) in sizes.items():
+        close = fake_provider.synthetic_ohlcv("AAPL", bars, interval)["Close"]
+        bench.run("indicators", lambda: analysis.technical_indicators(close), size, bars)
+
+
+def bench_resample(bench, sizes):
+    # 차트 기간 전환: 받아 둔 시세를 더 굵은 봉으로 묶는 시간
+    for size, (interval, bars) in sizes.items():
+        target = {"15m": "1h", "1h": "1d", "1d": "1wk"}[interval]
+        hist = fake_provider.synthetic_ohlcv("AAPL", bars, interval)
+        bench.run("resample", lambda: resample.resample_ohlcv(hist, interval, target), f"{size}->{target}", bars)
+
+
+def bench_indicators_universe(bench):
+    bars = SIZES["1d_20y"][1]
+    closes = {f"T{i:03d}": fake_provider.synthetic_ohlcv(f"T{i:03d}", bars)["Close"] for i in range(UNIVERSE)}
+    size = f"{UNIVERSE}x1d_20y"
+    bench.run("indicators.batch", lambda: analysis.technical_indicators_batch(closes), size, bars, repeat=3)
+
+    matrix = np.vstack([close.to_numpy() for close in closes.values()])
+    eps = np.array([fake_provider.FakeTicker(ticker).info["trailingEps"] for ticker in closes])
+    per = matrix[:, -1] / eps
+    bench.run("valuation.screener", lambda: screener.screen(list(closes), matrix, eps, per), size, bars, repeat=3)
+
+    # 10년 일봉 x 전략별 기본 파라미터 조합 전체
+    decade = {ticker: close.iloc[-SIZES["1d_20y"][1] // 2:] for ticker, close in closes.items()}
+    grids = sum(len(backtest.param_grid(grid)) for grid in backtest.DEFAULT_GRIDS.values())
+    bench.run("backtest", lambda: backtest.backtest(decade), f"{UNIVERSE}x1d_10y x{grids}",
+              len(next(iter(decade.values()))), repeat=1)
+
+
+def bench_alerts(bench, rules=10000):
+    # 워치리스트 갱신 한 번: 종목마다 새 지표 값을 넣고 기준값을 지난 규칙만 찾는 시간
+    rng = np.random.default_rng(0)
+    tickers = [f"T{i:03d}" for i in range(UNIVERSE)]
+    engine = alerts.AlertEngine()
+    for _ in range(rules):
+        engine.add_rule(tickers[rng.integers(UNIVERSE)], rng.choice(["price", "rsi", "bb_position"]),
+                        rng.choice([">", "<"]), rng.uniform(0, 100))
+    rounds = [{ticker: {"price": float(rng.uniform(0, 100)), "rsi": float(rng.uniform(0, 100)),
+                        "bb_position": float(rng.uniform(0, 100))} for ticker in tickers} for _ in range(8)]
+    state = {"round": 0}
+
+    def update_all():
+        values = rounds[state["round"] % len(rounds)]
+        state["round"] += 1
+        for ticker in tickers:
+            engine.update(ticker, values[ticker])
+
+    bench.run("alerts.update", update_all, f"{UNIVERSE}x{rules}rules")
+
+
+def bench_symbols(bench, size=30000):
+    # 자동완성: 타자 한 번마다 티커/종목명 접두사 후보를 찾는 시간
+    entries = symbols.parse_directory(fake_provider.synthetic_directory(size))
+    bench.run("symbols.index", lambda: symbols.SymbolIndex(entries), f"{size}symbols", repeat=3)
+    index = symbols.SymbolIndex(entries)
+    for query in ("A", "AAP", "micro", "glob ene", "appel"):
+        bench.run("symbols.search", lambda: index.search(query), f"{size}:{query}")
+
+
+def bench_valuation(bench):
+    with fake_provider.installed():
+        inputs = core.valuation_inputs(TickerSession("AAPL"))
+        bench.run("valuation.report", lambda: analysis.valuation_report(
+            inputs["eps"], inputs["per"], inputs["current_price"], inputs["growth_rate"], industry_per=20))
+        # 새 세션: 디스크 캐시는 채워진 상태, EPS/PER 은 TTL 캐시에서
+        bench.run("valuation.inputs", lambda: core.valuation_inputs(TickerSession("AAPL")))
+        bench.run("analyze", lambda: core.analyze("AAPL"), "warm_cache")
+
+
+def bench_tables(bench):
+    from PyQt5.QtWidgets import QApplication, QTableView
+    import table_model
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    model = table_model.DataFrameModel()
+    view = QTableView()
+    view.setModel(model)
+    view.resize(1000, 600)
+
+    frames = {
+        "annual": fake_provider.synthetic_statement("AAPL", "financials"),
+        "500x80": pd.DataFrame(np.random.default_rng(0).uniform(1e6, 1e11, (500, 80)),
+                               index=[f"row {i}" for i in range(500)],
+                               columns=pd.date_range("2005-03-31", periods=80, freq="QE")),
+    }
+    for size, frame in frames.items():
+        def populate(frame=frame):
+            model.set_frame(frame)
+            view.grab()  # 보이는 셀만 그려진다
+        bench.run("table.financials", populate, size, frame.size)
+
+    import main
+    rows = [dict(watchlist_row, ticker=f"T{i:03d}") for i, watchlist_row in enumerate(
+        [{"price": 100.0, "rsi": 50.0, "rsi_signal": "중립", "macd_signal": "매수", "ma20": 99.0,
+          "ma50": 98.0, "ma200": 90.0, "eps": 5.0, "per": 20.0, "growth_rate": 3.0,
+          "suitable_price": 105.0, "discount": -4.8, "category": "적정"}] * UNIVERSE)]
+
+    # 창이 불러오는 종목 목록/알림 규칙/스냅샷도 가짜로 (사용자 파일을 읽거나 네트워크에 나가지 않도록)
+    with fake_provider.installed():
+        window = main.StockAnalyzer()
+        app.processEvents()
+        window.symbol_tasks.pool.waitForDone()
+
+        def reset():
+            window.watchlist_table.setRowCount(0)
+            window.watchlist_done = 0
+            window.watchlist_total = UNIVERSE
+            return ()
+
+        def populate_watchlist():
+            for row in rows:
+                window.add_watchlist_row(row)
+
+        bench.run("table.watchlist", populate_watchlist, f"{UNIVERSE}_rows", UNIVERSE, setup=reset, repeat=3)
+        app.processEvents()
+
+
+def bench_chart(bench, sizes):
+    from PyQt5.QtWidgets import QApplication
+    import chart
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    # 폰트 탐색 결과도 임시 폴더에 저장되도록 가짜 환경 안에서 차트를 만든다
+    with fake_provider.installed():
+        controller = chart.ChartController()
+        controller.canvas.resize(1200, 700)
+        period = {"15m": "1개월", "1h": "3개월", "1d": "1년"}
+
+        for size, (interval, bars) in sizes.items():
+            hist = fake_provider.synthetic_ohlcv("AAPL", bars, interval)
+            keys = iter(range(10 ** 9))
+
+            def render(hist=hist, interval=interval):
+                # 매번 다른 티커로 축/범례까지 다시 그리는 경로를 잰다
+                controller.update(f"T{next(keys)}", period[interval], interval, hist)
+                controller.canvas.draw()
+
+            bench.run("chart.render", render, size, bars)
+
+            last = hist.copy()
+
+            def refresh(interval=interval):
+                # 같은 차트에서 마지막 봉만 바뀌는 경우 (블리팅)
+                last.iloc[-1, last.columns.get_loc("Close")] *= 1.0001
+                controller.update("AAPL", period[interval], interval, last)
+
+            controller.update("AAPL", period[interval], interval, last)
+            controller.canvas.draw()
+            bench.run("chart.refresh", refresh, size, bars)
+        app.processEvents()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stockist 벤치마크 (가짜 데이터, 네트워크 없음)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help=f"{UNIVERSE}종목/20년 데이터 벤치마크 제외")
+    parser.add_argument("--only", action="append", help="이 이름으로 시작하는 벤치마크만 실행 (여러 번 지정 가능)")
+    parser.add_argument("--output", help="결과 JSON 파일 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    sizes = dict(SIZES)
+    if args.quick:
+        sizes.pop("1d_20y")
+
+    bench = Bench(args.repeat, args.only)
+    bench_indicators(bench, sizes)
+    bench_resample(bench, sizes)
+    if not args.quick:
+        bench_indicators_universe(bench)
+    bench_alerts(bench)
+    bench_symbols(bench)
+    bench_valuation(bench)
+    bench_tables(bench)
+    bench_chart(bench, sizes)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "repeat": args.repeat,
+        },
+        "results": bench.results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    else:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+import matplotlib.dates as mdates
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+
+import downsample
+import indicators
+import tracing
+from fonts import setup_korean_font
+
+BACKGROUND_COLOR = '#1e1e1e'
+PRICE_COLOR = '#2962ff'
+VOLUME_COLOR = '#45aaf2'
+
+# 거래량 막대 하나가 차지하는 최소 픽셀 폭
+VOLUME_BUCKET_PIXELS = 3
+
+INTERVAL_DISPLAY = {
+    "15m": "15분",
+    "1h": "1시간",
+    "1d": "일간",
+    "1wk": "주간"
+}
+
+
+class TracedCanvas(FigureCanvas):
+    """실제 다시 그리기(draw) 시간을 기록하는 캔버스"""
+
+    def draw(self):
+        with tracing.span("chart draw", "render"):
+            super().draw()
+
+
+class ChartController:
+    """figure/axes/선/거래량 아티스트를 한 번만 만들고, 갱신 시에는 데이터만 교체한다"""
+
+    def __init__(self):
+        setup_korean_font()
+
+        # pyplot 에 등록하지 않는 Figure 를 써서 갱신해도 figure 가 쌓이지 않는다
+        self.figure = Figure(figsize=(12, 7), facecolor=BACKGROUND_COLOR)
+        self.canvas = TracedCanvas(self.figure)
+        self.ax = self.figure.add_axes([0.1, 0.2, 0.8, 0.7])  # [left, bottom, width, height]
+        self.volume_ax = self.figure.add_axes([0.1, 0.1, 0.8, 0.1], sharex=self.ax)
+
+        # 가격 차트와 이동평균선
+        self.price_line, = self.ax.plot([], [], label='종가', color=PRICE_COLOR, linewidth=1.5)
+        self.ma_lines = [
+            self.ax.plot([], [], color='#ff6b6b', linestyle='--', linewidth=1)[0],
+            self.ax.plot([], [], color='#51cf66', linestyle='--', linewidth=1)[0],
+        ]
+
+        # 거래량은 막대 하나하나가 아닌 하나의 컬렉션으로 그린다
+        self.volume_bars = PolyCollection([], facecolors=VOLUME_COLOR, alpha=0.3, edgecolors='none')
+        self.volume_ax.add_collection(self.volume_bars)
+
+        self._style_axes()
+
+        self.key = None
+        self.background = None
+        # 화면에 그릴 때마다 구간을 다시 나누기 위한 원본 데이터 (x, 종가, 이동평균들, 거래량)
+        self.x = None
+        self.closes = None
+        self.ma_values = []
+        self.volumes = None
+        # 화면에 그린 거래량 막대 중 가장 높은 값 (구간 합계라 확대/축소하면 바뀐다)
+        self.volume_peak = 0.0
+        self._rendering = False
+        # 블리팅 시 배경 위에 다시 그리는 아티스트
+        self.animated = [self.price_line, *self.ma_lines, self.volume_bars]
+        for artist in self.animated:
+            artist.set_animated(True)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.mpl_connect('resize_event', self._on_resize)
+        # 확대/이동 시 보이는 구간만 화면 폭에 맞게 다시 줄인다 (volume_ax 는 x축 공유)
+        self.ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+        self.toolbar = NavigationToolbar(self.canvas, None)
+
+    def _style_axes(self):
+        for ax in [self.ax, self.volume_ax]:
+            ax.set_facecolor(BACKGROUND_COLOR)
+            for spine in ax.spines.values():
+                spine.set_color('white')
+                spine.set_linewidth(0.5)
+            ax.tick_params(colors='white', labelsize=8)
+
+        # 가격 축 스타일 설정
+        self.ax.tick_params(axis='y', colors=PRICE_COLOR)
+        self.ax.set_ylabel("주가 ($)", color=PRICE_COLOR, fontsize=10)
+        self.ax.grid(True, linestyle='--', alpha=0.2, color='white')
+        # x축은 volume_ax에만 표시
+        self.ax.tick_params(axis='x', bottom=False, labelbottom=False)
+
+        # 거래량 축 스타일 설정
+        self.volume_ax.tick_params(axis='y', colors=VOLUME_COLOR, labelsize=8)
+        self.volume_ax.set_ylabel('거래량', color=VOLUME_COLOR, fontsize=10)
+        self.volume_ax.tick_params(axis='x', colors='white', labelsize=8, rotation=45)
+        self.volume_ax.grid(False)
+
+    def _on_draw(self, event):
+        # 전체 다시 그리기 후 배경을 저장해 두고, 움직이는 아티스트는 그 위에 그린다
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self.animated:
+            self.figure.draw_artist(artist)
+
+    def _volume_verts(self, centers, width, volumes):
+        # 막대 폭 = 구간 간격의 80%
+        half = 0.4 * width
+        left, right = centers - half, centers + half
+        zeros = np.zeros_like(volumes)
+        return np.stack([
+            np.column_stack([left, zeros]),
+            np.column_stack([left, volumes]),
+            np.column_stack([right, volumes]),
+            np.column_stack([right, zeros]),
+        ], axis=1)
+
+    def _render(self, x_min=-np.inf, x_max=np.inf):
+        """[x_min, x_max] 에 보이는 봉만 골라 캔버스 픽셀 폭에 맞게 줄여서 아티스트에 넣는다"""
+        start, stop = downsample.visible_range(self.x, x_min, x_max)
+        x = self.x[start:stop]
+        pixels = max(int(self.ax.bbox.width), 1)
+
+        self.price_line.set_data(*downsample.m4(x, self.closes[start:stop], pixels))
+        for line, values in zip(self.ma_lines, self.ma_values):
+            line.set_data(*downsample.m4(x, values[start:stop], pixels))
+
+        centers, width, volumes = downsample.bucket_volume(
+            x, self.volumes[start:stop], max(pixels // VOLUME_BUCKET_PIXELS, 1))
+        self.volume_bars.set_verts(self._volume_verts(centers, width, volumes))
+        self.volume_peak = float(volumes.max()) if len(volumes) else 0.0
+
+    def _scale_volume_axis(self):
+        self.volume_ax.set_ylim(0, max(self.volume_peak, 1) * 1.05)
+
+    def _rerender_view(self):
+        if self.x is None or self._rendering or len(self.x) == 0:
+            return
+        self._render(*self.ax.get_xlim())
+        self._scale_volume_axis()
+        self.canvas.draw_idle()
+
+    def _on_xlim_changed(self, ax):
+        self._rerender_view()
+
+    def _on_resize(self, event):
+        self._rerender_view()
+
+    def _fits_current_view(self, previous_x, x, closes):
+        x_min, x_max = self.ax.get_xlim()
+        y_min, y_max = self.ax.get_ylim()
+        # 데이터 끝을 보고 있었는데 새 봉이 화면 밖으로 나가면 축을 다시 잡아야 한다
+        if previous_x is None or len(previous_x) == 0 or (previous_x[-1] <= x_max < x[-1]):
+            return False
+        start, stop = downsample.visible_range(x, x_min, x_max)
+        if start >= stop:
+            return True
+        return np.nanmin(closes[start:stop]) >= y_min and np.nanmax(closes[start:stop]) <= y_max
+
+    def update(self, ticker, selected_period, interval, hist):
+        with tracing.span("chart update", "render", bars=len(hist)):
+            self._update(ticker, selected_period, interval, hist)
+
+    def _update(self, ticker, selected_period, interval, hist):
+        # 거래소 현지 시각 기준으로 표시
+        index = hist.index.tz_localize(None) if hist.index.tz is not None else hist.index
+        x = mdates.date2num(index.to_numpy())
+        closes = hist['Close'].to_numpy(dtype=float)
+        volumes = np.nan_to_num(hist['Volume'].to_numpy(dtype=float))
+
+        # 이동평균선
+        if selected_period in ["1개월", "3개월"]:
+            windows = (5, 10)
+        else:
+            windows = (20, 50)
+
+        previous_x = self.x
+        self.x, self.closes, self.volumes = x, closes, volumes
+        self.ma_values = [indicators.rolling_mean(closes, window, min_periods=1) for window in windows]
+
+        key = (ticker, selected_period, interval)
+        if key == self.key and self.background is not None and self._fits_current_view(previous_x, x, closes):
+            # 같은 차트에서 마지막 봉만 바뀐 경우: 거래량 막대도 축 안에 들어오면 축은 그대로 두고 블리팅
+            self._render(*self.ax.get_xlim())
+            if self.volume_peak <= self.volume_ax.get_ylim()[1]:
+                self.canvas.restore_region(self.background)
+                self._draw_animated()
+                self.canvas.blit(self.figure.bbox)
+                return
+
+        self.key = key
+        for line, window in zip(self.ma_lines, windows):
+            line.set_label(f'{window}일 이동평균')
+
+        # 전체 구간을 줄여서 넣어도 처음/끝/최소/최대 점은 남으므로 relim 결과는 원본과 같다
+        self._rendering = True
+        try:
+            self._render()
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self._scale_volume_axis()
+        finally:
+            self._rendering = False
+        # 새 차트는 전체 구간이 기본 화면
+        self.toolbar.update()
+
+        # 날짜 포맷 설정
+        if selected_period in ["1개월", "3개월"]:
+            date_format = '%m-%d %H:%M'
+        else:
+            date_format = '%Y-%m-%d'
+        self.volume_ax.xaxis.set_major_formatter(mdates.DateFormatter(date_format))
+
+        # 레이블 설정
+        self.ax.set_title(f"{ticker} 주가 차트 ({selected_period}, {INTERVAL_DISPLAY[interval]} 데이터)",
+                          color='white', pad=20, fontsize=12)
+
+        # 범례 설정
+        legend = self.ax.legend(facecolor=BACKGROUND_COLOR,
+                                edgecolor='#333333',
+                                labelcolor='white',
+                                fontsize=8,
+                                loc='upper left')
+        legend.get_frame().set_alpha(0.7)
+
+        self.canvas.draw_idle()
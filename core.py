@@ -0,0 +1,187 @@
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import analysis
+import fundamentals
+import tracing
+from market_data import TickerSession
+
+# 보고서에 기본으로 넣는 재무제표
+DEFAULT_STATEMENTS = ("financials",)
+
+# 기본 정보 보고서 항목
+INFO_FIELDS = ("longName", "sector", "industry", "marketCap", "fiftyTwoWeekHigh",
+               "fiftyTwoWeekLow", "beta", "dividendYield")
+
+
+def info_text(info):
+    """기본 정보 탭 텍스트"""
+    return f"""
+            회사명: {info.get('longName', 'N/A')}
+            섹터: {info.get('sector', 'N/A')}
+            산업: {info.get('industry', 'N/A')}
+            시가총액: ${info.get('marketCap', 0):,.2f}
+            52주 최고가: ${info.get('fiftyTwoWeekHigh', 0):,.2f}
+            52주 최저가: ${info.get('fiftyTwoWeekLow', 0):,.2f}
+            Beta: {info.get('beta', 'N/A')}
+            배당수익률: {info.get('dividendYield', 0) * 100:.2f}%
+            """
+
+
+def technical_text(values):
+    """기술적 분석 탭 텍스트 (analysis.technical_indicators 의 결과)"""
+    return f"""
+            현재가: ${values['price']:.2f}
+
+            RSI (14): {values['rsi']:.2f}
+            RSI 신호: {analysis.rsi_signal(values['rsi'])}
+
+            MACD: {values['macd']:.2f}
+            MACD Signal: {values['macd_signal']:.2f}
+            MACD 신호: {analysis.macd_signal(values['macd'], values['macd_signal'])}
+
+            볼린저 밴드:
+            상단: ${values['bb_upper']:.2f}
+            중간: ${values['bb_middle']:.2f}
+            하단: ${values['bb_lower']:.2f}
+
+            이동평균선:
+            MA20: ${values['ma20']:.2f}
+            MA50: ${values['ma50']:.2f}
+            MA200: ${values['ma200']:.2f}
+            """
+
+
+def fetch_per_eps(session):
+    try:
+        return fundamentals.default_provider.per_eps(session)
+    except Exception as e:
+        print(f"오류 발생: {e}", file=sys.stderr)
+        return None, None
+
+
+def valuation_inputs(session):
+    """적정주가 계산에 필요한 값만 받아 둔다 (재계산은 이 값으로만 계산). EPS/PER 이 없으면 None"""
+    eps, per = fetch_per_eps(session)
+    if eps is None or per is None:
+        return None
+
+    try:
+        # 1년 데이터로 분기별 성장률 계산 (부족하면 최근 3개월 성장률), 상한은 계산할 때 적용
+        yearly_close = session.daily_history()['Close']
+        recent_close = session.history(period="3mo")['Close']
+        with tracing.span("growth rate", "compute"):
+            growth_rate = analysis.average_growth_rate(yearly_close, recent_close)
+    except Exception as e:
+        print(f"성장률 계산 오류: {e}", file=sys.stderr)
+        growth_rate = 0
+
+    return {
+        "ticker": session.ticker,
+        "eps": eps,
+        "per": per,
+        "current_price": float(session.current_price()),
+        "growth_rate": float(growth_rate),
+    }
+
+
+def valuation_summary(inputs, growth_cap=analysis.GROWTH_CAP):
+    """valuation_inputs 결과로 계산한 적정주가/괴리율/판단"""
+    growth_rate = analysis.clamp_growth_rate(inputs["growth_rate"], growth_cap)
+    adjusted_per, suitable_price = analysis.fair_price(inputs["eps"], inputs["per"], growth_rate)
+    price = inputs["current_price"]
+    return {
+        "eps": inputs["eps"],
+        "per": inputs["per"],
+        "adjusted_per": adjusted_per,
+        "growth_rate": growth_rate,
+        "current_price": price,
+        "suitable_price": suitable_price,
+        "discount": analysis.discount_ratio(price, suitable_price),
+        "category": analysis.valuation_category(price, suitable_price),
+    }
+
+
+def json_value(value):
+    # NumPy 수치/NaN 을 JSON 으로 내보낼 수 있는 값으로
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+    return None if math.isnan(value) or math.isinf(value) else value
+
+
+def statement_records(frame):
+    """재무제표 DataFrame -> {날짜: {항목: 값}}"""
+    return {
+        (column.strftime('%Y-%m-%d') if hasattr(column, "strftime") else str(column)):
+            {str(row): json_value(value) for row, value in frame[column].items()}
+        for column in frame.columns
+    }
+
+
+def analyze(ticker, statements=DEFAULT_STATEMENTS, industry_per=None, session=None):
+    """한 종목의 기본 정보/기술적 지표/적정주가/재무제표를 모두 계산한 보고서 (JSON 으로 내보낼 수 있는 dict)
+
+    각 항목은 따로 계산하며, 실패한 항목은 errors 에 사유를 남기고 나머지는 계속 계산한다.
+    """
+    session = session or TickerSession(ticker)
+    report = {"ticker": session.ticker, "errors": {}}
+
+    try:
+        info = session.info
+        report["info"] = {field: json_value(info.get(field)) for field in INFO_FIELDS}
+    except Exception as e:
+        report["errors"]["info"] = str(e)
+
+    try:
+        values = analysis.technical_indicators(session.daily_history()['Close'])
+        report["technical"] = {
+            **{name: json_value(value) for name, value in values.items()},
+            "rsi_signal": analysis.rsi_signal(values["rsi"]),
+            "macd_signal_text": analysis.macd_signal(values["macd"], values["macd_signal"]),
+        }
+    except Exception as e:
+        report["errors"]["technical"] = str(e)
+
+    try:
+        inputs = valuation_inputs(session)
+        if inputs is None:
+            raise ValueError("데이터를 가져올 수 없습니다.")
+        valuation = valuation_summary(inputs)
+        if industry_per:
+            valuation["industry_per_ratio"] = inputs["per"] / industry_per
+        report["valuation"] = {key: json_value(value) for key, value in valuation.items()}
+    except Exception as e:
+        report["errors"]["valuation"] = str(e)
+
+    report["statements"] = {}
+    for name in statements:
+        try:
+            report["statements"][name] = statement_records(session.statement(name))
+        except Exception as e:
+            report["errors"][name] = str(e)
+
+    return report
+
+
+def _analyze_task(args):
+    ticker, statements, industry_per = args
+    try:
+        return analyze(ticker, statements, industry_per)
+    except Exception as e:
+        return {"ticker": ticker.upper(), "errors": {"analyze": str(e)}}
+
+
+def analyze_many(tickers, statements=DEFAULT_STATEMENTS, industry_per=None, workers=None):
+    """여러 종목을 프로세스 풀에서 나눠 분석. 결과는 입력 순서대로 반환"""
+    workers = workers or min(len(tickers), os.cpu_count() or 1)
+    tasks = [(ticker, tuple(statements), industry_per) for ticker in tickers]
+    if workers <= 1:
+        return [_analyze_task(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_analyze_task, tasks))
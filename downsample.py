@@ -0,0 +1,67 @@
+import numpy as np
+
+
+def visible_range(x, x_min, x_max):
+    """x(오름차순) 중 [x_min, x_max] 구간의 인덱스 범위. 선이 화면 끝까지 이어지도록 양옆 한 점씩 포함"""
+    start = max(np.searchsorted(x, x_min, side="left") - 1, 0)
+    stop = min(np.searchsorted(x, x_max, side="right") + 1, len(x))
+    return start, stop
+
+
+def bucket_starts(x, n_buckets):
+    """x 범위를 n_buckets 개의 같은 폭 구간으로 나눴을 때, 비어 있지 않은 구간의 시작 인덱스"""
+    span = x[-1] - x[0]
+    if span <= 0:
+        return np.zeros(1, dtype=np.intp)
+    ids = ((x - x[0]) * (n_buckets / span)).astype(np.intp)
+    np.minimum(ids, n_buckets - 1, out=ids)
+    return np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+
+
+def _first_index_of(values, targets, starts, sizes):
+    # 구간마다 values == targets 인 첫 인덱스 (없으면 -1)
+    seg = np.repeat(np.arange(len(starts)), sizes)
+    idx = np.arange(len(values))
+    candidates = np.where(values == targets[seg], idx, len(values))
+    first = np.minimum.reduceat(candidates, starts)
+    return np.where(first < len(values), first, -1)
+
+
+def m4_indices(y, starts):
+    """구간마다 처음/최소/최대/마지막 점의 인덱스 (M4). 픽셀당 한 구간이면 원본과 같은 모양으로 그려진다"""
+    n = len(y)
+    sizes = np.diff(np.r_[starts, n])
+    last = starts + sizes - 1
+
+    with np.errstate(invalid="ignore"):
+        seg_min = np.fmin.reduceat(y, starts)
+        seg_max = np.fmax.reduceat(y, starts)
+    min_idx = _first_index_of(y, seg_min, starts, sizes)
+    max_idx = _first_index_of(y, seg_max, starts, sizes)
+    # 값이 모두 NaN 인 구간은 처음 점으로 대신한다
+    min_idx = np.where(min_idx < 0, starts, min_idx)
+    max_idx = np.where(max_idx < 0, starts, max_idx)
+
+    idx = np.sort(np.column_stack([starts, min_idx, max_idx, last]), axis=1).ravel()
+    return idx[np.r_[True, idx[1:] != idx[:-1]]]
+
+
+def m4(x, y, n_buckets):
+    """(x, y) 선을 화면 폭(n_buckets 픽셀)에 맞게 줄인 (x, y). 이미 충분히 적으면 그대로 반환"""
+    if len(x) <= 4 * n_buckets:
+        return x, y
+    idx = m4_indices(y, bucket_starts(x, n_buckets))
+    return x[idx], y[idx]
+
+
+def bucket_volume(x, volumes, n_buckets):
+    """거래량을 n_buckets 구간으로 묶은 (구간 중심, 막대 폭, 구간 거래량 합계)"""
+    if len(x) <= n_buckets:
+        width = np.median(np.diff(x)) if len(x) > 1 else 1.0
+        return x, width, volumes
+
+    bucket_width = (x[-1] - x[0]) / n_buckets
+    starts = bucket_starts(x, n_buckets)
+    ids = np.minimum(((x[starts] - x[0]) / bucket_width).astype(np.intp), n_buckets - 1)
+    # 막대 하나가 구간의 모든 봉을 대신하므로 높이는 구간 합계 (세로 축은 화면에 그린 막대에 맞춘다)
+    return x[0] + (ids + 0.5) * bucket_width, bucket_width, np.add.reduceat(volumes, starts)
@@ -0,0 +1,202 @@
+import contextlib
+import os
+import tempfile
+import zlib
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+import alerts
+import fonts
+import fundamentals
+import market_data
+import snapshots
+import symbols
+from ohlcv_cache import OHLCVCache
+
+# 봉 간격 -> (pandas 주기, 하루 봉 수)
+INTERVALS = {
+    "15m": ("15min", 26),
+    "1h": ("h", 7),
+    "1d": ("B", 1),
+    "1wk": ("W-FRI", 1 / 5),
+}
+
+# yfinance period -> 거래일 수
+PERIOD_DAYS = {
+    "1d": 1, "5d": 5, "1mo": 21, "60d": 42, "3mo": 63, "6mo": 126,
+    "1y": 252, "2y": 504, "5y": 1260, "10y": 2520, "20y": 5040, "max": 5040,
+}
+
+STATEMENT_ROWS = {
+    "financials": ["Total Revenue", "Cost Of Revenue", "Gross Profit", "Operating Income", "Net Income"],
+    "balance_sheet": ["Total Assets", "Total Liabilities", "Stockholders Equity", "Cash", "Total Debt"],
+    "cashflow": ["Operating Cash Flow", "Capital Expenditure", "Free Cash Flow", "Dividends Paid"],
+}
+
+# 가짜 종목 목록의 종목 수 (미국 상장 종목 수와 비슷하게)
+DIRECTORY_SIZE = 12000
+NAME_WORDS = ["Apple", "Micro", "Systems", "Global", "Energy", "Health", "Capital", "Bio", "Therapeutics",
+              "Semiconductor", "Digital", "Financial", "Industries", "Pharma", "Networks", "Resources",
+              "American", "United", "First", "Pacific", "Software", "Motors", "Foods", "Realty"]
+NAME_SUFFIXES = ["Inc.", "Corp.", "Holdings", "Group", "Ltd.", "ETF"]
+
+QUOTE_PAGE = '<html><body>{padding}<fin-streamer data-field="trailingPE" value="{pe}">{pe}</fin-streamer></body></html>'
+
+
+def _rng(ticker, salt=""):
+    # 같은 티커는 항상 같은 데이터
+    return np.random.default_rng(zlib.crc32(f"{ticker}:{salt}".encode()))
+
+
+def period_bars(period, interval):
+    freq, per_day = INTERVALS[interval]
+    return max(int(PERIOD_DAYS.get(period, 252) * per_day), 1)
+
+
+def synthetic_ohlcv(ticker, bars, interval="1d", end=None):
+    """티커별로 고정된 랜덤 워크 OHLCV (마지막 봉 = 현재 시각)"""
+    freq, _ = INTERVALS[interval]
+    end = end if end is not None else pd.Timestamp.now(tz="America/New_York").floor("15min")
+    index = pd.date_range(end=end, periods=bars, freq=freq)
+    rng = _rng(ticker, interval)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, bars)))
+    spread = close * rng.uniform(0.001, 0.02, bars)
+    return pd.DataFrame({
+        "Open": close + rng.normal(0, 0.3, bars) * spread,
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(100_000, 10_000_000, bars).astype(float),
+    }, index=index)
+
+
+def synthetic_statement(ticker, name, periods=4, quarterly=False):
+    rows = STATEMENT_ROWS[name]
+    freq = "QE" if quarterly else "YE"
+    columns = pd.date_range(end=pd.Timestamp.now().normalize(), periods=periods, freq=freq)[::-1]
+    values = _rng(ticker, name).uniform(1e8, 1e11, (len(rows), periods))
+    return pd.DataFrame(values, index=rows, columns=columns)
+
+
+def synthetic_directory(size=DIRECTORY_SIZE):
+    """NASDAQ Trader 심볼 디렉터리 형식의 가짜 종목 목록 (벤치마크용으로 많이 만들 수 있다)"""
+    rng = _rng("directory", str(size))
+    letters = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    lines = ["Symbol|Security Name|Market Category|Test Issue|Financial Status|Round Lot Size|ETF|NextShares"]
+    seen = {"AAPL", "MSFT", "NVDA"}
+    for symbol, name in (("AAPL", "Apple Inc. - Common Stock"), ("MSFT", "Microsoft Corporation - Common Stock"),
+                         ("NVDA", "NVIDIA Corporation - Common Stock")):
+        lines.append(f"{symbol}|{name}|Q|N|N|100|N|N")
+    while len(seen) < size:
+        symbol = "".join(rng.choice(letters, rng.integers(1, 6)))
+        if symbol in seen:
+            continue
+        seen.add(symbol)
+        words = rng.choice(NAME_WORDS, rng.integers(1, 4), replace=False)
+        lines.append(f"{symbol}|{' '.join(words)} {rng.choice(NAME_SUFFIXES)}|Q|N|N|100|N|N")
+    lines.append("File Creation Time: 0101202600:00|||||||")
+    return "\n".join(lines)
+
+
+class FakeTicker:
+    """yfinance.Ticker 대신 쓰는 네트워크 없는 가짜 종목 (벤치마크/오프라인 실행용)"""
+
+    def __init__(self, ticker, session=None):
+        self.ticker = ticker.upper()
+
+    @property
+    def info(self):
+        rng = _rng(self.ticker, "info")
+        eps = float(rng.uniform(0.5, 15))
+        price = float(synthetic_ohlcv(self.ticker, period_bars("1y", "1d"))["Close"].iloc[-1])
+        return {
+            "longName": f"{self.ticker} Inc.",
+            "sector": "Technology",
+            "industry": "Software",
+            "marketCap": price * 1e9,
+            "fiftyTwoWeekHigh": price * 1.2,
+            "fiftyTwoWeekLow": price * 0.8,
+            "beta": float(rng.uniform(0.5, 2)),
+            "dividendYield": float(rng.uniform(0, 0.04)),
+            "trailingEps": eps,
+            "trailingPE": price / eps,
+            "currentPrice": price,
+        }
+
+    def history(self, period="1mo", interval="1d", start=None, end=None, **kwargs):
+        hist = synthetic_ohlcv(self.ticker, period_bars(period if start is None else "max", interval), interval)
+        if start is not None:
+            hist = hist[hist.index >= pd.Timestamp(start)]
+        return hist
+
+    financials = property(lambda self: synthetic_statement(self.ticker, "financials"))
+    quarterly_financials = property(lambda self: synthetic_statement(self.ticker, "financials", 5, True))
+    balance_sheet = property(lambda self: synthetic_statement(self.ticker, "balance_sheet"))
+    quarterly_balance_sheet = property(lambda self: synthetic_statement(self.ticker, "balance_sheet", 5, True))
+    cashflow = property(lambda self: synthetic_statement(self.ticker, "cashflow"))
+    quarterly_cashflow = property(lambda self: synthetic_statement(self.ticker, "cashflow", 5, True))
+
+
+def download(tickers, period="1y", interval="1d", group_by="ticker", **kwargs):
+    """yf.download 대신: 티커별 가짜 OHLCV 를 (티커, 컬럼) MultiIndex 로 묶어 반환"""
+    if isinstance(tickers, str):
+        tickers = tickers.split()
+    bars = period_bars(period, interval)
+    return pd.concat({ticker: synthetic_ohlcv(ticker, bars, interval) for ticker in tickers}, axis=1)
+
+
+class FakeResponse:
+    status_code = 200
+    encoding = "utf-8"
+
+    def __init__(self, text):
+        self.text = text
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def iter_content(self, chunk_size=16384, decode_unicode=False):
+        for i in range(0, len(self.text), chunk_size):
+            yield self.text[i:i + chunk_size]
+
+
+class FakeHTTP:
+    """시세 페이지 요청 대신 trailingPE 태그가 든 가짜 페이지, 종목 목록 요청 대신 가짜 목록을 돌려준다"""
+
+    def get(self, url, timeout=None, stream=False, **kwargs):
+        if url in symbols.SOURCES:
+            # 두 번째 목록(otherlisted)은 비워 둔다
+            return FakeResponse(synthetic_directory() if url == symbols.SOURCES[0] else "ACT Symbol|Security Name")
+        ticker = url.rstrip("/").rsplit("/", 1)[-1]
+        pe = float(_rng(ticker, "pe").uniform(5, 60))
+        return FakeResponse(QUOTE_PAGE.format(padding="x" * 200_000, pe=f"{pe:.2f}"))
+
+
+@contextlib.contextmanager
+def installed(cache_dir=None):
+    """yfinance/시세 페이지/디스크 캐시/종목 목록/알림 규칙/폰트 캐시 파일을 가짜로 바꿔 둔 상태에서 실행"""
+    with contextlib.ExitStack() as stack:
+        if cache_dir is None:
+            cache_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="stockist-fake-"))
+        saved = (yf.Ticker, yf.download, fundamentals.default_provider, market_data.default_cache,
+                 snapshots.default_store, symbols.default_universe, alerts.ALERTS_PATH,
+                 fonts.FONT_CACHE_PATH)
+        yf.Ticker = FakeTicker
+        yf.download = download
+        fundamentals.default_provider = fundamentals.FundamentalsProvider(http=FakeHTTP())
+        market_data.default_cache = OHLCVCache(cache_dir)
+        snapshots.default_store = snapshots.SnapshotStore(os.path.join(cache_dir, "fundamentals.sqlite3"))
+        symbols.default_universe = symbols.SymbolUniverse(os.path.join(cache_dir, "symbols.tsv"), http=FakeHTTP())
+        alerts.ALERTS_PATH = os.path.join(cache_dir, "alerts.json")
+        fonts.FONT_CACHE_PATH = os.path.join(cache_dir, "korean_font.json")
+        try:
+            yield
+        finally:
+            snapshots.default_store.close()
+            (yf.Ticker, yf.download, fundamentals.default_provider, market_data.default_cache,
+             snapshots.default_store, symbols.default_universe, alerts.ALERTS_PATH, fonts.FONT_CACHE_PATH) = saved
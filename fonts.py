@@ -0,0 +1,121 @@
+import json
+import os
+import sys
+
+import matplotlib
+import matplotlib.font_manager as fm
+
+KOREAN_FONTS = ['Malgun Gothic', '맑은 고딕', 'NanumGothic', '나눔고딕']
+
+FONT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".stockist", "korean_font.json")
+
+_resolved = False
+
+
+def font_directories():
+    """시스템/사용자 폰트 폴더 중 실제로 있는 것"""
+    if sys.platform == "win32":
+        dirs = [fm.win32FontDirectory(), *fm.MSUserFontDirectories]
+    elif sys.platform == "darwin":
+        dirs = [*fm.X11FontDirectories, *fm.OSXFontDirectories]
+    else:
+        dirs = list(fm.X11FontDirectories)
+    return [d for d in dirs if os.path.isdir(d)]
+
+
+def font_dirs_signature():
+    # 폰트 폴더와 바로 아래 하위 폴더의 수정 시각 (폰트 설치/삭제 시 바뀐다)
+    signature = {}
+    for directory in font_directories():
+        try:
+            signature[directory] = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        signature[entry.path] = entry.stat().st_mtime_ns
+        except OSError:
+            continue
+    return signature
+
+
+def _read_cache(signature):
+    try:
+        with open(FONT_CACHE_PATH, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cache.get("matplotlib") != matplotlib.__version__ or cache.get("signature") != signature:
+        return None
+    return cache
+
+
+def _write_cache(signature, name, path):
+    cache = {
+        "matplotlib": matplotlib.__version__,
+        "signature": signature,
+        "name": name,
+        "path": path,
+    }
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_PATH), exist_ok=True)
+        tmp_path = FONT_CACHE_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, FONT_CACHE_PATH)
+    except OSError:
+        pass
+
+
+def _is_korean(font_name):
+    return any(korean_font in font_name for korean_font in KOREAN_FONTS)
+
+
+def find_korean_font():
+    """설치된 폰트 중 한글 폰트의 (이름, 경로). 없으면 (None, None)"""
+    # matplotlib 이 이미 캐시해 둔 폰트 목록부터 확인 (파일을 열지 않는다)
+    for entry in fm.fontManager.ttflist:
+        if _is_korean(entry.name):
+            return entry.name, entry.fname
+
+    # matplotlib 캐시 이후에 설치된 폰트는 파일을 직접 열어 확인
+    known = {entry.fname for entry in fm.fontManager.ttflist}
+    for font in fm.findSystemFonts():
+        if font in known:
+            continue
+        try:
+            font_name = fm.FontProperties(fname=font).get_name()
+        except Exception:
+            continue
+        if _is_korean(font_name):
+            return font_name, font
+    return None, None
+
+
+def resolve_korean_font():
+    """한글 폰트를 찾아 이름/경로를 반환. 폰트 폴더가 그대로면 디스크 캐시를 재사용"""
+    signature = font_dirs_signature()
+    cache = _read_cache(signature)
+    if cache is not None and (cache["path"] is None or os.path.exists(cache["path"])):
+        return cache["name"], cache["path"]
+
+    name, path = find_korean_font()
+    _write_cache(signature, name, path)
+    return name, path
+
+
+def setup_korean_font():
+    """한글 폰트를 matplotlib 기본 폰트로 설정 (프로세스당 한 번만 탐색)"""
+    global _resolved
+    if _resolved:
+        return
+    _resolved = True
+
+    # font.family 는 리스트이므로 첫 항목으로 이미 설정되어 있는지 확인
+    if not any(_is_korean(family) for family in matplotlib.rcParams['font.family']):
+        name, path = resolve_korean_font()
+        if name is not None:
+            if path not in {entry.fname for entry in fm.fontManager.ttflist}:
+                fm.fontManager.addfont(path)
+            matplotlib.rcParams['font.family'] = [name]
+
+    matplotlib.rcParams['axes.unicode_minus'] = False
@@ -0,0 +1,132 @@
+import re
+import threading
+import time
+
+import snapshots
+import tracing
+import yahoo
+
+QUOTE_URL = "https://finance.yahoo.com/quote/{ticker}"
+
+# (연결, 읽기) 타임아웃 (초)
+REQUEST_TIMEOUT = (3.05, 10)
+
+# EPS/PER 캐시 유지 시간 (초)
+FUNDAMENTALS_TTL = 3600
+
+# 시세 페이지에서 trailingPE 값을 담고 있는 태그
+TRAILING_PE_PATTERN = re.compile(
+    r'<fin-streamer[^>]*data-field="trailingPE"[^>]*>\s*([^<]*?)\s*<', re.IGNORECASE)
+# 태그가 청크 경계에 걸쳐 잘려도 찾을 수 있도록 남겨두는 앞 청크의 끝부분 길이
+SCAN_OVERLAP = 1024
+
+
+def parse_number(text):
+    try:
+        return float(text.replace(",", ""))
+    except ValueError:
+        raise ValueError("PE Ratio 값을 숫자로 변환할 수 없습니다.")
+
+
+class FundamentalsProvider:
+    """티커별 EPS/PER 를 기업정보에서 가져오고 TTL 동안 캐시. 시세 페이지는 꼭 필요할 때만 읽는다"""
+
+    def __init__(self, ttl=FUNDAMENTALS_TTL, http=None, client=None, store=None):
+        self.ttl = ttl
+        self._http = http
+        self.client = client if client is not None else yahoo.client
+        self._store = store
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    @property
+    def http(self):
+        # 따로 지정하지 않으면 Yahoo 요청 통로의 연결 풀을 함께 쓴다
+        return self._http if self._http is not None else self.client.http
+
+    @property
+    def store(self):
+        # 따로 지정하지 않으면 앱 전체의 스냅샷 저장소 (EPS/PER 기록이 남고, 재시작 후에도 TTL 동안 재사용)
+        return self._store if self._store is not None else snapshots.default_store
+
+    def _cached(self, ticker):
+        with self._lock:
+            entry = self._cache.get(ticker)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def invalidate(self, ticker=None):
+        with self._lock:
+            if ticker is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(ticker.upper(), None)
+
+    def per_eps(self, session):
+        """(EPS, PER). 세션이 이미 받은 기업정보를 쓰고, PER 이 빠진 경우에만 시세 페이지를 확인"""
+        cached = self._cached(session.ticker)
+        if cached is not None:
+            tracing.count("fundamentals.hit")
+            return cached
+        tracing.count("fundamentals.miss")
+
+        stored = self.store.latest_per_eps(session.ticker, self.ttl)
+        if stored is not None:
+            tracing.count("snapshot.hit")
+            with self._lock:
+                self._cache[session.ticker] = (time.monotonic(), stored)
+            return stored
+
+        info = session.info
+        eps = info.get("trailingEps")
+        if eps is None:
+            raise ValueError("EPS 데이터를 가져올 수 없습니다.")
+        eps = float(eps)
+
+        per = info.get("trailingPE")
+        if per is None:
+            if eps <= 0:
+                # 적자 기업은 PER 이 정의되지 않는다 (시세 페이지도 N/A)
+                raise ValueError("PE Ratio 데이터를 가져올 수 없습니다.")
+            price = info.get("currentPrice") or info.get("regularMarketPrice")
+            per = price / eps if price else self.scrape_trailing_pe(session.ticker)
+
+        result = (eps, float(per))
+        with self._lock:
+            self._cache[session.ticker] = (time.monotonic(), result)
+        self.store.record_per_eps(session.ticker, *result)
+        return result
+
+    def scrape_trailing_pe(self, ticker):
+        """시세 페이지를 받으면서 trailingPE 태그가 나오는 즉시 읽기를 멈춘다"""
+        return self.client.call(("quote", ticker), lambda: self._scrape_trailing_pe(ticker))
+
+    def _scrape_trailing_pe(self, ticker):
+        url = QUOTE_URL.format(ticker=ticker)
+        with tracing.span("yahoo quote page", "network", ticker=ticker), \
+                self.http.get(url, timeout=REQUEST_TIMEOUT, stream=True) as response:
+            if response.status_code == 429:
+                raise ConnectionError("Too Many Requests")
+            if response.status_code >= 500:
+                # 서버 쪽 일시 오류는 재시도
+                raise ConnectionError("Yahoo Finance 페이지에 접근할 수 없습니다.")
+            if response.status_code != 200:
+                raise ValueError("Yahoo Finance 페이지에 접근할 수 없습니다.")
+            response.encoding = response.encoding or "utf-8"
+
+            tail = ""
+            for chunk in response.iter_content(chunk_size=16384, decode_unicode=True):
+                text = tail + chunk
+                match = TRAILING_PE_PATTERN.search(text)
+                if match:
+                    if not match.group(1):
+                        break
+                    return parse_number(match.group(1))
+                tail = text[-SCAN_OVERLAP:]
+
+        raise ValueError("PE Ratio 데이터를 가져올 수 없습니다.")
+
+
+# 모든 세션이 함께 쓰는 EPS/PER 캐시
+default_provider = FundamentalsProvider()
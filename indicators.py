@@ -0,0 +1,411 @@
+from collections import deque
+
+import numpy as np
+
+# 기술적 분석 탭에서 사용하는 지표 파라미터 (ta 라이브러리 기본값과 동일)
+RSI_WINDOW = 14
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+BB_WINDOW = 20
+BB_DEV = 2
+MA_WINDOWS = (20, 50, 200)
+
+
+def _as_2d(values):
+    arr = np.asarray(values, dtype="f8")
+    return np.atleast_2d(arr), arr.ndim == 1
+
+
+def _restore(arr, squeeze):
+    return arr[0] if squeeze else arr
+
+
+def stack_closes(series_list):
+    """길이가 다른 종가 배열들을 마지막 봉 기준으로 맞춰 (종목 x 시간) 배열로 만든다 (앞쪽은 NaN)"""
+    arrays = [np.asarray(s, dtype="f8") for s in series_list]
+    arrays = [a[~np.isnan(a)] for a in arrays]
+    length = max((len(a) for a in arrays), default=0)
+    out = np.full((len(arrays), length), np.nan)
+    for i, a in enumerate(arrays):
+        if len(a):
+            out[i, length - len(a):] = a
+    return out
+
+
+class RollingSums:
+    """누적합을 한 번만 계산해 두고 여러 윈도우의 이동평균/표준편차를 O(1) 로 뽑아낸다"""
+
+    def __init__(self, x):
+        valid = ~np.isnan(x)
+        # 큰 가격에서 제곱합의 자릿수 손실을 줄이기 위해 종목별 첫 값을 빼고 계산
+        first = valid.argmax(axis=-1)
+        self.shift = np.take_along_axis(np.where(valid, x, 0.0), first[:, None], axis=-1)
+        centered = np.where(valid, x - self.shift, 0.0)
+
+        pad = np.zeros((x.shape[0], 1))
+        self.csum = np.concatenate([pad, np.cumsum(centered, axis=-1)], axis=-1)
+        self.csq = np.concatenate([pad, np.cumsum(centered * centered, axis=-1)], axis=-1)
+        self.ccount = np.concatenate([pad, np.cumsum(valid, axis=-1)], axis=-1)
+        self.length = x.shape[-1]
+
+    def _window(self, cum, window):
+        # out[t] = cum[t+1] - cum[t+1-window] (앞쪽 window 개는 처음부터의 합)
+        window = min(window, self.length)
+        out = np.empty((cum.shape[0], self.length))
+        out[:, :window] = cum[:, 1:window + 1]
+        np.subtract(cum[:, window + 1:], cum[:, 1:self.length - window + 1], out=out[:, window:])
+        return out
+
+    def mean(self, window, min_periods=None):
+        min_periods = window if min_periods is None else min_periods
+        count = self._window(self.ccount, window)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = self._window(self.csum, window) / count + self.shift
+        out[count < max(min_periods, 1)] = np.nan
+        return out
+
+    def std(self, window, min_periods=None):
+        # 모표준편차 (ddof=0, ta 의 볼린저 밴드와 동일)
+        min_periods = window if min_periods is None else min_periods
+        count = self._window(self.ccount, window)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self._window(self.csum, window) / count
+            var = self._window(self.csq, window) / count - mean * mean
+        out = np.sqrt(np.maximum(var, 0.0))
+        out[count < max(min_periods, 1)] = np.nan
+        return out
+
+
+def rolling_mean(values, window, min_periods=None):
+    x, squeeze = _as_2d(values)
+    return _restore(RollingSums(x).mean(window, min_periods), squeeze)
+
+
+# 블록 단위 EMA 에서 한 번에 처리하는 봉 수 (가중치 r^-k 가 넘치지 않는 크기)
+EMA_BLOCK = 64
+
+
+def ema(values, alpha, min_periods=0):
+    """pandas ewm(alpha, adjust=False).mean() 과 같은 재귀 지수이동평균 (종목 방향은 벡터화)
+
+    alpha, min_periods 는 행마다 다르게 줄 수 있어서 여러 EMA 를 한 번에 계산할 수 있다.
+    """
+    x, squeeze = _as_2d(values)
+    rows = x.shape[0]
+    alpha = np.broadcast_to(np.asarray(alpha, dtype="f8"), (rows,))
+    min_periods = np.broadcast_to(np.asarray(min_periods), (rows,))
+
+    valid = ~np.isnan(x)
+    nobs = np.cumsum(valid, axis=-1)
+    # 데이터 시작 후 중간에 빠진 값이 있으면 pandas 와 같은 가중치 처리를 위해 한 봉씩 계산
+    if (~valid & (nobs > 0)).any():
+        out = _ema_loop(x, alpha, min_periods)
+    else:
+        out = _ema_blocks(x, valid, alpha)
+        out[nobs < min_periods[:, None]] = np.nan
+    return _restore(out, squeeze)
+
+
+def _ema_blocks(x, valid, alpha):
+    # y[t] = r*y[t-1] + a*x[t] 를 블록 안에서는 누적합으로 풀어서 계산
+    #   y[j] = r^(j+1) * (y[-1] + a * sum_{i<=j} x[i] / r^(i+1))
+    rows, length = x.shape
+    first = valid.argmax(axis=-1)
+    start_values = x[np.arange(rows), first]
+    # 시작 전 구간은 첫 값으로 채우면 시작 시점의 EMA 가 정확히 첫 값이 된다
+    filled = np.where(np.cumsum(valid, axis=-1) == 0, start_values[:, None], x)
+
+    ratio = (1 - alpha)[:, None]
+    out = np.empty_like(x)
+    state = start_values
+    for begin in range(0, length, EMA_BLOCK):
+        block = filled[:, begin:begin + EMA_BLOCK]
+        powers = ratio ** np.arange(1, block.shape[1] + 1)
+        block_out = powers * (state[:, None] + alpha[:, None] * np.cumsum(block / powers, axis=-1))
+        out[:, begin:begin + EMA_BLOCK] = block_out
+        state = block_out[:, -1]
+    return out
+
+
+def _ema_loop(x, alpha, min_periods):
+    rows, length = x.shape
+    # 시간 축을 앞으로 보내서 매 스텝 연속된 메모리를 읽도록 한다
+    xt = np.ascontiguousarray(x.T)
+    observed_all = ~np.isnan(xt)
+    out = np.full_like(xt, np.nan)
+    avg = np.full(rows, np.nan)
+    old_wt = np.ones(rows)
+    nobs = np.zeros(rows)
+
+    for t in range(length):
+        cur = xt[t]
+        observed = observed_all[t]
+        started = ~np.isnan(avg)
+        nobs += observed
+
+        # 시작 전이면 첫 관측값으로 시작, 이후에는 가중치를 줄여가며 갱신
+        old_wt = np.where(started, old_wt * (1 - alpha), old_wt)
+        update = started & observed
+        avg = np.where(update, (old_wt * avg + alpha * cur) / (old_wt + alpha), avg)
+        old_wt = np.where(update, 1.0, old_wt)
+        avg = np.where(~started & observed, cur, avg)
+
+        out[t] = np.where(nobs >= min_periods, avg, np.nan)
+
+    return out.T
+
+
+def _rsi_directions(x):
+    diff = np.full_like(x, np.nan)
+    diff[:, 1:] = x[:, 1:] - x[:, :-1]
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+
+    # 데이터가 시작되기 전(앞쪽 NaN)은 계산에서 제외
+    before_start = np.cumsum(~np.isnan(x), axis=-1) == 0
+    up[before_start] = np.nan
+    down[before_start] = np.nan
+    return up, down
+
+
+def _rsi_from_ema(ema_up, ema_down):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(ema_down == 0, 100.0, 100 - 100 / (1 + ema_up / ema_down))
+
+
+def rsi(values, window=RSI_WINDOW):
+    x, squeeze = _as_2d(values)
+    up, down = _rsi_directions(x)
+    smoothed = ema(np.concatenate([up, down]), 1 / window, window)
+    ema_up, ema_down = np.split(smoothed, 2)
+    return _restore(_rsi_from_ema(ema_up, ema_down), squeeze)
+
+
+def macd(values, fast=MACD_FAST, slow=MACD_SLOW, signal=MACD_SIGNAL):
+    x, squeeze = _as_2d(values)
+    ema_fast = ema(x, 2 / (fast + 1), fast)
+    ema_slow = ema(x, 2 / (slow + 1), slow)
+    macd_line = ema_fast - ema_slow
+    signal_line = ema(macd_line, 2 / (signal + 1), signal)
+    return _restore(macd_line, squeeze), _restore(signal_line, squeeze)
+
+
+def compute_indicators(close):
+    """종가 배열(1차원 또는 종목 x 시간 2차원)로 앱에서 쓰는 모든 지표를 한 번에 계산"""
+    x, squeeze = _as_2d(close)
+    rows = x.shape[0]
+    sums = RollingSums(x)
+
+    # MACD 단기/장기 EMA 와 RSI 상승/하락 평균을 한 번의 재귀 루프로 계산
+    up, down = _rsi_directions(x)
+    alphas = np.repeat([2 / (MACD_FAST + 1), 2 / (MACD_SLOW + 1), 1 / RSI_WINDOW, 1 / RSI_WINDOW], rows)
+    min_periods = np.repeat([MACD_FAST, MACD_SLOW, RSI_WINDOW, RSI_WINDOW], rows)
+    ema_fast, ema_slow, ema_up, ema_down = np.split(
+        ema(np.concatenate([x, x, up, down]), alphas, min_periods), 4)
+    macd_line = ema_fast - ema_slow
+    signal_line = ema(macd_line, 2 / (MACD_SIGNAL + 1), MACD_SIGNAL)
+
+    bb_middle = sums.mean(BB_WINDOW)
+    bb_std = sums.std(BB_WINDOW)
+
+    result = {
+        "price": x,
+        "rsi": _rsi_from_ema(ema_up, ema_down),
+        "macd": macd_line,
+        "macd_signal": signal_line,
+        "bb_upper": bb_middle + BB_DEV * bb_std,
+        "bb_middle": bb_middle,
+        "bb_lower": bb_middle - BB_DEV * bb_std,
+    }
+    for window in MA_WINDOWS:
+        result[f"ma{window}"] = sums.mean(window)
+
+    return {name: _restore(arr, squeeze) for name, arr in result.items()}
+
+
+def latest(indicators):
+    """compute_indicators 결과에서 마지막 봉의 값만 뽑는다"""
+    return {name: arr[..., -1] for name, arr in indicators.items()}
+
+
+class RollingWindow:
+    """고정 윈도우의 이동평균/모표준편차를 봉 하나당 O(1) 로 갱신 (Welford 방식)"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.mean_value = 0.0
+        self.m2 = 0.0
+
+    def _add(self, x):
+        n = len(self.values)
+        delta = x - self.mean_value
+        self.mean_value += delta / n
+        self.m2 += delta * (x - self.mean_value)
+
+    def _remove(self, x):
+        n = len(self.values)
+        if n == 0:
+            self.mean_value = 0.0
+            self.m2 = 0.0
+            return
+        delta = x - self.mean_value
+        self.mean_value -= delta / n
+        self.m2 -= delta * (x - self.mean_value)
+
+    def update(self, x):
+        self.values.append(x)
+        self._add(x)
+        if len(self.values) > self.window:
+            self._remove(self.values.popleft())
+
+    def replace_last(self, x):
+        # 아직 끝나지 않은 마지막 봉의 종가가 바뀐 경우
+        old = self.values.pop()
+        self._remove(old)
+        self.values.append(x)
+        self._add(x)
+
+    @property
+    def mean(self):
+        return self.mean_value if len(self.values) >= self.window else np.nan
+
+    @property
+    def std(self):
+        if len(self.values) < self.window:
+            return np.nan
+        return np.sqrt(max(self.m2 / len(self.values), 0.0))
+
+
+class EMAState:
+    """ewm(alpha, adjust=False) 의 마지막 값만 들고 있는 지수이동평균"""
+
+    def __init__(self, alpha, min_periods=0):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = np.nan
+        self.prev_value = np.nan
+        self.nobs = 0
+
+    def _next(self, base, x):
+        return x if np.isnan(base) else base + self.alpha * (x - base)
+
+    def update(self, x):
+        self.prev_value = self.value
+        self.value = self._next(self.value, x)
+        self.nobs += 1
+
+    def replace_last(self, x):
+        self.value = self._next(self.prev_value, x)
+
+    @property
+    def current(self):
+        return self.value if self.nobs >= self.min_periods else np.nan
+
+
+class RSIState:
+    def __init__(self, window=RSI_WINDOW):
+        self.up = EMAState(1 / window, window)
+        self.down = EMAState(1 / window, window)
+        self.last_close = np.nan
+        self.prev_close = np.nan
+
+    def _directions(self, base, x):
+        # 첫 봉은 변화량이 없으므로 ta 와 같이 0 으로 취급
+        diff = 0.0 if np.isnan(base) else x - base
+        return max(diff, 0.0), max(-diff, 0.0)
+
+    def update(self, x):
+        up, down = self._directions(self.last_close, x)
+        self.up.update(up)
+        self.down.update(down)
+        self.prev_close, self.last_close = self.last_close, x
+
+    def replace_last(self, x):
+        up, down = self._directions(self.prev_close, x)
+        self.up.replace_last(up)
+        self.down.replace_last(down)
+        self.last_close = x
+
+    @property
+    def current(self):
+        ema_up, ema_down = self.up.current, self.down.current
+        if np.isnan(ema_up) or np.isnan(ema_down):
+            return np.nan
+        if ema_down == 0:
+            return 100.0
+        return 100 - 100 / (1 + ema_up / ema_down)
+
+
+class MACDState:
+    def __init__(self, fast=MACD_FAST, slow=MACD_SLOW, signal=MACD_SIGNAL):
+        self.fast = EMAState(2 / (fast + 1), fast)
+        self.slow = EMAState(2 / (slow + 1), slow)
+        self.signal = EMAState(2 / (signal + 1), signal)
+
+    def update(self, x):
+        self.fast.update(x)
+        self.slow.update(x)
+        # 시그널선은 MACD 값이 나오기 시작한 뒤부터 계산
+        if not np.isnan(self.macd):
+            self.signal.update(self.macd)
+
+    def replace_last(self, x):
+        self.fast.replace_last(x)
+        self.slow.replace_last(x)
+        if self.signal.nobs and not np.isnan(self.macd):
+            self.signal.replace_last(self.macd)
+
+    @property
+    def macd(self):
+        return self.fast.current - self.slow.current
+
+
+class IndicatorState:
+    """compute_indicators 와 같은 지표를 새 봉마다 O(1) 로 갱신하는 스트리밍 버전"""
+
+    def __init__(self):
+        self.price = np.nan
+        self.rsi = RSIState()
+        self.macd = MACDState()
+        self.windows = {window: RollingWindow(window) for window in set(MA_WINDOWS) | {BB_WINDOW}}
+
+    @classmethod
+    def from_history(cls, close):
+        state = cls()
+        for x in np.asarray(close, dtype="f8"):
+            if not np.isnan(x):
+                state.update(x)
+        return state
+
+    def update(self, close):
+        """새 봉 추가"""
+        self.price = close
+        self.rsi.update(close)
+        self.macd.update(close)
+        for window in self.windows.values():
+            window.update(close)
+
+    def replace_last(self, close):
+        """진행 중인 마지막 봉의 종가 갱신"""
+        self.price = close
+        self.rsi.replace_last(close)
+        self.macd.replace_last(close)
+        for window in self.windows.values():
+            window.replace_last(close)
+
+    def values(self):
+        bb = self.windows[BB_WINDOW]
+        result = {
+            "price": self.price,
+            "rsi": self.rsi.current,
+            "macd": self.macd.macd,
+            "macd_signal": self.macd.signal.current,
+            "bb_upper": bb.mean + BB_DEV * bb.std,
+            "bb_middle": bb.mean,
+            "bb_lower": bb.mean - BB_DEV * bb.std,
+        }
+        for window in MA_WINDOWS:
+            result[f"ma{window}"] = self.windows[window].mean
+        return result
@@ -0,0 +1,44 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """처음 속성에 접근할 때 import 하는 모듈 대리 객체 (여러 스레드에서 접근해도 한 번만 import)"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+def warm_up(names):
+    """무거운 모듈을 백그라운드 스레드에서 미리 import (창을 띄운 뒤 호출)"""
+
+    def run():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                print(f"모듈 미리 불러오기 실패 ({name}): {e}")
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
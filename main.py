@@ -1,19 +1,139 @@
 import sys
-import yfinance as yf
-import pandas as pd
-import numpy as np
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont, QIcon
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from PyQt5.QtGui import QFont, QIcon, QStandardItem, QStandardItemModel
 from datetime import datetime, timedelta
-import ta
-import requests
-from bs4 import BeautifulSoup
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+import alerts
+import tracing
+from lazy import lazy_import, warm_up
+from refresh import RefreshScheduler
+from result_cache import ResultCache
+from workers import TaskRunner
+from yahoo import is_rate_limited
+
+# pandas/yfinance/matplotlib 을 쓰는 모듈은 처음 사용할 때 import (창을 먼저 띄운다)
+analysis = lazy_import("analysis")
+chart = lazy_import("chart")
+core = lazy_import("core")
+indicators = lazy_import("indicators")
+market_data = lazy_import("market_data")
+symbols = lazy_import("symbols")
+table_model = lazy_import("table_model")
+watchlist = lazy_import("watchlist")
+
+# 창을 띄운 뒤 백그라운드에서 미리 불러 둘 모듈
+WARM_UP_MODULES = ["numpy", "pandas", "yfinance", "matplotlib.figure",
+                   "analysis", "market_data", "core", "watchlist", "table_model", "chart", "symbols"]
+
+# 입력이 멈춘 뒤 자동완성 후보를 찾기까지 기다리는 시간 (ms)
+SUGGEST_DELAY_MS = 150
+
+# 차트 기간 선택 -> (yfinance period, interval)
+PERIOD_INTERVAL_MAP = {
+    "1개월": ("1mo", "15m"),
+    "3개월": ("3mo", "1h"),
+    "6개월": ("6mo", "1d"),
+    "1년": ("1y", "1d"),
+    "5년": ("5y", "1wk")
+}
+
+# 재무제표 선택 콤보박스 항목 -> yfinance Ticker 속성
+STATEMENTS = {
+    "연간 손익계산서": "financials",
+    "분기 손익계산서": "quarterly_financials",
+    "연간 재무상태표": "balance_sheet",
+    "분기 재무상태표": "quarterly_balance_sheet",
+    "연간 현금흐름표": "cashflow",
+    "분기 현금흐름표": "quarterly_cashflow",
+}
+
+# 워치리스트 표의 (키, 헤더) 목록
+WATCHLIST_COLUMNS = [
+    ("ticker", "티커"),
+    ("price", "현재가"),
+    ("rsi", "RSI"),
+    ("rsi_signal", "RSI 신호"),
+    ("macd_signal", "MACD 신호"),
+    ("ma20", "MA20"),
+    ("ma50", "MA50"),
+    ("ma200", "MA200"),
+    ("eps", "EPS"),
+    ("per", "PER"),
+    ("growth_rate", "성장률(%)"),
+    ("suitable_price", "적정주가"),
+    ("discount", "괴리율(%)"),
+    ("category", "판단"),
+]
+
+# 받을 데이터가 없는 워치리스트 행의 판단 칸 표시 (자동 갱신에서 다시 요청하지 않는다)
+INVALID_TICKER = "잘못된 티커"
+NO_DATA = "데이터 없음"
+
+# 디버그 탭 표 헤더
+TRACE_COLUMNS = ["단계", "분류", "횟수", "합계(ms)", "평균(ms)", "최대(ms)", "마지막(ms)"]
+
+# 재무제표/워치리스트 표 공통 스타일
+TABLE_STYLE = """
+    QTableView {
+        background-color: #1e1e1e;
+        color: white;
+        border: none;
+        gridline-color: #333333;
+    }
+    QTableView::item {
+        background-color: #1e1e1e;
+        color: white;
+        border-bottom: 1px solid #333333;
+        padding: 5px;
+    }
+    QTableView::item:selected {
+        background-color: #2962ff;
+    }
+    QTableView QHeaderView::section {
+        background-color: #252525;
+        color: white;
+        border: none;
+        border-bottom: 1px solid #333333;
+        padding: 5px;
+    }
+    QTableView QHeaderView::section:horizontal {
+        border-right: 1px solid #333333;
+    }
+    QTableView QHeaderView::section:vertical {
+        border-right: 1px solid #333333;
+    }
+    QScrollBar:vertical {
+        background-color: #1e1e1e;
+        width: 12px;
+        border: none;
+    }
+    QScrollBar::handle:vertical {
+        background-color: #404040;
+        border-radius: 6px;
+        min-height: 20px;
+    }
+    QScrollBar::handle:vertical:hover {
+        background-color: #4a4a4a;
+    }
+    QScrollBar:horizontal {
+        background-color: #1e1e1e;
+        height: 12px;
+        border: none;
+    }
+    QScrollBar::handle:horizontal {
+        background-color: #404040;
+        border-radius: 6px;
+        min-width: 20px;
+    }
+    QScrollBar::handle:horizontal:hover {
+        background-color: #4a4a4a;
+    }
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical,
+    QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
+        height: 0px;
+        width: 0px;
+    }
+"""
 
 class StockAnalyzer(QMainWindow):
     def __init__(self):
@@ -146,9 +266,50 @@ class StockAnalyzer(QMainWindow):
             QMessageBox QPushButton:hover {
                 background-color: #1e88e5;
             }
+            QCheckBox, QStatusBar {
+                color: #ffffff;
+            }
+            QSpinBox {
+                background-color: #1e1e1e;
+                color: white;
+                border: 2px solid #333333;
+                border-radius: 6px;
+                padding: 5px;
+            }
         """)
+        self.session = None
+        # 최근에 본 티커의 분석 결과 (티커를 오갈 때 다시 받지 않고 바로 그린다)
+        self.results = ResultCache()
+        self.tasks = TaskRunner(self)
+        # 워치리스트 일괄 분석은 별도의 제한된 풀에서 실행
+        self.batch_tasks = TaskRunner(self, max_threads=8)
+        # 종목 목록(자동완성/티커 검증) 불러오기는 분석 작업 취소와 상관없이 따로 실행
+        self.symbol_tasks = TaskRunner(self, max_threads=1)
+        self.analysis_error_shown = False
+
+        # 자동 갱신 (요청 중복 방지/요청 제한 시 주기 증가는 스케줄러가 처리)
+        self.refresh_tasks = TaskRunner(self, max_threads=4)
+        self.refresher = RefreshScheduler(self)
+        self.refresher.refresh_requested.connect(self.auto_refresh)
+        self.refresher.interval_changed.connect(
+            lambda seconds: self.statusBar().showMessage(f"자동 갱신 주기: {seconds}초"))
+        self.refresher.round_finished.connect(self.on_refresh_finished)
+        self.chart_data = None
+        self.live_state = None
+        self.live_ticker = None
+        self.live_last_ts = None
+        self.live_text = None
+        # 적정주가 계산에 쓰는 받아 둔 값 (티커, EPS, PER, 현재가, 성장률)
+        self.valuation_inputs = None
+        # 지표 기준값 알림 (규칙은 ~/.stockist/alerts.json 에 저장)
+        self.alerts = alerts.AlertEngine()
+        self.alerts.load()
         self.initUI()
 
+        # 창이 뜬 뒤 무거운 모듈을 백그라운드에서 미리 불러와 첫 분석을 빠르게 한다
+        QTimer.singleShot(0, lambda: warm_up(WARM_UP_MODULES))
+        QTimer.singleShot(0, self.load_symbols)
+
     def initUI(self):
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -160,10 +321,32 @@ class StockAnalyzer(QMainWindow):
         self.ticker_input.setPlaceholderText("티커 심볼 입력 (예: AAPL)")
         self.ticker_input.returnPressed.connect(self.analyze_stock)
         self.ticker_input.textChanged.connect(self.on_text_changed)
+
+        # 티커/종목명 자동완성: 후보는 직접 찾아서 넣고 (UserRole = 티커), 입력이 멈추면 갱신
+        self.symbol_model = QStandardItemModel(self)
+        self.suggested = set()
+        self.completer = QCompleter(self.symbol_model, self)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setCompletionRole(Qt.UserRole)
+        self.completer.activated[str].connect(self.on_symbol_chosen)
+        self.ticker_input.setCompleter(self.completer)
+        self.suggest_timer = QTimer(self)
+        self.suggest_timer.setSingleShot(True)
+        self.suggest_timer.setInterval(SUGGEST_DELAY_MS)
+        self.suggest_timer.timeout.connect(self.update_suggestions)
         search_button = QPushButton("분석")
         search_button.clicked.connect(self.analyze_stock)
+        self.auto_refresh_check = QCheckBox("자동 갱신")
+        self.auto_refresh_check.toggled.connect(self.toggle_auto_refresh)
+        self.refresh_interval_spin = QSpinBox()
+        self.refresh_interval_spin.setRange(15, 3600)
+        self.refresh_interval_spin.setValue(60)
+        self.refresh_interval_spin.setSuffix("초")
+        self.refresh_interval_spin.valueChanged.connect(lambda _: self.toggle_auto_refresh(self.auto_refresh_check.isChecked()))
         search_layout.addWidget(self.ticker_input)
         search_layout.addWidget(search_button)
+        search_layout.addWidget(self.auto_refresh_check)
+        search_layout.addWidget(self.refresh_interval_spin)
         layout.addLayout(search_layout)
 
         # 탭 위젯 생성
@@ -215,11 +398,39 @@ class StockAnalyzer(QMainWindow):
         per_layout.addWidget(self.industry_per_input)
         per_layout.addWidget(update_button)
         valuation_layout.addLayout(per_layout)
+
+        # 가정 바꿔보기: 받아 둔 값으로만 다시 계산하므로 즉시 반영된다
+        what_if_layout = QHBoxLayout()
+        what_if_layout.addWidget(QLabel("업종 PER"))
+        self.industry_per_slider = QSlider(Qt.Horizontal)
+        self.industry_per_slider.setRange(0, 100)
+        self.industry_per_slider.valueChanged.connect(self.on_industry_per_slider)
+        what_if_layout.addWidget(self.industry_per_slider)
+        self.growth_cap_label = QLabel(f"성장률 상한: ±{analysis.GROWTH_CAP}%")
+        what_if_layout.addWidget(self.growth_cap_label)
+        self.growth_cap_slider = QSlider(Qt.Horizontal)
+        self.growth_cap_slider.setRange(5, 100)
+        self.growth_cap_slider.setValue(analysis.GROWTH_CAP)
+        self.growth_cap_slider.valueChanged.connect(self.on_growth_cap_slider)
+        what_if_layout.addWidget(self.growth_cap_slider)
+        valuation_layout.addLayout(what_if_layout)
         tabs.addTab(self.valuation_tab, "적정주가 분석")
 
         # 재무제표 탭
         self.financial_tab = QWidget()
         self.financial_layout = QVBoxLayout(self.financial_tab)
+        statement_layout = QHBoxLayout()
+        self.statement_combo = QComboBox()
+        self.statement_combo.addItems(STATEMENTS.keys())
+        self.statement_combo.currentTextChanged.connect(self.update_financials)
+        statement_layout.addWidget(self.statement_combo)
+        statement_layout.addStretch()
+        self.financial_layout.addLayout(statement_layout)
+
+        # 표와 모델은 한 번만 만들고, 분석할 때마다 모델의 데이터만 교체 (모델은 첫 결과가 올 때 생성)
+        self.financial_model = None
+        self.financial_table = self.setup_table(QTableView())
+        self.financial_layout.addWidget(self.financial_table)
         tabs.addTab(self.financial_tab, "재무제표")
 
         # 차트 분석 탭
@@ -235,6 +446,8 @@ class StockAnalyzer(QMainWindow):
         self.period_combo = QComboBox()
         self.period_combo.addItems(["1개월", "3개월", "6개월", "1년", "5년"])
         self.period_combo.setCurrentText("6개월")
+        # 기간 전환은 받아 둔 시세를 잘라/묶어서 그리므로 선택 즉시 반영
+        self.period_combo.currentTextChanged.connect(self.update_chart)
         period_layout.addWidget(period_label)
         period_layout.addWidget(self.period_combo)
         
@@ -247,236 +460,180 @@ class StockAnalyzer(QMainWindow):
         control_layout.addWidget(update_chart_btn)
         chart_layout.addLayout(control_layout)
         
-        # Matplotlib 차트
-        self.figure, self.ax = plt.subplots(figsize=(10, 6))
-        self.canvas = FigureCanvas(self.figure)
-        chart_layout.addWidget(self.canvas)
+        # Matplotlib 차트 (figure 와 캔버스는 처음 그릴 때 한 번만 만들고 이후에는 데이터만 교체)
+        self.chart_layout = chart_layout
+        self.chart = None
         
         tabs.addTab(self.chart_tab, "차트 분석")
 
+        # 워치리스트 탭
+        self.watchlist_tab = QWidget()
+        watchlist_layout = QVBoxLayout(self.watchlist_tab)
+
+        batch_layout = QHBoxLayout()
+        self.watchlist_input = QLineEdit()
+        self.watchlist_input.setPlaceholderText("티커 목록 입력 (예: AAPL, MSFT, NVDA)")
+        self.watchlist_input.returnPressed.connect(self.run_watchlist)
+        batch_button = QPushButton("일괄 분석")
+        batch_button.clicked.connect(self.run_watchlist)
+        batch_layout.addWidget(self.watchlist_input)
+        batch_layout.addWidget(batch_button)
+        watchlist_layout.addLayout(batch_layout)
+
+        self.watchlist_status = QLabel("")
+        watchlist_layout.addWidget(self.watchlist_status)
+
+        self.watchlist_table = self.create_financial_table()
+        self.watchlist_table.setColumnCount(len(WATCHLIST_COLUMNS))
+        self.watchlist_table.setHorizontalHeaderLabels([header for _, header in WATCHLIST_COLUMNS])
+        self.watchlist_table.verticalHeader().setVisible(False)
+        self.watchlist_table.setSortingEnabled(True)
+        watchlist_layout.addWidget(self.watchlist_table)
+
+        tabs.addTab(self.watchlist_tab, "워치리스트")
+
+        # 알림 탭: 워치리스트/자동 갱신으로 들어오는 지표가 기준값을 지나면 알림
+        self.alerts_tab = QWidget()
+        alerts_layout = QVBoxLayout(self.alerts_tab)
+        rule_layout = QHBoxLayout()
+        self.alert_input = QLineEdit()
+        self.alert_input.setPlaceholderText("예: AAPL rsi > 70; MSFT bb_position < 0; NVDA discount > 0")
+        self.alert_input.returnPressed.connect(self.add_alert_rules)
+        add_alert_btn = QPushButton("규칙 추가")
+        add_alert_btn.clicked.connect(self.add_alert_rules)
+        clear_alert_btn = QPushButton("모두 삭제")
+        clear_alert_btn.clicked.connect(self.clear_alert_rules)
+        rule_layout.addWidget(self.alert_input)
+        rule_layout.addWidget(add_alert_btn)
+        rule_layout.addWidget(clear_alert_btn)
+        alerts_layout.addLayout(rule_layout)
+
+        self.alert_status = QLabel("")
+        self.alert_status.setWordWrap(True)
+        alerts_layout.addWidget(self.alert_status)
+        self.alert_log = QPlainTextEdit()
+        self.alert_log.setReadOnly(True)
+        self.alert_log.setMaximumBlockCount(1000)
+        alerts_layout.addWidget(self.alert_log)
+        tabs.addTab(self.alerts_tab, "알림")
+        self.update_alert_status()
+
+        # 시스템 트레이가 있으면 데스크톱 알림, 없으면 상태 표시줄에 표시
+        self.tray_icon = None
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            self.tray_icon = QSystemTrayIcon(self.windowIcon(), self)
+            self.tray_icon.show()
+
+        # 디버그 탭: 단계별 실행 시간과 캐시 적중/실패
+        self.debug_tab = QWidget()
+        debug_layout = QVBoxLayout(self.debug_tab)
+        debug_buttons = QHBoxLayout()
+        refresh_debug_btn = QPushButton("새로고침")
+        refresh_debug_btn.clicked.connect(self.refresh_debug_panel)
+        reset_debug_btn = QPushButton("초기화")
+        reset_debug_btn.clicked.connect(self.reset_trace)
+        export_trace_btn = QPushButton("Chrome trace 내보내기")
+        export_trace_btn.clicked.connect(self.export_trace)
+        debug_buttons.addWidget(refresh_debug_btn)
+        debug_buttons.addWidget(reset_debug_btn)
+        debug_buttons.addStretch()
+        debug_buttons.addWidget(export_trace_btn)
+        debug_layout.addLayout(debug_buttons)
+
+        self.counter_label = QLabel("")
+        self.counter_label.setWordWrap(True)
+        debug_layout.addWidget(self.counter_label)
+
+        self.trace_table = self.create_financial_table()
+        self.trace_table.setColumnCount(len(TRACE_COLUMNS))
+        self.trace_table.setHorizontalHeaderLabels(TRACE_COLUMNS)
+        self.trace_table.verticalHeader().setVisible(False)
+        debug_layout.addWidget(self.trace_table)
+        tabs.addTab(self.debug_tab, "디버그")
+
+        # 디버그 탭이 보일 때만 1초마다 갱신
+        self.debug_timer = QTimer(self)
+        self.debug_timer.timeout.connect(self.refresh_debug_panel)
+        tabs.currentChanged.connect(
+            lambda index: self.debug_timer.start(1000) if tabs.widget(index) is self.debug_tab
+            else self.debug_timer.stop())
+
         layout.addWidget(tabs)
         self.setMinimumSize(1024, 600)
 
-    def create_financial_table(self):
-        # 기존 테이블과 위젯 제거
-        for i in reversed(range(self.financial_layout.count())): 
-            widget = self.financial_layout.itemAt(i).widget()
-            if widget is not None:
-                widget.deleteLater()
-
-        # 새 테이블 생성
-        table = QTableWidget()
-        table.setStyleSheet("""
-            QTableWidget {
-                background-color: #1e1e1e;
-                color: white;
-                border: none;
-                gridline-color: #333333;
-            }
-            QTableWidget::item {
-                background-color: #1e1e1e;
-                color: white;
-                border-bottom: 1px solid #333333;
-                padding: 5px;
-            }
-            QTableWidget::item:selected {
-                background-color: #2962ff;
-            }
-            QTableWidget QHeaderView::section {
-                background-color: #252525;
-                color: white;
-                border: none;
-                border-bottom: 1px solid #333333;
-                padding: 5px;
-            }
-            QTableWidget QHeaderView::section:horizontal {
-                border-right: 1px solid #333333;
-            }
-            QTableWidget QHeaderView::section:vertical {
-                border-right: 1px solid #333333;
-            }
-            QScrollBar:vertical {
-                background-color: #1e1e1e;
-                width: 12px;
-                border: none;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #404040;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #4a4a4a;
-            }
-            QScrollBar:horizontal {
-                background-color: #1e1e1e;
-                height: 12px;
-                border: none;
-            }
-            QScrollBar::handle:horizontal {
-                background-color: #404040;
-                border-radius: 6px;
-                min-width: 20px;
-            }
-            QScrollBar::handle:horizontal:hover {
-                background-color: #4a4a4a;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical,
-            QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
-                height: 0px;
-                width: 0px;
-            }
-        """)
+    def get_session(self, ticker, refresh=False):
+        # 같은 티커는 한 번 받아온 데이터 세션을 재사용
+        if refresh or self.session is None or self.session.ticker != ticker:
+            self.session = market_data.TickerSession(ticker)
+        return self.session
 
-        # 테이블 속성 설정
+    def setup_table(self, table):
+        # 스타일시트와 공통 속성은 표를 만들 때 한 번만 적용
+        table.setStyleSheet(TABLE_STYLE)
         table.horizontalHeader().setStretchLastSection(True)
         table.verticalHeader().setVisible(True)
         table.setAlternatingRowColors(False)  # 단일 배경색 사용
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         table.horizontalHeader().setDefaultAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         table.verticalHeader().setDefaultAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-        
         return table
 
+    def create_financial_table(self):
+        return self.setup_table(QTableWidget())
+
     def update_chart(self):
         ticker = self.ticker_input.text().upper()
         if not ticker:
             return
 
+        selected_period = self.period_combo.currentText()
+        period, interval = PERIOD_INTERVAL_MAP[selected_period]
+        session = self.get_session(ticker)
+
+        # 시세는 작업 스레드에서 받고, 그리기는 GUI 스레드에서 한다
+        self.tasks.cancel("chart")
+        self.submit_cached(
+            "chart", (ticker, "chart", selected_period),
+            lambda: session.history(period=period, interval=interval),
+            self.traced("render chart", lambda hist: self.draw_chart(ticker, selected_period, interval, hist)),
+            self.show_chart_error)
+
+    def ensure_chart(self):
+        if self.chart is None:
+            self.chart = chart.ChartController()
+            self.chart_layout.addWidget(self.chart.toolbar)
+            self.chart_layout.addWidget(self.chart.canvas)
+        return self.chart
+
+    def draw_chart(self, ticker, selected_period, interval, hist):
         try:
-            # 기존 figure 제거
-            plt.close(self.figure)
-            
-            # 한글 폰트 설정 재확인
-            if not plt.rcParams['font.family'] in ['Malgun Gothic', '맑은 고딕', 'NanumGothic', '나눔고딕']:
-                import matplotlib.font_manager as fm
-                # 설치된 폰트 중 한글 폰트 찾기
-                for font in fm.findSystemFonts():
-                    try:
-                        font_name = fm.FontProperties(fname=font).get_name()
-                        if any(korean_font in font_name for korean_font in ['Malgun Gothic', '맑은 고딕', 'NanumGothic', '나눔고딕']):
-                            plt.rcParams['font.family'] = font_name
-                            break
-                    except:
-                        continue
-            
-            plt.rcParams['axes.unicode_minus'] = False
-            
-            self.figure = plt.figure(figsize=(12, 7))
-            self.ax = self.figure.add_axes([0.1, 0.2, 0.8, 0.7])  # [left, bottom, width, height]
-            
-            period_interval_map = {
-                "1개월": ("1mo", "15m"),
-                "3개월": ("3mo", "1h"),
-                "6개월": ("6mo", "1d"),
-                "1년": ("1y", "1d"),
-                "5년": ("5y", "1wk")
-            }
-            
-            selected_period = self.period_combo.currentText()
-            period, interval = period_interval_map[selected_period]
-            
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period=period, interval=interval)
-            
             if hist.empty:
                 raise ValueError("데이터를 가져올 수 없습니다.")
-            
-            dates = hist.index.values
-            closes = hist['Close'].values
-            volumes = hist['Volume'].values
-            
-            # 스타일 설정
-            self.figure.set_facecolor('#1e1e1e')
-            self.ax.set_facecolor('#1e1e1e')
-            
-            # 가격 차트
-            color_price = '#2962ff'
-            self.ax.plot(dates, closes, label='종가', color=color_price, linewidth=1.5)
-            
-            # 이동평균선
-            if selected_period in ["1개월", "3개월"]:
-                ma5 = pd.Series(closes).rolling(window=5, min_periods=1).mean().values
-                ma10 = pd.Series(closes).rolling(window=10, min_periods=1).mean().values
-                self.ax.plot(dates, ma5, label='5일 이동평균', color='#ff6b6b', linestyle='--', linewidth=1)
-                self.ax.plot(dates, ma10, label='10일 이동평균', color='#51cf66', linestyle='--', linewidth=1)
-            else:
-                ma20 = pd.Series(closes).rolling(window=20, min_periods=1).mean().values
-                ma50 = pd.Series(closes).rolling(window=50, min_periods=1).mean().values
-                self.ax.plot(dates, ma20, label='20일 이동평균', color='#ff6b6b', linestyle='--', linewidth=1)
-                self.ax.plot(dates, ma50, label='50일 이동평균', color='#51cf66', linestyle='--', linewidth=1)
-            
-            # 가격 축 스타일 설정
-            self.ax.tick_params(axis='y', colors=color_price)
-            self.ax.yaxis.label.set_color(color_price)
-            
-            # 거래량 차트 (아래 subplot으로 변경)
-            volume_ax = self.figure.add_axes([0.1, 0.1, 0.8, 0.1])  # [left, bottom, width, height]
-            volume_color = '#45aaf2'
-            volume_ax.bar(dates, volumes, color=volume_color, alpha=0.3)
-            volume_ax.set_facecolor('#1e1e1e')
-            
-            # 거래량 축 스타일 설정
-            volume_ax.tick_params(axis='y', colors=volume_color, labelsize=8)
-            volume_ax.yaxis.label.set_color(volume_color)
-            volume_ax.set_ylabel('거래량', color=volume_color, fontsize=10)
-            
-            # x축은 volume_ax에만 표시
-            self.ax.set_xticks([])
-            volume_ax.tick_params(axis='x', colors='white', labelsize=8, rotation=45)
-            
-            # 날짜 포맷 설정
-            if selected_period in ["1개월", "3개월"]:
-                date_format = '%m-%d %H:%M'
-            else:
-                date_format = '%Y-%m-%d'
-            
-            volume_ax.xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter(date_format))
-            
-            # 그리드 설정
-            self.ax.grid(True, linestyle='--', alpha=0.2, color='white')
-            volume_ax.grid(False)
-            
-            # 테두리 설정
-            for ax in [self.ax, volume_ax]:
-                for spine in ax.spines.values():
-                    spine.set_color('white')
-                    spine.set_linewidth(0.5)
-                ax.tick_params(colors='white', labelsize=8)
-            
-            # 레이블 설정
-            interval_display = {
-                "15m": "15분",
-                "1h": "1시간",
-                "1d": "일간",
-                "1wk": "주간"
-            }
-            
-            self.ax.set_title(f"{ticker} 주가 차트 ({selected_period}, {interval_display[interval]} 데이터)", 
-                            color='white', pad=20, fontsize=12)
-            self.ax.set_ylabel("주가 ($)", color=color_price, fontsize=10)
-            
-            # 범례 설정
-            legend = self.ax.legend(facecolor='#1e1e1e', 
-                                edgecolor='#333333', 
-                                labelcolor='white', 
-                                fontsize=8,
-                                loc='upper left')
-            legend.get_frame().set_alpha(0.7)
-            
-            # 캔버스 업데이트
-            if hasattr(self, 'canvas'):
-                self.financial_layout.removeWidget(self.canvas)
-                self.canvas.deleteLater()
-            
-            self.canvas = FigureCanvas(self.figure)
-            self.chart_tab.layout().addWidget(self.canvas)
+
+            self.ensure_chart().update(ticker, selected_period, interval, hist)
+            self.chart_data = (ticker, selected_period, interval, hist)
 
         except Exception as e:
-            error_msg = str(e)
-            if "data not available" in error_msg:
-                error_msg = "선택한 기간에 대한 데이터를 가져올 수 없습니다.\n더 짧은 기간을 선택해주세요."
-            self.show_error_message("에러", f"차트 업데이트 중 오류가 발생했습니다:\n{error_msg}")
+            self.show_chart_error(str(e))
+
+    def show_chart_error(self, error_msg):
+        if "data not available" in error_msg:
+            error_msg = "선택한 기간에 대한 데이터를 가져올 수 없습니다.\n더 짧은 기간을 선택해주세요."
+        self.show_error_message("에러", f"차트 업데이트 중 오류가 발생했습니다:\n{error_msg}")
+
+    def show_analysis_error(self, error_msg):
+        # 여러 탭이 동시에 실패해도 메시지 박스는 한 번만 띄운다
+        if self.analysis_error_shown:
+            return
+        self.analysis_error_shown = True
+        if is_rate_limited(error_msg):
+            # 재시도 후에도 요청 제한이 풀리지 않은 경우: 일반 오류와 구분해서 안내
+            self.statusBar().showMessage("Yahoo 요청 제한(429) - 잠시 후 다시 시도하세요")
+            self.show_error_message("요청 제한", f"Yahoo Finance 요청 제한에 걸렸습니다. 잠시 후 다시 시도하세요.\n{error_msg}")
+            return
+        # 종목 목록에 없는 티커였다면 요청이 실패한 뒤에 비슷한 티커를 알려 준다
+        hint = symbols.suggestion_hint(self.session.ticker, symbols.default_universe.index) if self.session else ""
+        self.show_error_message("에러", f"데이터 분석 중 오류가 발생했습니다:\n{error_msg}" + (f"\n{hint}" if hint else ""))
 
     def show_error_message(self, title, message):
         msg_box = QMessageBox(self)
@@ -510,254 +667,497 @@ class StockAnalyzer(QMainWindow):
         cursor_pos = self.ticker_input.cursorPosition()
         self.ticker_input.setText(text.upper())
         self.ticker_input.setCursorPosition(cursor_pos)
+        self.suggest_timer.start()
+
+    def load_symbols(self):
+        self.symbol_tasks.submit(
+            "symbols", lambda: symbols.default_universe.load(), lambda index: self.update_suggestions())
+
+    def update_suggestions(self):
+        index = symbols.default_universe.index
+        text = self.ticker_input.text().strip()
+        # 고른 후보가 입력란에 들어간 경우에는 목록을 다시 만들지 않는다
+        if index is None or not text or text in self.suggested:
+            return
+
+        results = index.search(text)
+        self.suggested = {symbol for symbol, _ in results}
+        self.symbol_model.clear()
+        for symbol, name in results:
+            item = QStandardItem(f"{symbol}  {name}")
+            item.setData(symbol, Qt.UserRole)
+            self.symbol_model.appendRow(item)
+        if results and self.ticker_input.hasFocus():
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
+
+    def on_symbol_chosen(self, ticker):
+        self.suggest_timer.stop()
+        self.ticker_input.setText(ticker)
+        # 키보드로 고르면 returnPressed 가 먼저 분석을 시작하므로, 마우스로 고른 경우에만 여기서 시작
+        if not self.is_current_ticker(ticker):
+            self.analyze_stock()
+
+    def check_ticker(self, ticker):
+        """형식이 잘못된 티커는 요청을 보내지 않고 바로 알린다"""
+        try:
+            symbols.validate(ticker)
+        except ValueError as e:
+            self.show_error_message("티커 확인", str(e))
+            return False
+        return True
 
     def analyze_stock(self):
+        ticker = self.ticker_input.text().strip().upper()
+        if not ticker or not self.check_ticker(ticker):
+            return
+        self.completer.popup().hide()
+
+        with tracing.span("analyze_stock", "ui", ticker=ticker):
+            self.start_analysis(ticker)
+
+    def start_analysis(self, ticker):
+        # 이전 티커에 대해 진행 중인 작업은 모두 취소
+        self.tasks.cancel()
+        self.analysis_error_shown = False
+
+        # 보고 있는 티커를 다시 분석하면 결과 캐시를 비우고 최신 데이터를 받는다
+        # (다른 티커로 바꿀 때는 최근에 본 티커의 결과를 캐시에서 바로 그린다)
+        if self.is_current_ticker(ticker):
+            self.results.invalidate(ticker)
+        session = self.get_session(ticker, refresh=True)
+        self.live_state = None
+        self.live_text = None
+        self.valuation_inputs = None
+
+        for text_widget in (self.info_text, self.technical_text, self.valuation_text):
+            text_widget.setText("불러오는 중...")
+
+        # 각 탭은 병렬로 데이터를 받고, 도착하는 순서대로 채워진다 (최근에 본 티커는 캐시에서 바로)
+        self.submit_cached(
+            "info", (ticker, "info"),
+            lambda: core.info_text(session.info),
+            self.traced("render info", self.info_text.setText),
+            self.show_analysis_error)
+        self.submit_cached(
+            "technical", (ticker, "technical"),
+            lambda: self.build_technical_text(session.daily_history()),
+            self.traced("render technical", self.technical_text.setText),
+            self.show_analysis_error)
+        self.update_financials()
+
+        # 적정주가 분석
+        self.update_valuation()
+
+        # 차트 업데이트
+        self.update_chart()
+
+    def submit_cached(self, channel, key, fn, on_result, on_error):
+        """결과 캐시에 신선한 값이 있으면 바로 그리고, 없으면 작업 스레드에서 받아 캐시에 넣은 뒤 그린다"""
+        cached = self.results.get(key)
+        if cached is not None:
+            on_result(cached)
+            return
+
+        def store(result):
+            self.results.put(key, result)
+            on_result(result)
+
+        self.tasks.submit(channel, fn, store, on_error)
+
+    def traced(self, name, fn):
+        # 작업 결과를 화면에 반영하는 시간을 디버그 탭에 기록
+        def run(*args):
+            with tracing.span(name, "render"):
+                return fn(*args)
+        return run
+
+    def build_technical_text(self, hist):
+        return core.technical_text(analysis.technical_indicators(hist['Close']))
+
+    def update_financials(self):
         ticker = self.ticker_input.text().upper()
         if not ticker:
             return
 
-        try:
-            stock = yf.Ticker(ticker)
-            
-            # 기본 정보 분석
-            info = stock.info
-            info_text = f"""
-            회사명: {info.get('longName', 'N/A')}
-            섹터: {info.get('sector', 'N/A')}
-            산업: {info.get('industry', 'N/A')}
-            시가총액: ${info.get('marketCap', 0):,.2f}
-            52주 최고가: ${info.get('fiftyTwoWeekHigh', 0):,.2f}
-            52주 최저가: ${info.get('fiftyTwoWeekLow', 0):,.2f}
-            Beta: {info.get('beta', 'N/A')}
-            배당수익률: {info.get('dividendYield', 0) * 100:.2f}%
-            """
-            self.info_text.setText(info_text)
-
-            # 기술적 분석
-            hist = stock.history(period="1y")
-            
-            # RSI 계산
-            rsi = ta.momentum.RSIIndicator(hist['Close']).rsi()
-            current_rsi = rsi.iloc[-1]
-            
-            # MACD 계산
-            macd = ta.trend.MACD(hist['Close'])
-            current_macd = macd.macd().iloc[-1]
-            current_signal = macd.macd_signal().iloc[-1]
-            
-            # 볼린저 밴드
-            bollinger = ta.volatility.BollingerBands(hist['Close'])
-            current_middle = bollinger.bollinger_mavg().iloc[-1]
-            current_upper = bollinger.bollinger_hband().iloc[-1]
-            current_lower = bollinger.bollinger_lband().iloc[-1]
-            
-            technical_text = f"""
-            현재가: ${hist['Close'].iloc[-1]:.2f}
-            
-            RSI (14): {current_rsi:.2f}
-            RSI 신호: {"과매수" if current_rsi > 70 else "과매도" if current_rsi < 30 else "중립"}
-            
-            MACD: {current_macd:.2f}
-            MACD Signal: {current_signal:.2f}
-            MACD 신호: {"매수" if current_macd > current_signal else "매도"}
-            
-            볼린저 밴드:
-            상단: ${current_upper:.2f}
-            중간: ${current_middle:.2f}
-            하단: ${current_lower:.2f}
-            
-            이동평균선:
-            MA20: ${hist['Close'].rolling(window=20).mean().iloc[-1]:.2f}
-            MA50: ${hist['Close'].rolling(window=50).mean().iloc[-1]:.2f}
-            MA200: ${hist['Close'].rolling(window=200).mean().iloc[-1]:.2f}
-            """
-            self.technical_text.setText(technical_text)
-
-            # 적정주가 분석
-            self.update_valuation()
-
-            # 재무제표 분석
-            financials = stock.financials
-            if not financials.empty:
-                # 새 테이블 생성
-                table = self.create_financial_table()
-                
-                # 테이블 크기 설정
-                table.setRowCount(len(financials.index))
-                table.setColumnCount(len(financials.columns))
-                
-                # 헤더 설정
-                headers = [date.strftime('%Y-%m-%d') for date in financials.columns]
-                table.setHorizontalHeaderLabels(headers)
-                table.setVerticalHeaderLabels(financials.index)
-                
-                # 데이터 채우기
-                for i in range(len(financials.index)):
-                    for j in range(len(financials.columns)):
-                        value = financials.iloc[i, j]
-                        formatted_value = f"${value:,.0f}" if pd.notnull(value) else "N/A"
-                        item = QTableWidgetItem(formatted_value)
-                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                        table.setItem(i, j, item)
-                
-                # 열 너비 자동 조정
-                table.resizeColumnsToContents()
-                
-                # 새 테이블을 레이아웃에 추가
-                self.financial_layout.addWidget(table)
-
-            # 차트 업데이트
-            self.update_chart()
+        session = self.get_session(ticker)
+        name = STATEMENTS[self.statement_combo.currentText()]
+        self.tasks.cancel("financials")
+        self.submit_cached(
+            "financials", (ticker, "statement", name),
+            lambda: session.statement(name),
+            self.traced("render financials", self.show_financials),
+            self.show_analysis_error)
 
-        except Exception as e:
-            self.show_error_message("에러", f"데이터 분석 중 오류가 발생했습니다:\n{str(e)}")
-    
-    def fetch_per_eps(self, ticker):
-        try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            eps = info.get("trailingEps", None)
-            if eps is None:
-                raise ValueError("EPS 데이터를 가져올 수 없습니다.")
-
-            url = f"https://finance.yahoo.com/quote/{ticker}"
-            response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-            if response.status_code != 200:
-                raise ConnectionError("Yahoo Finance 페이지에 접근할 수 없습니다.")
-            
-            soup = BeautifulSoup(response.text, "html.parser")
-            pe_ratio_element = soup.find("fin-streamer", {"data-field": "trailingPE"})
-            
-            if pe_ratio_element is None or not pe_ratio_element.text.strip():
-                raise ValueError("PE Ratio 데이터를 가져올 수 없습니다.")
-            
-            try:
-                pe_ratio = float(pe_ratio_element.text.replace(",", ""))
-                return eps, pe_ratio
-            except ValueError:
-                raise ValueError("PE Ratio 값을 숫자로 변환할 수 없습니다.")
+    def show_financials(self, financials):
+        # 재무제표 분석
+        if self.financial_model is None:
+            self.financial_model = table_model.DataFrameModel(self)
+            self.financial_table.setModel(self.financial_model)
+        self.financial_model.set_frame(financials)
 
-        except Exception as e:
-            print(f"오류 발생: {e}")
-            return None, None
+        # 열 너비는 모든 셀 대신 가장 긴 값 하나로 계산
+        metrics = self.financial_table.fontMetrics()
+        texts = [self.financial_model.widest_text(), *self.financial_model.column_labels]
+        width = max(metrics.horizontalAdvance(text) for text in texts)
+        self.financial_table.horizontalHeader().setDefaultSectionSize(width + 30)
 
-    def fetch_grow_rate(self, ticker):
-        try:
-            Data = yf.Ticker(ticker).history(period="3mo")
-            closing_prices = Data['Close']
-            start_price = closing_prices.iloc[0]
-            end_price = closing_prices.iloc[-1]
-            growth_rate = ((end_price - start_price) / start_price) * 100
-            return growth_rate
-        except Exception as e:
-            print(f"성장률 계산 오류: {e}")
-            return 0
+    def run_watchlist(self):
+        tickers = watchlist.parse_tickers(self.watchlist_input.text())
+        if not tickers:
+            return
+
+        # 이전 일괄 분석은 취소하고 표를 비운다
+        self.batch_tasks.cancel()
+        self.watchlist_table.setSortingEnabled(False)
+        self.watchlist_table.setRowCount(0)
+        self.watchlist_table.setSortingEnabled(True)
+        self.watchlist_total = len(tickers)
+        self.watchlist_done = 0
+        self.update_watchlist_status()
+
+        # 형식이 잘못된 티커는 받지 않고 바로 표시
+        for ticker in [ticker for ticker in tickers if not symbols.is_valid_format(ticker)]:
+            tickers.remove(ticker)
+            self.add_watchlist_row({"ticker": ticker, "category": INVALID_TICKER})
+
+        # 일봉은 묶음 단위로 한 번에 받고, 종목별 분석은 풀에서 병렬로 실행
+        for chunk in watchlist.chunked(tickers, watchlist.DOWNLOAD_CHUNK):
+            self.batch_tasks.submit(
+                "watchlist",
+                lambda chunk=chunk: watchlist.download_chunk(chunk),
+                lambda result, chunk=chunk: self.on_watchlist_chunk(chunk, *result),
+                lambda message, chunk=chunk: self.on_watchlist_chunk(chunk, {}, {}))
+
+    def on_watchlist_chunk(self, chunk, histories, technicals):
+        for ticker in chunk:
+            if ticker not in histories:
+                found = symbols.suggestions(ticker, symbols.default_universe.index)
+                category = f"{NO_DATA} (혹시 {', '.join(found)}?)" if found else NO_DATA
+                self.add_watchlist_row({"ticker": ticker, "category": category})
+                continue
+            if ticker in technicals:
+                self.check_alerts(ticker, technicals[ticker])
+            session = market_data.TickerSession(ticker)
+            session.seed_daily_history(histories[ticker])
+            self.batch_tasks.submit(
+                "watchlist",
+                lambda session=session, values=technicals.get(ticker): watchlist.analyze_ticker(session, values),
+                self.add_watchlist_row,
+                lambda message, ticker=ticker: self.add_watchlist_row({"ticker": ticker, "category": "오류"}))
+
+    def add_watchlist_row(self, row):
+        table = self.watchlist_table
+        # 정렬 중에 행을 추가하면 위치가 꼬이므로 잠시 정렬을 끈다
+        table.setSortingEnabled(False)
+        r = table.rowCount()
+        table.insertRow(r)
+        for col, (key, _) in enumerate(WATCHLIST_COLUMNS):
+            self.set_watchlist_cell(r, col, row.get(key))
+        table.setSortingEnabled(True)
+        if isinstance(row.get("discount"), float):
+            self.check_alerts(row["ticker"], {"price": row["price"]}, row["suitable_price"])
+
+        self.watchlist_done += 1
+        self.update_watchlist_status()
+
+    def set_watchlist_cell(self, r, col, value):
+        item = self.watchlist_table.item(r, col)
+        if item is None:
+            item = QTableWidgetItem()
+            self.watchlist_table.setItem(r, col, item)
+
+        # 값이 바뀐 셀만 갱신
+        if isinstance(value, (int, float)):
+            # 숫자는 숫자로 넣어야 정렬이 올바르게 된다
+            value = round(float(value), 2)
+            if item.data(Qt.DisplayRole) != value:
+                item.setData(Qt.DisplayRole, value)
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        else:
+            text = value if value is not None else "N/A"
+            if item.text() != text:
+                item.setText(text)
+
+    def update_watchlist_status(self):
+        self.watchlist_status.setText(f"분석 완료: {self.watchlist_done} / {self.watchlist_total}")
+
+    def toggle_auto_refresh(self, enabled):
+        if enabled:
+            self.refresher.start(self.refresh_interval_spin.value())
+        else:
+            self.refresh_tasks.cancel()
+            self.refresher.stop()
+            self.statusBar().showMessage("자동 갱신 꺼짐")
 
-    def calculate_valuation(self, ticker, industry_per=None):
-            eps, per = self.fetch_per_eps(ticker)
-            if eps is None or per is None:
-                return "데이터를 가져올 수 없습니다."
+    def auto_refresh(self):
+        # 분석 중인 티커와 워치리스트를 백그라운드에서 갱신
+        if self.session is not None:
+            self.refresh_ticker(self.session)
+        if self.watchlist_table.rowCount():
+            self.refresh_watchlist()
 
-            stock = yf.Ticker(ticker)
-            current_price = stock.history(period="1d")['Close'].iloc[0]
+    def start_refresh_job(self, fn, on_result):
+        self.refresher.job_started()
 
-            # PER 상한선 설정
-            adjusted_per = min(per, 50)
-            
+        def done(result):
             try:
-                # 1년 데이터 가져오기
-                yearly_data = stock.history(period="1y")
-                # 분기별 성장률 계산
-                quarterly_growth_rates = []
-                for i in range(4):
-                    if len(yearly_data) >= (i + 1) * 63:
-                        start_idx = i * 63
-                        end_idx = (i + 1) * 63
-                        start_price = yearly_data['Close'].iloc[start_idx]
-                        end_price = yearly_data['Close'].iloc[end_idx - 1]
-                        quarter_growth = ((end_price - start_price) / start_price) * 100
-                        quarterly_growth_rates.append(quarter_growth)
-                
-                if quarterly_growth_rates:
-                    avg_growth_rate = sum(quarterly_growth_rates) / len(quarterly_growth_rates)
-                else:
-                    avg_growth_rate = self.fetch_grow_rate(ticker)
-                    
-                growth_rate = min(max(avg_growth_rate, -30), 30)
-            except Exception as e:
-                print(f"성장률 계산 오류: {e}")
-                growth_rate = 0
-
-            # PEG 비율을 고려한 적정주가 계산
-            if growth_rate > 0:
-                peg_ratio = adjusted_per / growth_rate
-                if peg_ratio > 2:  # PEG 비율이 2 이상이면 고평가
-                    suitable_price = eps * (adjusted_per * 0.8)  # 20% 할인
-                else:
-                    suitable_price = eps * (adjusted_per + growth_rate * 0.5)  # 성장률의 50%만 반영
-            else:
-                suitable_price = eps * adjusted_per  # 성장률이 없거나 마이너스일 경우
-
-            valuation_text = f"""
-            EPS (주당순이익): ${eps:.2f}
-            PER (주가수익비율): {per:.2f} {'(고평가 위험)' if per > 50 else ''}
-            조정된 PER: {adjusted_per:.2f}
-            1년 평균 분기 성장률: {growth_rate:.2f}%
-            현재 주가: ${current_price:.2f}
-            적정주가: ${suitable_price:.2f}
-            
-            PEG 비율: {(per/growth_rate if growth_rate > 0 else 'N/A')}
-            
-            분석 결과: """
-
-            # 고평가/저평가 판단 기준 변경
-            price_diff_ratio = abs(current_price - suitable_price) / suitable_price * 100
-
-            if price_diff_ratio <= 10:
-                valuation_text += "적정 가격대에서 거래되고 있습니다."
-            elif current_price > suitable_price:
-                if price_diff_ratio > 30:
-                    valuation_text += "매우 고평가 되어 있습니다. 투자에 신중을 기해야 합니다."
-                else:
-                    valuation_text += "다소 고평가 되어 있습니다."
+                on_result(result)
+            finally:
+                self.refresher.job_finished()
+
+        self.refresh_tasks.submit("refresh", fn, done, self.refresher.job_finished)
+
+    def refresh_ticker(self, session):
+        selected_period = self.period_combo.currentText()
+        period, interval = PERIOD_INTERVAL_MAP[selected_period]
+
+        if session.source_for(period, interval) == session.source_for(market_data.DAILY_PERIOD, "1d"):
+            # 일봉/주봉 차트는 기술적 분석과 같은 일봉에서 만들어지므로 요청 한 번으로 둘 다 갱신
+            def apply_daily(hist):
+                self.apply_technical_refresh(session.ticker, hist)
+                self.apply_chart_refresh(session.ticker, selected_period, interval,
+                                         session.history(period=period, interval=interval))
+
+            self.start_refresh_job(lambda: session.refresh_history(market_data.DAILY_PERIOD, "1d"), apply_daily)
+            return
+
+        self.start_refresh_job(
+            lambda: session.refresh_history(period, interval),
+            lambda hist: self.apply_chart_refresh(session.ticker, selected_period, interval, hist))
+        self.start_refresh_job(
+            lambda: session.refresh_history(market_data.DAILY_PERIOD, "1d"),
+            lambda hist: self.apply_technical_refresh(session.ticker, hist))
+
+    def is_current_ticker(self, ticker):
+        return self.session is not None and self.session.ticker == ticker
+
+    def apply_chart_refresh(self, ticker, selected_period, interval, hist):
+        if not self.is_current_ticker(ticker) or self.period_combo.currentText() != selected_period:
+            return
+
+        # 마지막으로 그린 데이터와 같으면 다시 그리지 않는다
+        if self.chart_data is not None and self.chart_data[:3] == (ticker, selected_period, interval):
+            drawn = self.chart_data[3]
+            if drawn.index.equals(hist.index) and drawn['Close'].equals(hist['Close']) \
+                    and drawn['Volume'].equals(hist['Volume']):
+                return
+        self.results.put((ticker, "chart", selected_period), hist)
+        self.draw_chart(ticker, selected_period, interval, hist)
+
+    def apply_technical_refresh(self, ticker, hist):
+        if not self.is_current_ticker(ticker):
+            return
+
+        close = hist['Close'].dropna()
+        if close.empty:
+            return
+
+        if self.live_state is None or self.live_ticker != ticker or self.live_last_ts not in close.index:
+            self.live_state = indicators.IndicatorState.from_history(close.to_numpy())
+        else:
+            # 진행 중이던 마지막 봉은 값만 바꾸고, 새로 생긴 봉만 이어서 반영 (봉 하나당 O(1))
+            pos = close.index.get_loc(self.live_last_ts)
+            self.live_state.replace_last(close.iloc[pos])
+            for value in close.iloc[pos + 1:]:
+                self.live_state.update(value)
+        self.live_ticker = ticker
+        self.live_last_ts = close.index[-1]
+        self.check_alerts(ticker, self.live_state.values())
+
+        text = core.technical_text(self.live_state.values())
+        if text != self.live_text:
+            self.live_text = text
+            self.results.put((ticker, "technical"), text)
+            self.technical_text.setText(text)
+
+    def refresh_watchlist(self):
+        category_col = [key for key, _ in WATCHLIST_COLUMNS].index("category")
+        tickers = []
+        for r in range(self.watchlist_table.rowCount()):
+            item = self.watchlist_table.item(r, 0)
+            category = self.watchlist_table.item(r, category_col)
+            if category is not None and category.text().startswith((INVALID_TICKER, NO_DATA)):
+                continue
+            if item is not None:
+                tickers.append(item.text())
+
+        for chunk in watchlist.chunked(tickers, watchlist.DOWNLOAD_CHUNK):
+            self.start_refresh_job(
+                lambda chunk=chunk: watchlist.download_chunk(chunk),
+                lambda result: self.apply_watchlist_refresh(result[1]))
+
+    def apply_watchlist_refresh(self, technicals):
+        table = self.watchlist_table
+        keys = [key for key, _ in WATCHLIST_COLUMNS]
+        table.setSortingEnabled(False)
+        for r in range(table.rowCount()):
+            ticker_item = table.item(r, 0)
+            values = technicals.get(ticker_item.text()) if ticker_item is not None else None
+            if values is None:
+                continue
+
+            row = watchlist.technical_row(ticker_item.text(), values)
+            suitable_item = table.item(r, keys.index("suitable_price"))
+            suitable_price = suitable_item.data(Qt.DisplayRole) if suitable_item is not None else None
+            if isinstance(suitable_price, float):
+                row.update(watchlist.valuation_columns(values["price"], suitable_price))
             else:
-                if price_diff_ratio > 30:
-                    valuation_text += "매우 저평가 되어 있습니다. 단, 해당 기업의 재무상태와 시장 상황을 추가로 검토하세요."
-                else:
-                    valuation_text += "다소 저평가 되어 있습니다."
-
-            if industry_per:
-                try:
-                    industry_per = float(industry_per)
-                    per_ratio = per / industry_per
-                    valuation_text += f"\n\n업종 평균 PER과의 비교:"
-                    if per_ratio > 1.5:
-                        valuation_text += f"\n현재 PER이 업종 평균 대비 {per_ratio:.1f}배로 매우 고평가 상태입니다."
-                    elif per_ratio > 1.2:
-                        valuation_text += f"\n현재 PER이 업종 평균 대비 {per_ratio:.1f}배로 다소 고평가 상태입니다."
-                    elif per_ratio > 0.8:
-                        valuation_text += f"\n현재 PER이 업종 평균 대비 적정 수준입니다. (업종 평균의 {per_ratio:.1f}배)"
-                    else:
-                        valuation_text += f"\n현재 PER이 업종 평균 대비 {per_ratio:.1f}배로 저평가 상태입니다."
-                except:
-                    pass
-
-            return valuation_text
+                suitable_price = None
+            self.check_alerts(ticker_item.text(), values, suitable_price)
+            for key, value in row.items():
+                self.set_watchlist_cell(r, keys.index(key), value)
+        table.setSortingEnabled(True)
+
+    def add_alert_rules(self):
+        try:
+            rules = alerts.parse_rules(self.alert_input.text())
+        except ValueError as e:
+            self.show_error_message("알림 규칙 오류", str(e))
+            return
+        if not rules:
+            return
+        for rule in rules:
+            self.alerts.add_rule(*rule)
+        self.alert_input.clear()
+        self.save_alert_rules()
+
+    def clear_alert_rules(self):
+        self.alerts.clear()
+        self.save_alert_rules()
+
+    def save_alert_rules(self):
+        try:
+            self.alerts.save()
+        except OSError as e:
+            self.statusBar().showMessage(f"알림 규칙 저장 실패: {e}")
+        self.update_alert_status()
+
+    def update_alert_status(self):
+        tickers = self.alerts.tickers()
+        text = f"알림 규칙 {len(self.alerts)}개"
+        if tickers:
+            # 규칙이 걸린 티커는 워치리스트에 넣어 두어야 자동 갱신 때 검사된다
+            text += f" ({', '.join(tickers[:20])}{' ...' if len(tickers) > 20 else ''})"
+        self.alert_status.setText(text)
+
+    def check_alerts(self, ticker, values, suitable_price=None):
+        """새로 받은 지표 값을 알림 엔진에 넣고 기준값을 지난 규칙을 알린다"""
+        fired = self.alerts.update(ticker, alerts.alert_values(values, suitable_price))
+        if not fired:
+            return
+        messages = []
+        for alert in fired:
+            rule = alert.rule
+            direction = "상향 돌파" if rule.op == ">" else "하향 이탈"
+            message = (f"{rule.ticker} {alerts.FIELDS[rule.field]} {alert.value:.2f} - "
+                       f"기준 {rule.threshold:g} {direction} (이전 {alert.previous:.2f})")
+            messages.append(message)
+            self.alert_log.appendPlainText(
+                f"[{datetime.fromtimestamp(alert.at).strftime('%H:%M:%S')}] {message}")
+
+        # 한 번에 여러 규칙이 울리면 알림은 하나로 묶는다
+        summary = messages[0] if len(messages) == 1 else f"{messages[0]} 외 {len(messages) - 1}건"
+        if self.tray_icon is not None:
+            self.tray_icon.showMessage("Stockist 알림", summary, QSystemTrayIcon.Information, 5000)
+        else:
+            self.statusBar().showMessage(f"알림: {summary}")
+
+    def on_refresh_finished(self, rate_limited):
+        if rate_limited:
+            self.statusBar().showMessage(
+                f"요청 제한으로 갱신 주기를 {self.refresher.current_interval}초로 늘렸습니다.")
+        else:
+            self.statusBar().showMessage(f"마지막 갱신: {datetime.now().strftime('%H:%M:%S')}")
 
     def update_valuation(self):
         ticker = self.ticker_input.text().upper()
         if not ticker:
             return
-        
-        industry_per = self.industry_per_input.text()
-        if industry_per:
-            try:
-                industry_per = float(industry_per)
-            except:
-                industry_per = None
-        
-        valuation_text = self.calculate_valuation(ticker, industry_per)
-        self.valuation_text.setText(valuation_text)
+
+        # 같은 티커의 입력값을 이미 받았다면 네트워크 없이 바로 다시 계산
+        if self.valuation_inputs is not None and self.valuation_inputs["ticker"] == ticker:
+            self.render_valuation()
+            return
+
+        session = self.get_session(ticker)
+        self.tasks.cancel("valuation")
+        self.submit_cached(
+            "valuation", (ticker, "valuation"),
+            lambda: core.valuation_inputs(session),
+            self.traced("render valuation", self.set_valuation_inputs),
+            self.show_analysis_error)
+
+    def set_valuation_inputs(self, inputs):
+        self.valuation_inputs = inputs
+        if inputs is None:
+            self.valuation_text.setText("데이터를 가져올 수 없습니다.")
+        else:
+            self.render_valuation()
+
+    def industry_per_value(self):
+        try:
+            return float(self.industry_per_input.text())
+        except ValueError:
+            return None
+
+    def on_industry_per_slider(self, value):
+        # 0 은 업종 PER 비교를 하지 않음
+        self.industry_per_input.setText(str(value) if value else "")
+        self.render_valuation()
+
+    def on_growth_cap_slider(self, value):
+        self.growth_cap_label.setText(f"성장률 상한: ±{value}%")
+        self.render_valuation()
+
+    def render_valuation(self):
+        if self.valuation_inputs is None:
+            return
+        inputs = {key: value for key, value in self.valuation_inputs.items() if key != "ticker"}
+        self.valuation_text.setText(analysis.valuation_report(
+            **inputs,
+            industry_per=self.industry_per_value(),
+            growth_cap=self.growth_cap_slider.value()))
+
+    def refresh_debug_panel(self):
+        rows = tracing.tracer.summary()
+        table = self.trace_table
+        table.setRowCount(len(rows))
+        for r, (category, name, count, total, longest, last) in enumerate(rows):
+            values = [name, category, count, total, total / count, longest, last]
+            for col, value in enumerate(values):
+                item = table.item(r, col)
+                if item is None:
+                    item = QTableWidgetItem()
+                    table.setItem(r, col, item)
+                if isinstance(value, float):
+                    item.setText(f"{value:,.1f}")
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                else:
+                    item.setText(str(value))
+
+        counters = sorted(tracing.tracer.counters.items())
+        text = "  ".join(f"{name}: {value}" for name, value in counters) or "캐시 기록 없음"
+        self.counter_label.setText(
+            f"{text}\n분석 결과 캐시: {len(self.results)}개, "
+            f"{self.results.nbytes / 1024 / 1024:.1f} / {self.results.max_bytes / 1024 / 1024:.0f} MB")
+
+    def reset_trace(self):
+        tracing.tracer.reset()
+        self.refresh_debug_panel()
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Chrome trace 내보내기", f"stockist-trace-{datetime.now():%Y%m%d-%H%M%S}.json",
+            "JSON (*.json)")
+        if not path:
+            return
+        try:
+            tracing.tracer.export_chrome_trace(path)
+            self.statusBar().showMessage(f"trace 저장: {path} (chrome://tracing 또는 Perfetto 에서 열기)")
+        except OSError as e:
+            self.show_error_message("저장 오류", str(e))
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
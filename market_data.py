@@ -0,0 +1,188 @@
+import threading
+
+import pandas as pd
+import yfinance as yf
+
+import resample
+import snapshots
+import tracing
+import yahoo
+
+from ohlcv_cache import OHLCVCache, PERIOD_OFFSETS, slice_period
+
+# 기술적 분석/워치리스트가 쓰는 일봉 구간
+DAILY_PERIOD = "1y"
+
+# 봉 간격별로 받아 두는 기본 시세의 기간 (짧은 것부터). 차트의 각 기간은 여기서 잘라내거나 더 굵은 봉으로 묶는다
+# (Yahoo 는 15분봉을 최근 60일까지만 주므로 간격마다 따로 둔다)
+# 일봉은 기술적 분석에 쓰는 1년치만 먼저 받고, 더 긴 기간을 볼 때만 5년으로 넓힌다
+BASE_PERIODS = {
+    "15m": ("60d",),
+    "1h": ("3mo",),
+    "1d": (DAILY_PERIOD, "5y"),
+}
+
+
+def covers(source_period, period):
+    """source_period 로 받은 시세에 period 구간이 모두 들어가는지"""
+    if source_period == period:
+        return True
+    if source_period not in PERIOD_OFFSETS or period not in PERIOD_OFFSETS:
+        return False
+    now = pd.Timestamp.now()
+    return now - PERIOD_OFFSETS[source_period] <= now - PERIOD_OFFSETS[period]
+
+
+def period_length(period):
+    # 기간을 계산할 수 없으면 (max 등) 0
+    if period not in PERIOD_OFFSETS:
+        return pd.Timedelta(0)
+    now = pd.Timestamp.now()
+    return now - (now - PERIOD_OFFSETS[period])
+
+
+def can_serve(source, period, interval):
+    """(기간, 봉 간격) 시세 source 로 period/interval 시세를 만들 수 있는지"""
+    source_period, source_interval = source
+    return covers(source_period, period) and resample.can_resample(source_interval, interval)
+
+
+def base_for(period, interval):
+    """period/interval 을 만들 수 있는 기본 시세 중 가장 굵은 것 (기간, 봉 간격), 없으면 None
+
+    같은 봉 간격에서는 period 를 덮는 가장 짧은 기간을 고른다.
+    """
+    candidates = []
+    for base_interval, base_periods in BASE_PERIODS.items():
+        for base_period in base_periods:
+            if can_serve((base_period, base_interval), period, interval):
+                candidates.append((base_period, base_interval))
+                break
+    if not candidates:
+        return None
+    return max(candidates, key=lambda source: resample.INTERVAL_SECONDS[source[1]])
+
+
+# 모든 세션이 함께 쓰는 디스크 시세 캐시
+default_cache = OHLCVCache()
+
+
+class YahooTicker:
+    """yf.Ticker 의 요청(history/info/재무제표)을 Yahoo 요청 통로로 보내는 래퍼"""
+
+    def __init__(self, ticker, client=None):
+        self.ticker = ticker
+        self.client = client if client is not None else yahoo.client
+        self.stock = yf.Ticker(ticker, session=self.client.yf_session)
+
+    def history(self, **kwargs):
+        key = ("history", self.ticker) + tuple(sorted((name, str(value)) for name, value in kwargs.items()))
+        return self.client.call(key, lambda: self.stock.history(**kwargs))
+
+    def __getattr__(self, name):
+        # info, financials, quarterly_cashflow 등 속성 접근도 하나의 요청으로 취급
+        return self.client.call((name, self.ticker), lambda: getattr(self.stock, name))
+
+
+class TickerSession:
+    """한 티커에 대한 시세/기업정보/재무제표를 한 번씩만 받아 공유하는 세션"""
+
+    def __init__(self, ticker, cache=None, store=None):
+        self.ticker = ticker.upper()
+        self.stock = YahooTicker(self.ticker)
+        self.cache = cache if cache is not None else default_cache
+        self.store = store if store is not None else snapshots.default_store
+        self._values = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _fetch_once(self, key, loader):
+        # 여러 작업 스레드가 동시에 같은 데이터를 요청해도 실제 요청은 한 번만 보낸다
+        with self._locks_guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._values:
+                tracing.count("session.miss")
+                label = key if isinstance(key, str) else "history " + "/".join(key)
+                with tracing.span(f"fetch {label}", "fetch", ticker=self.ticker):
+                    self._values[key] = loader()
+            else:
+                tracing.count("session.hit")
+            return self._values[key]
+
+    @property
+    def info(self):
+        return self._fetch_once("info", self._load_info)
+
+    def _load_info(self):
+        info = self.stock.info
+        self.store.record_info(self.ticker, info)
+        return info
+
+    @property
+    def financials(self):
+        return self.statement("financials")
+
+    def statement(self, name):
+        """재무제표 (financials / quarterly_financials / balance_sheet / cashflow 등 Ticker 속성 이름)"""
+        return self._fetch_once(name, lambda: self._load_statement(name))
+
+    def _load_statement(self, name):
+        # 하루 안에 받아 둔 스냅샷이 있으면 네트워크 없이 사용
+        frame = self.store.latest_statement(self.ticker, name)
+        if frame is not None:
+            tracing.count("snapshot.hit")
+            return frame
+        tracing.count("snapshot.miss")
+        frame = getattr(self.stock, name)
+        self.store.record_statement(self.ticker, name, frame)
+        return frame
+
+    def daily_history(self):
+        return self.history(DAILY_PERIOD, "1d")
+
+    def source_for(self, period, interval):
+        """period/interval 시세를 만들 원본 (기간, 봉 간격): 이미 받아 둔 시세 중 가장 굵은 것, 없으면 기본 시세"""
+        with self._locks_guard:
+            loaded = [key for key in self._values
+                      if isinstance(key, tuple) and can_serve(key, period, interval)]
+        if loaded:
+            # 가장 굵은 봉, 같은 봉이면 가장 긴 기간 (5년 일봉을 받은 뒤에는 1년 일봉 요청도 5년 일봉에서 만든다)
+            return max(loaded, key=lambda source: (resample.INTERVAL_SECONDS.get(source[1], 0),
+                                                   period_length(source[0])))
+        return base_for(period, interval) or (period, interval)
+
+    def _derive(self, hist, source, period, interval):
+        if source != (period, interval):
+            hist = resample.resample_ohlcv(slice_period(hist, period), source[1], interval)
+        return hist
+
+    def history(self, period=DAILY_PERIOD, interval="1d"):
+        # 한 번 받은 시세에서 기간을 잘라내고 더 굵은 봉으로 묶어서 제공 (기간 전환은 네트워크 없이)
+        source = self.source_for(period, interval)
+        hist = self._fetch_once(source, lambda: self.cache.history(self.stock, *source))
+        return self._derive(hist, source, period, interval)
+
+    def refresh_history(self, period=DAILY_PERIOD, interval="1d", max_age=0):
+        """자동 갱신용: 디스크 캐시에서 마지막 봉 이후만 다시 받아 세션 값을 교체"""
+        source = self.source_for(period, interval)
+        fetch_period, fetch_interval = source
+
+        with tracing.span(f"refresh history {fetch_period}/{fetch_interval}", "fetch", ticker=self.ticker):
+            hist = self.cache.history(self.stock, fetch_period, fetch_interval, max_age=max_age)
+        failure = self.cache.last_failure(self.ticker, fetch_interval)
+        if failure:
+            # 캐시로 대체된 경우에도 갱신 실패(요청 제한 등)를 호출한 쪽에 알린다
+            raise ConnectionError(failure)
+
+        with self._locks_guard:
+            self._values[source] = hist
+        return self._derive(hist, source, period, interval)
+
+    def seed_daily_history(self, hist):
+        # 일괄 다운로드(yf.download)로 이미 받은 일봉을 세션에 넣어 재요청을 막는다
+        with self._locks_guard:
+            self._values[(DAILY_PERIOD, "1d")] = hist
+
+    def current_price(self):
+        return self.daily_history()['Close'].iloc[-1]
@@ -0,0 +1,178 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import tracing
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".stockist", "ohlcv")
+
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+# 한 봉 = UTC 나노초 타임스탬프 + OHLCV (고정 길이 레코드라 파일 끝에 그대로 이어 붙일 수 있다)
+RECORD_DTYPE = np.dtype([("ts", "<i8")] + [(col, "<f8") for col in COLUMNS])
+
+# 마지막으로 받아온 뒤 이 시간(초) 안에는 네트워크 없이 캐시만 사용
+FRESH_SECONDS = {
+    "15m": 60,
+    "1h": 300,
+    "1d": 900,
+    "1wk": 3600,
+}
+
+# yfinance period 문자열 -> 마지막 봉 기준으로 거슬러 올라갈 기간
+PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=5),
+    "60d": pd.DateOffset(days=60),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+}
+
+
+def slice_period(hist, period):
+    """마지막 봉 기준으로 period 만큼의 구간만 잘라서 반환"""
+    if hist.empty or period not in PERIOD_OFFSETS:
+        return hist
+    if period == "1d":
+        return hist.iloc[-1:]
+    start = hist.index[-1] - PERIOD_OFFSETS[period]
+    return hist[hist.index > start]
+
+
+class OHLCVCache:
+    """(티커, 봉 간격)별 OHLCV를 디스크에 저장하고 마지막 봉 이후만 받아 이어 붙이는 캐시"""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        # (티커, 봉 간격) -> 마지막 갱신 실패 메시지 (캐시로 대체한 경우)
+        self.failures = {}
+
+    def _lock(self, key):
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _paths(self, ticker, interval):
+        name = f"{ticker.upper()}_{interval}"
+        return (os.path.join(self.cache_dir, name + ".bin"),
+                os.path.join(self.cache_dir, name + ".json"))
+
+    def _read_meta(self, meta_path):
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta_path, meta):
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def load(self, ticker, interval):
+        data_path, meta_path = self._paths(ticker, interval)
+        meta = self._read_meta(meta_path)
+        if meta is None or not os.path.exists(data_path):
+            return None, None
+
+        rows = os.path.getsize(data_path) // RECORD_DTYPE.itemsize
+        if rows == 0:
+            return None, None
+        records = np.memmap(data_path, dtype=RECORD_DTYPE, mode="r", shape=(rows,))
+        index = pd.to_datetime(records["ts"], utc=True).tz_convert(meta["tz"])
+        frame = pd.DataFrame({col: records[col] for col in COLUMNS}, index=index)
+        frame.index.name = "Date"
+        return frame, meta
+
+    def _to_records(self, frame):
+        records = np.empty(len(frame), dtype=RECORD_DTYPE)
+        records["ts"] = frame.index.tz_convert("UTC").as_unit("ns").asi8
+        for col in COLUMNS:
+            records[col] = frame[col].to_numpy(dtype="f8")
+        return records
+
+    def _write(self, ticker, interval, frame, meta, cached=None):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data_path, meta_path = self._paths(ticker, interval)
+        records = self._to_records(frame)
+
+        if cached is None or cached.empty:
+            with open(data_path, "wb") as f:
+                records.tofile(f)
+        else:
+            # 새로 받은 첫 봉부터 덮어쓰고 (진행 중이던 마지막 봉 갱신) 나머지는 뒤에 이어 붙임
+            first_ts = records["ts"][0]
+            offset = int(np.searchsorted(cached.index.tz_convert("UTC").as_unit("ns").asi8, first_ts))
+            with open(data_path, "r+b") as f:
+                f.seek(offset * RECORD_DTYPE.itemsize)
+                records.tofile(f)
+                f.truncate()
+
+        meta["tz"] = str(frame.index.tz)
+        meta["fetched_at"] = time.time()
+        self._write_meta(meta_path, meta)
+
+    def last_failure(self, ticker, interval):
+        return self.failures.get((ticker.upper(), interval))
+
+    def history(self, stock, period, interval, max_age=None):
+        # 기간을 계산할 수 없는 요청(max 등)은 캐시하지 않는다
+        if period not in PERIOD_OFFSETS:
+            tracing.count("ohlcv.uncached")
+            with tracing.span("yahoo history", "network", period=period, interval=interval):
+                return stock.history(period=period, interval=interval)
+
+        ticker = stock.ticker
+        with self._lock((ticker, interval)):
+            cached, meta = self.load(ticker, interval)
+            wanted_from = (pd.Timestamp.now(tz="UTC") - PERIOD_OFFSETS[period]).timestamp()
+
+            try:
+                if cached is None or meta.get("covered_from", float("inf")) > wanted_from:
+                    # 캐시가 없거나 요청 구간보다 짧으면 해당 기간 전체를 받는다
+                    tracing.count("ohlcv.miss")
+                    with tracing.span("yahoo history", "network", period=period, interval=interval):
+                        fresh = stock.history(period=period, interval=interval)
+                    if fresh.empty:
+                        raise ValueError("데이터를 가져올 수 없습니다.")
+                    fresh = fresh[list(COLUMNS)]
+                    if cached is not None:
+                        fresh = pd.concat([cached[cached.index < fresh.index[0]], fresh])
+                    meta = {"covered_from": min(wanted_from, (meta or {}).get("covered_from", wanted_from))}
+                    self._write(ticker, interval, fresh, meta)
+                    cached = fresh
+                elif time.time() - meta.get("fetched_at", 0) > (max_age if max_age is not None else FRESH_SECONDS.get(interval, 900)):
+                    # 마지막 캐시 봉 이후만 받아서 이어 붙임
+                    tracing.count("ohlcv.append")
+                    with tracing.span("yahoo history (append)", "network", interval=interval):
+                        new_bars = stock.history(start=cached.index[-1], interval=interval)
+                    if not new_bars.empty:
+                        new_bars = new_bars[list(COLUMNS)]
+                        new_bars = new_bars[new_bars.index >= cached.index[-1]]
+                    if not new_bars.empty:
+                        self._write(ticker, interval, new_bars, meta, cached)
+                        cached = pd.concat([cached[cached.index < new_bars.index[0]], new_bars])
+                    else:
+                        meta["fetched_at"] = time.time()
+                        self._write_meta(self._paths(ticker, interval)[1], meta)
+                else:
+                    tracing.count("ohlcv.hit")
+                self.failures.pop((ticker, interval), None)
+            except Exception as e:
+                # 요청 제한 등으로 받아오지 못하면 캐시된 데이터로 대체
+                if cached is None:
+                    raise
+                self.failures[(ticker, interval)] = str(e)
+                tracing.count("ohlcv.fallback")
+                print(f"시세 갱신 실패, 캐시 데이터 사용: {e}")
+
+            return slice_period(cached, period)
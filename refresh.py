@@ -0,0 +1,80 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from yahoo import is_rate_limited
+
+# 요청 제한 시 늘려가는 갱신 주기의 상한 (초)
+MAX_INTERVAL = 900
+
+
+class RefreshScheduler(QObject):
+    """QTimer 기반 자동 갱신. 이전 갱신이 끝나기 전의 요청은 하나로 합치고, 요청 제한 시 주기를 늘린다"""
+
+    refresh_requested = pyqtSignal()
+    interval_changed = pyqtSignal(int)
+    # 한 번의 갱신이 모두 끝났을 때 (요청 제한 여부)
+    round_finished = pyqtSignal(bool)
+
+    def __init__(self, parent=None, interval=60, max_interval=MAX_INTERVAL):
+        super().__init__(parent)
+        self.base_interval = interval
+        self.current_interval = interval
+        self.max_interval = max_interval
+        self.in_flight = 0
+        self.pending = False
+        self.rate_limited = False
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.trigger)
+
+    def start(self, interval=None):
+        if interval is not None:
+            self.base_interval = interval
+        self.current_interval = self.base_interval
+        self.timer.start(self.current_interval * 1000)
+        self.interval_changed.emit(self.current_interval)
+
+    def stop(self):
+        # 진행 중이던 작업의 결과는 TaskRunner 에서 버려지므로 카운터도 초기화
+        self.timer.stop()
+        self.pending = False
+        self.in_flight = 0
+        self.rate_limited = False
+
+    def is_active(self):
+        return self.timer.isActive()
+
+    def trigger(self):
+        # 진행 중인 갱신이 있으면 새로 보내지 않고 끝난 뒤 한 번만 다시 실행
+        if self.in_flight:
+            self.pending = True
+            return
+        self.refresh_requested.emit()
+
+    def job_started(self):
+        self.in_flight += 1
+
+    def job_finished(self, error=None):
+        self.in_flight = max(self.in_flight - 1, 0)
+        if error and is_rate_limited(error):
+            self.rate_limited = True
+        if self.in_flight == 0:
+            self._round_finished()
+
+    def _round_finished(self):
+        rate_limited = self.rate_limited
+        if rate_limited:
+            # 요청 제한에 걸리면 주기를 두 배씩 늘리고, 밀린 요청도 버린다
+            self.current_interval = min(self.current_interval * 2, self.max_interval)
+            self.pending = False
+        else:
+            self.current_interval = self.base_interval
+        self.rate_limited = False
+        self.round_finished.emit(rate_limited)
+
+        if self.timer.isActive():
+            if self.timer.interval() != self.current_interval * 1000:
+                self.timer.setInterval(self.current_interval * 1000)
+                self.interval_changed.emit(self.current_interval)
+            if self.pending:
+                self.pending = False
+                self.trigger()
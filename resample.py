@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+# yfinance 봉 간격 -> 길이 (초). 일봉 이상은 달력 기준으로 묶는다
+INTERVAL_SECONDS = {
+    "1m": 60,
+    "2m": 120,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "60m": 3600,
+    "90m": 5400,
+    "1h": 3600,
+    "1d": 86400,
+    "1wk": 7 * 86400,
+    "1mo": 31 * 86400,
+}
+CALENDAR_INTERVALS = ("1d", "1wk", "1mo")
+
+DAY_NS = 86400 * 10 ** 9
+# 1970-01-01 은 목요일 (월요일 = 0 기준으로 3)
+EPOCH_WEEKDAY = 3
+
+
+def is_intraday(interval):
+    return interval not in CALENDAR_INTERVALS
+
+
+def can_resample(source, target):
+    """source 봉을 묶어서 target 봉을 만들 수 있는지"""
+    if source == target:
+        return True
+    if source not in INTERVAL_SECONDS or target not in INTERVAL_SECONDS:
+        return False
+    if is_intraday(target):
+        return is_intraday(source) and INTERVAL_SECONDS[target] % INTERVAL_SECONDS[source] == 0
+    # 주봉은 월 경계를 넘으므로 월봉으로 묶을 수 없다
+    return is_intraday(source) or source == "1d"
+
+
+def _local_ns(index):
+    # 거래소 현지 시각 기준으로 날짜/장 시작을 나눈다
+    local = index.tz_localize(None) if index.tz is not None else index
+    return local.as_unit("ns").asi8
+
+
+def _run_starts(keys):
+    return np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+
+def bucket_keys(index, target):
+    """각 봉이 속할 target 봉의 시작 시각 (현지 시각 ns)"""
+    local = _local_ns(index)
+    day = local // DAY_NS * DAY_NS
+    if target == "1d":
+        return day
+    if target == "1wk":
+        days = day // DAY_NS
+        return (days - (days + EPOCH_WEEKDAY) % 7) * DAY_NS
+    if target == "1mo":
+        return local.astype("datetime64[ns]").astype("datetime64[M]").astype("datetime64[ns]").astype(np.int64)
+
+    # 분/시간봉은 날마다 첫 봉(장 시작)을 기준으로 자른다. 1시간봉이 9:30, 10:30, ... 으로 시작하는 것과 같다
+    starts = _run_starts(day)
+    session_open = np.repeat(local[starts], np.diff(np.r_[starts, len(local)]))
+    step = INTERVAL_SECONDS[target] * 10 ** 9
+    return session_open + (local - session_open) // step * step
+
+
+def resample_ohlcv(hist, source, target):
+    """source 간격의 OHLCV 를 target 간격으로 묶는다 (시가=첫 값, 고가=최대, 저가=최소, 종가=마지막 값, 거래량=합)"""
+    if source == target or hist.empty:
+        return hist
+    if not can_resample(source, target):
+        raise ValueError(f"{source} 봉으로 {target} 봉을 만들 수 없습니다.")
+
+    hist = hist.dropna(subset=["Close"])
+    if hist.empty:
+        return hist
+    keys = bucket_keys(hist.index, target)
+    starts = _run_starts(keys)
+    ends = np.r_[starts[1:], len(keys)] - 1
+
+    columns = {}
+    if "Open" in hist:
+        columns["Open"] = hist["Open"].to_numpy()[starts]
+    if "High" in hist:
+        columns["High"] = np.fmax.reduceat(hist["High"].to_numpy(dtype="f8"), starts)
+    if "Low" in hist:
+        columns["Low"] = np.fmin.reduceat(hist["Low"].to_numpy(dtype="f8"), starts)
+    columns["Close"] = hist["Close"].to_numpy()[ends]
+    if "Volume" in hist:
+        columns["Volume"] = np.add.reduceat(np.nan_to_num(hist["Volume"].to_numpy(dtype="f8")), starts)
+
+    if is_intraday(target):
+        # 분/시간봉은 구간의 첫 봉 시각을 그대로 쓴다 (빠진 봉이 없으면 구간 시작과 같다)
+        index = hist.index[starts]
+    else:
+        index = pd.DatetimeIndex(keys[starts].astype("datetime64[ns]"))
+        if hist.index.tz is not None:
+            index = index.tz_localize(hist.index.tz, ambiguous=np.zeros(len(index), dtype=bool),
+                                      nonexistent="shift_forward")
+    index.name = hist.index.name
+    return pd.DataFrame(columns, index=index)
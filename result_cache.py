@@ -0,0 +1,84 @@
+import collections
+import sys
+import threading
+import time
+
+import tracing
+
+# 분석 결과 캐시의 메모리 상한 (바이트)
+RESULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# 분석 결과를 다시 받지 않고 그대로 쓰는 시간 (초)
+RESULT_TTL = 300
+
+
+def estimate_size(value):
+    """캐시 항목이 차지하는 대략적인 메모리 (DataFrame/ndarray 는 데이터 크기, 나머지는 sys.getsizeof)"""
+    if hasattr(value, "memory_usage"):
+        usage = value.memory_usage(index=True, deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def is_empty(value):
+    return value is None or bool(getattr(value, "empty", False))
+
+
+class ResultCache:
+    """키별 분석 결과를 TTL 동안 보관하고, 메모리 상한을 넘으면 가장 오래 안 쓴 것부터 버리는 LRU 캐시"""
+
+    def __init__(self, max_bytes=RESULT_CACHE_MAX_BYTES, ttl=RESULT_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.nbytes = 0
+        # 키 -> (저장 시각, 크기, 값). 뒤쪽일수록 최근에 쓴 항목
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """신선한 값이 있으면 반환하고 최근 사용으로 표시, 없거나 TTL 이 지났으면 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] >= self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                tracing.count("results.miss")
+                return None
+            self._entries.move_to_end(key)
+        tracing.count("results.hit")
+        return entry[2]
+
+    def put(self, key, value):
+        # 빈 결과(받기 실패)는 캐시하지 않는다
+        if is_empty(value):
+            return
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (time.monotonic(), size, value)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                tracing.count("results.evict")
+
+    def invalidate(self, ticker=None):
+        """키의 첫 요소가 ticker 인 항목 (None 이면 전부) 삭제"""
+        with self._lock:
+            for key in [key for key in self._entries if ticker is None or key[0] == ticker]:
+                self._remove(key)
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.nbytes -= size
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+import indicators
+from analysis import GROWTH_CAP, PER_CAP, QUARTER_DAYS
+
+# 분기별 성장률을 계산하는 분기 수 (1년)
+QUARTERS = 4
+
+# 판단 코드 -> analysis.valuation_category 와 같은 문자열
+CATEGORIES = np.array(["적정", "매우 고평가", "다소 고평가", "매우 저평가", "다소 저평가"])
+
+
+def quarterly_growth_matrix(closes):
+    """(종목 x 시간) 종가 배열의 분기별 성장률(%) (종목 x 4). 데이터가 모자란 분기는 NaN
+
+    analysis.quarterly_growth_rates 와 같이 종목별 첫 봉부터 63일씩 자른다.
+    """
+    n, length = closes.shape
+    valid = ~np.isnan(closes)
+    first = np.where(valid.any(axis=1), valid.argmax(axis=1), length)
+    available = length - first
+
+    offsets = np.arange(QUARTERS) * QUARTER_DAYS
+    starts = first[:, None] + offsets
+    ends = starts + QUARTER_DAYS - 1
+    has_quarter = available[:, None] >= offsets + QUARTER_DAYS
+
+    start_prices = np.take_along_axis(closes, np.minimum(starts, length - 1), axis=1)
+    end_prices = np.take_along_axis(closes, np.minimum(ends, length - 1), axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rates = (end_prices - start_prices) / start_prices * 100
+    return np.where(has_quarter, rates, np.nan)
+
+
+def average_growth_rates(closes):
+    """analysis.average_growth_rate 의 벡터 버전. 1분기도 안 되는 종목은 보유 구간 전체 성장률로 대체"""
+    rates = quarterly_growth_matrix(closes)
+    counts = (~np.isnan(rates)).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        averages = np.nansum(rates, axis=1) / counts
+
+        # 분기 데이터가 없으면 길이가 3개월 미만이므로 전체 구간 = 최근 3개월
+        first_prices = np.take_along_axis(
+            closes, (~np.isnan(closes)).argmax(axis=1)[:, None], axis=1)[:, 0]
+        period_rates = (closes[:, -1] - first_prices) / first_prices * 100
+    return np.where(counts > 0, averages, period_rates)
+
+
+def fair_prices(eps, per, growth_rates):
+    """analysis.fair_price 의 벡터 버전. (조정된 PER, PEG, 적정주가) 반환 (성장률이 0 이하면 PEG 는 NaN)"""
+    adjusted_per = np.minimum(per, PER_CAP)
+    growing = growth_rates > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        peg = np.where(growing, adjusted_per / growth_rates, np.nan)
+
+    suitable = np.where(
+        growing & (peg > 2),
+        eps * (adjusted_per * 0.8),  # PEG 비율이 2 이상이면 20% 할인
+        np.where(growing, eps * (adjusted_per + growth_rates * 0.5), eps * adjusted_per))
+    return adjusted_per, peg, suitable
+
+
+def valuation_categories(prices, suitable_prices):
+    """analysis.valuation_category 의 벡터 버전 (적정주가가 NaN 이거나 0 이하면 None)"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        diff_ratio = np.where(suitable_prices > 0, np.abs(prices - suitable_prices) / suitable_prices * 100, np.nan)
+    over = prices > suitable_prices
+    codes = np.select(
+        [diff_ratio <= 10, over & (diff_ratio > 30), over, diff_ratio > 30],
+        [0, 1, 2, 3],
+        default=4)
+    # 적정주가가 없는 종목은 판단하지 않는다
+    return np.where(np.isnan(diff_ratio), None, CATEGORIES[codes])
+
+
+def screen(tickers, closes, eps, per, growth_cap=GROWTH_CAP):
+    """종목 전체의 성장률/PEG/적정주가/괴리율/판단을 배열 연산으로 한 번에 계산
+
+    closes 는 (종목 x 일) 종가 배열 또는 종가 배열 목록 (길이가 다르면 마지막 봉 기준으로 맞춘다).
+    괴리율(%)이 낮은(저평가) 순서로 정렬한 DataFrame 을 반환한다.
+    """
+    if not isinstance(closes, np.ndarray) or closes.ndim != 2:
+        closes = indicators.stack_closes(closes)
+    eps = np.asarray(eps, dtype=float)
+    per = np.asarray(per, dtype=float)
+
+    prices = closes[:, -1]
+    growth = np.clip(average_growth_rates(closes), -growth_cap, growth_cap)
+    adjusted_per, peg, suitable = fair_prices(eps, per, growth)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        discount = np.where(suitable > 0, (prices - suitable) / suitable * 100, np.nan)
+
+    result = pd.DataFrame({
+        "price": prices,
+        "eps": eps,
+        "per": per,
+        "growth_rate": growth,
+        "adjusted_per": adjusted_per,
+        "peg": peg,
+        "suitable_price": suitable,
+        "discount": discount,
+        "category": valuation_categories(prices, suitable),
+    }, index=pd.Index(tickers, name="ticker"))
+    # 적정주가가 없거나 0 이하(적자)인 종목은 괴리율이 NaN 이므로 맨 뒤로
+    return result.iloc[np.argsort(discount, kind="stable")]
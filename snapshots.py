@@ -0,0 +1,238 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+
+import tracing
+
+STORE_PATH = os.path.join(os.path.expanduser("~"), ".stockist", "fundamentals.sqlite3")
+
+# 재무제표는 분기마다 바뀌므로 하루 동안은 저장된 스냅샷을 그대로 쓴다 (초)
+STATEMENT_MAX_AGE = 86400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS info (
+    ticker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value REAL,
+    text TEXT,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (ticker, field, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS info_field_date ON info (field, date, ticker);
+CREATE INDEX IF NOT EXISTS info_date ON info (date);
+
+CREATE TABLE IF NOT EXISTS statements (
+    ticker TEXT NOT NULL,
+    statement TEXT NOT NULL,
+    date TEXT NOT NULL,
+    item TEXT NOT NULL,
+    period TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    value REAL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (ticker, statement, date, item, period)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS statements_item ON statements (statement, item, period, ticker);
+CREATE INDEX IF NOT EXISTS statements_date ON statements (date);
+"""
+
+
+def _number(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return None if math.isnan(value) else float(value)
+
+
+def info_rows(info):
+    """기업정보 dict -> (항목, 숫자, 문자열) 목록 (목록/사전 값은 저장하지 않는다)"""
+    rows = []
+    for field, value in info.items():
+        if isinstance(value, (list, dict)) or value is None:
+            continue
+        number = _number(value)
+        rows.append((field, number, None if number is not None else str(value)))
+    return rows
+
+
+class SnapshotStore:
+    """티커/날짜별 기업정보, EPS/PER, 재무제표 스냅샷을 SQLite 에 쌓아 두고 로컬에서 조회
+
+    같은 날 다시 받으면 그날의 스냅샷을 덮어쓴다. 저장/조회 오류는 경고만 남기고 네트워크 경로로 넘긴다.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # 작업 스레드들이 함께 쓰므로 연결 하나를 잠금으로 보호
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _run(self, fn, default=None):
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    return fn(conn)
+            except (sqlite3.Error, OSError, ValueError, TypeError) as e:
+                # 저장소 문제(쓰기 불가 폴더, 손상된 파일, 변환 실패)는 네트워크 결과를 막지 않는다
+                print(f"재무 스냅샷 저장소 오류: {e}")
+                return default
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # 저장
+
+    def record_info(self, ticker, info, day=None):
+        day = (day or date.today()).isoformat()
+        now = time.time()
+        rows = [(ticker, day, field, number, text, now) for field, number, text in info_rows(info)]
+        tracing.count("snapshot.write")
+        self._run(lambda conn: conn.executemany(
+            "INSERT OR REPLACE INTO info VALUES (?, ?, ?, ?, ?, ?)", rows))
+
+    def record_per_eps(self, ticker, eps, per, day=None):
+        # 계산/스크래핑으로 채운 PER 도 남기도록 기업정보와 별도 항목으로 저장
+        self.record_info(ticker, {"eps": eps, "per": per}, day)
+
+    def record_statement(self, ticker, statement, frame, day=None):
+        if frame is None or frame.empty:
+            return
+        day = (day or date.today()).isoformat()
+        now = time.time()
+
+        def write(conn):
+            # 변환 오류도 _run 에서 경고로 끝나도록 안에서 변환
+            periods = [pd.Timestamp(column).date().isoformat() for column in frame.columns]
+            values = frame.to_numpy(dtype=float, na_value=float("nan"))
+            rows = [
+                (ticker, statement, day, str(item), period, position, _number(values[position, j]), now)
+                for position, item in enumerate(frame.index)
+                for j, period in enumerate(periods)
+            ]
+            conn.execute("DELETE FROM statements WHERE ticker = ? AND statement = ? AND date = ?",
+                         (ticker, statement, day))
+            conn.executemany("INSERT OR REPLACE INTO statements VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+        tracing.count("snapshot.write")
+        self._run(write)
+
+    # 최근 스냅샷 (네트워크 대신 쓰는 값)
+
+    def latest_per_eps(self, ticker, max_age):
+        """max_age 초 안에 저장된 (EPS, PER), 없으면 None"""
+        rows = self._run(lambda conn: conn.execute(
+            "SELECT field, value FROM info WHERE ticker = ? AND field IN ('eps', 'per') "
+            "AND fetched_at >= ? ORDER BY date",
+            (ticker, time.time() - max_age)).fetchall(), [])
+        values = dict(rows)
+        if values.get("eps") is None or values.get("per") is None:
+            return None
+        return values["eps"], values["per"]
+
+    def latest_statement(self, ticker, statement, max_age=STATEMENT_MAX_AGE):
+        """max_age 초 안에 저장된 재무제표 (항목 x 기간, 최신 기간이 왼쪽), 없으면 None"""
+        def read(conn):
+            day = conn.execute(
+                "SELECT MAX(date) FROM statements WHERE ticker = ? AND statement = ? AND fetched_at >= ?",
+                (ticker, statement, time.time() - max_age)).fetchone()[0]
+            if day is None:
+                return None
+            rows = conn.execute(
+                "SELECT item, period, value FROM statements "
+                "WHERE ticker = ? AND statement = ? AND date = ? ORDER BY position",
+                (ticker, statement, day)).fetchall()
+            if not rows:
+                return None
+            long = pd.DataFrame(rows, columns=["item", "period", "value"])
+            items = list(dict.fromkeys(long["item"]))
+            frame = long.pivot(index="item", columns="period", values="value").reindex(items)
+            frame.columns = pd.to_datetime(frame.columns)
+            frame = frame[sorted(frame.columns, reverse=True)]
+            frame.index.name = None
+            frame.columns.name = None
+            return frame.astype(float)
+
+        # 읽기/변환에 실패하면 None (네트워크에서 다시 받는다)
+        return self._run(read)
+
+    # 조회
+
+    def known_names(self):
+        """기업정보를 받은 적 있는 모든 티커의 (티커, 종목명)"""
+        return self._run(lambda conn: conn.execute(
+            "SELECT ticker, text FROM info WHERE field IN ('shortName', 'longName') AND text IS NOT NULL "
+            "GROUP BY ticker").fetchall(), [])
+
+    def series(self, ticker, field):
+        """한 종목의 항목 값 변화 (스냅샷 날짜 -> 값)"""
+        rows = self._run(lambda conn: conn.execute(
+            "SELECT date, value FROM info WHERE ticker = ? AND field = ? ORDER BY date",
+            (ticker, field)).fetchall(), [])
+        return pd.Series({pd.Timestamp(day): value for day, value in rows}, name=field, dtype=float)
+
+    def cross_section(self, field, day=None):
+        """모든 종목의 day(기본: 오늘) 이전 마지막 스냅샷 값 (티커 -> 값)"""
+        day = (day or date.today()).isoformat()
+        rows = self._run(lambda conn: conn.execute(
+            "SELECT i.ticker, i.value FROM info AS i "
+            "JOIN (SELECT ticker, MAX(date) AS date FROM info WHERE field = ? AND date <= ? GROUP BY ticker) AS last "
+            "ON i.ticker = last.ticker AND i.date = last.date "
+            "WHERE i.field = ? ORDER BY i.ticker",
+            (field, day, field)).fetchall(), [])
+        return pd.Series(dict(rows), name=field, dtype=float)
+
+    def statement_history(self, ticker, statement, item):
+        """재무제표 한 항목의 기간별 값 (기간마다 가장 최근 스냅샷 기준)"""
+        rows = self._run(lambda conn: conn.execute(
+            "SELECT period, value FROM statements WHERE ticker = ? AND statement = ? AND item = ? "
+            "ORDER BY date",
+            (ticker, statement, item)).fetchall(), [])
+        values = {}
+        for period, value in rows:
+            values[pd.Timestamp(period)] = value
+        return pd.Series(values, name=item, dtype=float).sort_index()
+
+    def period_changes(self, statement, item):
+        """종목별 최근 두 기간의 값과 변화 (예: quarterly_financials / Diluted EPS 로 지난 분기 EPS 증가 종목)"""
+        rows = self._run(lambda conn: conn.execute(
+            """
+            WITH latest AS (
+                SELECT ticker, period, value,
+                       ROW_NUMBER() OVER (PARTITION BY ticker, period ORDER BY date DESC) AS snapshot
+                FROM statements WHERE statement = ? AND item = ?
+            ), ranked AS (
+                SELECT ticker, period, value,
+                       ROW_NUMBER() OVER (PARTITION BY ticker ORDER BY period DESC) AS recent
+                FROM latest WHERE snapshot = 1 AND value IS NOT NULL
+            )
+            SELECT cur.ticker, cur.period, cur.value, prev.period, prev.value
+            FROM ranked AS cur JOIN ranked AS prev ON prev.ticker = cur.ticker AND prev.recent = 2
+            WHERE cur.recent = 1 ORDER BY cur.ticker
+            """, (statement, item)).fetchall(), [])
+        frame = pd.DataFrame(rows, columns=["ticker", "period", "value", "previous_period", "previous_value"])
+        frame["change"] = frame["value"] - frame["previous_value"]
+        return frame.set_index("ticker")
+
+
+# 모든 세션이 함께 쓰는 스냅샷 저장소
+default_store = SnapshotStore()
@@ -0,0 +1,96 @@
+"""창이 뜨기까지 걸리는 시간과 import 비용을 측정해 시작 시간 예산을 넘는지 확인
+
+    python startup_check.py [--budget-ms 500] [--top 15]
+
+예산을 넘거나, 창을 띄우기 전에 무거운 모듈이 import 되면 종료 코드 1 을 반환한다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# main.py import + 창 표시까지의 목표 시간 (밀리초)
+STARTUP_BUDGET_MS = 500
+
+# 창을 띄우기 전에는 import 되면 안 되는 모듈 (창을 띄운 뒤 백그라운드에서 불러온다)
+DEFERRED_MODULES = ("pandas", "numpy", "yfinance", "matplotlib", "plotly", "requests")
+
+# 새 인터프리터에서 main 을 import 하고 창을 띄우는 데 걸린 시간과, 그 시점에 로드된 모듈을 출력
+MEASURE_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+app = main.QApplication(sys.argv)
+window = main.StockAnalyzer()
+window.show()
+shown = time.perf_counter()
+loaded = sorted(name for name in sys.modules if name.split('.')[0] in {deferred!r})
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "window_ms": (shown - imported) * 1000,
+    "total_ms": (shown - start) * 1000,
+    "loaded": sorted({{name.split('.')[0] for name in loaded}}),
+}}))
+"""
+
+
+def run_python(args):
+    env = dict(os.environ)
+    # 화면이 없는 환경(CI 등)에서도 창을 만들 수 있도록
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__)), env=env)
+
+
+def import_times():
+    """-X importtime 결과를 (자체 시간, 누적 시간, 모듈 이름) 목록으로 반환 (마이크로초)"""
+    result = run_python(["-X", "importtime", "-c", "import main"])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def measure_window():
+    result = run_python(["-c", MEASURE_SCRIPT.format(deferred=DEFERRED_MODULES)])
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시작 시간 점검")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15, help="누적 import 시간 상위 몇 개를 보여줄지")
+    args = parser.parse_args(argv)
+
+    rows = import_times()
+    print(f"import main 누적 시간 상위 {args.top}개 (-X importtime)")
+    print(f"{'자체(ms)':>10} {'누적(ms)':>10}  모듈")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:10.1f} {cumulative_us / 1000:10.1f}  {name}")
+
+    timing = measure_window()
+    print()
+    print(f"main import: {timing['import_ms']:.0f} ms, 창 생성/표시: {timing['window_ms']:.0f} ms, "
+          f"합계: {timing['total_ms']:.0f} ms (예산 {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if timing["total_ms"] > args.budget_ms:
+        print("시작 시간 예산을 넘었습니다.")
+        failed = True
+    if timing["loaded"]:
+        print(f"창을 띄우기 전에 import 된 무거운 모듈: {', '.join(timing['loaded'])}")
+        failed = True
+    if not failed:
+        print("통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Qt 없이 실행하는 명령줄 도구
+
+    python stockist.py analyze AAPL MSFT --json
+    python stockist.py analyze AAPL MSFT NVDA --workers 4 --statement quarterly_financials
+    python stockist.py backtest AAPL MSFT NVDA --period 10y --strategy rsi --workers 4
+    python stockist.py history AAPL MSFT --field trailingPE
+    python stockist.py changes --statement quarterly_financials --item "Diluted EPS" --rising
+"""
+import argparse
+import json
+import sys
+
+import pandas as pd
+
+import backtest
+import core
+import snapshots
+import tracing
+import watchlist
+
+
+def fmt(value, prefix="", suffix=""):
+    # NaN/inf 는 json_value 에서 None 이 된다 (예: 상장 200일 미만 종목의 MA200)
+    return "N/A" if value is None else f"{prefix}{value:.2f}{suffix}"
+
+
+def format_report(report):
+    lines = [f"===== {report['ticker']} ====="]
+    info = report.get("info")
+    if info:
+        lines.append(f"회사명: {info['longName'] or 'N/A'} / 섹터: {info['sector'] or 'N/A'} / 산업: {info['industry'] or 'N/A'}")
+
+    technical = report.get("technical")
+    if technical:
+        lines.append(
+            f"현재가: {fmt(technical['price'], '$')}  RSI: {fmt(technical['rsi'])} ({technical['rsi_signal']})  "
+            f"MACD: {technical['macd_signal_text']}  MA20/50/200: "
+            f"{fmt(technical['ma20'])} / {fmt(technical['ma50'])} / {fmt(technical['ma200'])}")
+
+    valuation = report.get("valuation")
+    if valuation:
+        lines.append(
+            f"EPS: {fmt(valuation['eps'], '$')}  PER: {fmt(valuation['per'])}  성장률: {fmt(valuation['growth_rate'], suffix='%')}  "
+            f"적정주가: {fmt(valuation['suitable_price'], '$')}  괴리율: {fmt(valuation['discount'], suffix='%')}  "
+            f"판단: {valuation['category'] or 'N/A'}")
+
+    for name, records in report.get("statements", {}).items():
+        lines.append(f"{name}: {len(records)}개 기간")
+    for name, message in report.get("errors", {}).items():
+        lines.append(f"오류 ({name}): {message}")
+    return "\n".join(lines)
+
+
+def run_analyze(args):
+    tickers = watchlist.parse_tickers(" ".join(args.tickers))
+    statements = [] if args.no_statements else (args.statement or list(core.DEFAULT_STATEMENTS))
+    # trace 는 현재 프로세스에서만 기록되므로 --trace 이면 프로세스 풀을 쓰지 않는다
+    workers = 1 if args.trace else args.workers
+    reports = core.analyze_many(tickers, statements, args.industry_per, workers)
+    if args.trace:
+        tracing.tracer.export_chrome_trace(args.trace)
+
+    if args.json:
+        json.dump(reports, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print("\n\n".join(format_report(report) for report in reports))
+
+    # 모든 항목이 실패한 종목이 있으면 실패로 종료 (cron 등에서 확인용)
+    sections = ["info", "technical", "valuation", *statements]
+    failed = [report for report in reports
+              if "analyze" in report["errors"] or all(section in report["errors"] for section in sections)]
+    return 1 if failed else 0
+
+
+def run_backtest(args):
+    tickers = watchlist.parse_tickers(" ".join(args.tickers))
+    closes = {}
+    for chunk in watchlist.chunked(tickers, watchlist.DOWNLOAD_CHUNK):
+        try:
+            histories = watchlist.download_histories(chunk, period=args.period)
+        except (ValueError, ConnectionError) as e:
+            # 묶음 전체가 실패해도 나머지 묶음으로 계속 (실패한 종목은 아래 missing 에 표시)
+            print(f"시세 받기 실패 ({' '.join(chunk)}): {e}", file=sys.stderr)
+            continue
+        closes.update({ticker: hist["Close"] for ticker, hist in histories.items()})
+    missing = [ticker for ticker in tickers if ticker not in closes]
+    if missing:
+        print(f"시세를 받지 못한 종목: {' '.join(missing)}", file=sys.stderr)
+
+    strategies = args.strategy or list(backtest.STRATEGIES)
+    grids = {strategy: backtest.DEFAULT_GRIDS[strategy] for strategy in strategies}
+    results = backtest.backtest(closes, grids, cost=args.cost_bps / 10000, workers=args.workers)
+    if args.trace:
+        tracing.tracer.export_chrome_trace(args.trace)
+
+    table = results if args.per_ticker else backtest.summarize(results)
+    if args.json:
+        json.dump(json.loads(table.to_json(orient="records")), sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(table.head(args.top).to_string(index=False, float_format=lambda value: f"{value:.2f}"))
+    return 0 if closes else 1
+
+
+def print_table(frame, as_json):
+    if as_json:
+        json.dump(json.loads(frame.to_json(orient="index", date_format="iso")), sys.stdout,
+                  ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(frame.to_string(float_format=lambda value: f"{value:,.2f}"))
+
+
+def run_history(args):
+    # 네트워크 없이 로컬 스냅샷 저장소만 조회
+    store = snapshots.default_store
+    tickers = watchlist.parse_tickers(" ".join(args.tickers))
+    if args.statement:
+        frame = pd.DataFrame({ticker: store.statement_history(ticker, args.statement, args.field)
+                              for ticker in tickers})
+    else:
+        frame = pd.DataFrame({ticker: store.series(ticker, args.field) for ticker in tickers})
+    if frame.empty:
+        print("저장된 스냅샷이 없습니다.", file=sys.stderr)
+        return 1
+    print_table(frame, args.json)
+    return 0
+
+
+def run_changes(args):
+    frame = snapshots.default_store.period_changes(args.statement, args.item)
+    if args.rising:
+        frame = frame[frame["change"] > 0]
+    frame = frame.sort_values("change", ascending=False)
+    if frame.empty:
+        print("조건에 맞는 종목이 없습니다.", file=sys.stderr)
+        return 1
+    print_table(frame, args.json)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="stockist", description="Stockist 명령줄 분석 도구")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analyze = commands.add_parser("analyze", help="종목 분석 보고서")
+    analyze.add_argument("tickers", nargs="+", help="분석할 티커 (공백/쉼표 구분)")
+    analyze.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    analyze.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    analyze.add_argument("--industry-per", type=float, default=None, help="업종 평균 PER")
+    analyze.add_argument("--statement", action="append",
+                         help="포함할 재무제표 (financials, quarterly_financials, balance_sheet, cashflow 등, 여러 번 지정 가능)")
+    analyze.add_argument("--no-statements", action="store_true", help="재무제표 제외")
+    analyze.add_argument("--trace", help="단계별 실행 시간을 Chrome trace JSON 파일로 저장 (한 프로세스에서 실행)")
+    analyze.set_defaults(func=run_analyze)
+
+    test = commands.add_parser("backtest", help="RSI/MACD/볼린저 밴드 신호 백테스트")
+    test.add_argument("tickers", nargs="+", help="백테스트할 티커 (공백/쉼표 구분)")
+    test.add_argument("--period", default="10y", help="시세 기간 (yfinance period, 기본: 10y)")
+    test.add_argument("--strategy", action="append", choices=backtest.STRATEGIES,
+                      help="실행할 전략 (여러 번 지정 가능, 기본: 전체)")
+    test.add_argument("--cost-bps", type=float, default=0.0, help="매수/매도 한 번당 비용 (bp)")
+    test.add_argument("--workers", type=int, default=1, help="프로세스 수 (0: CPU 수)")
+    test.add_argument("--per-ticker", action="store_true", help="전략/파라미터 요약 대신 종목별 결과 출력")
+    test.add_argument("--top", type=int, default=20, help="표로 출력할 행 수")
+    test.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    test.add_argument("--trace", help="단계별 실행 시간을 Chrome trace JSON 파일로 저장")
+    test.set_defaults(func=run_backtest)
+
+    history = commands.add_parser("history", help="저장된 기업정보/재무제표 항목의 변화 (네트워크 없음)")
+    history.add_argument("tickers", nargs="+", help="조회할 티커 (공백/쉼표 구분)")
+    history.add_argument("--field", required=True,
+                         help="기업정보 항목 (trailingPE, trailingEps, eps, per 등) 또는 --statement 의 항목")
+    history.add_argument("--statement", help="재무제표 이름 (지정하면 --field 를 재무제표 항목으로 조회)")
+    history.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    history.set_defaults(func=run_history)
+
+    changes = commands.add_parser("changes", help="종목별 최근 두 기간의 재무제표 항목 변화 (네트워크 없음)")
+    changes.add_argument("--statement", default="quarterly_financials", help="재무제표 이름")
+    changes.add_argument("--item", default="Diluted EPS", help="재무제표 항목")
+    changes.add_argument("--rising", action="store_true", help="증가한 종목만")
+    changes.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    changes.set_defaults(func=run_changes)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+import bisect
+import os
+import re
+import threading
+import time
+
+import snapshots
+import tracing
+
+SYMBOLS_PATH = os.path.join(os.path.expanduser("~"), ".stockist", "symbols.tsv")
+# 상장 종목 목록은 자주 바뀌지 않으므로 일주일 동안 저장된 목록을 쓴다 (초)
+SYMBOLS_MAX_AGE = 7 * 86400
+REQUEST_TIMEOUT = 10
+
+# 미국 상장 종목 전체 (NASDAQ Trader 심볼 디렉터리, '|' 구분)
+SOURCES = (
+    "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt",
+    "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt",
+)
+
+SUGGESTION_LIMIT = 10
+# 이름 단어 범위에서 살펴볼 최대 후보 수 (흔한 단어/여러 단어 입력도 1ms 안에 끝나도록)
+MAX_CANDIDATES = 200
+
+TICKER_PATTERN = re.compile(r"^[A-Z0-9^][A-Z0-9.\-=^]{0,14}$")
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def is_valid_format(ticker):
+    return bool(TICKER_PATTERN.match(ticker))
+
+
+def is_listed_elsewhere(ticker):
+    """거래소 접미사/지수/환율 티커 (예: 005930.KS, ^GSPC, KRW=X)는 미국 종목 목록에 없으므로 비슷한 티커를 제안하지 않는다"""
+    return any(mark in ticker for mark in ".^=")
+
+
+def name_words(name):
+    return WORD_PATTERN.findall(name.lower())
+
+
+def typo_variants(word):
+    """오타 하나를 고친 후보: 이웃한 두 글자 바꾸기, 한 글자 빼기, 끝을 줄인 접두사 (최소 3글자)"""
+    variants = [word[:i] + word[i + 1] + word[i] + word[i + 2:] for i in range(len(word) - 1)]
+    variants += [word[:i] + word[i + 1:] for i in range(len(word))]
+    variants += [word[:n] for n in range(len(word) - 1, 2, -1)]
+    return [variant for variant in dict.fromkeys(variants) if len(variant) >= 3 and variant != word]
+
+
+def parse_directory(text):
+    """NASDAQ Trader 심볼 디렉터리 -> [(Yahoo 티커, 종목명)] (테스트 종목/우선주 제외)"""
+    lines = text.splitlines()
+    if not lines:
+        return []
+    header = lines[0].split("|")
+    symbol_col = header.index("Symbol") if "Symbol" in header else header.index("ACT Symbol")
+    name_col = header.index("Security Name")
+    test_col = header.index("Test Issue") if "Test Issue" in header else None
+    rows = []
+    for line in lines[1:]:
+        fields = line.split("|")
+        # 마지막 줄은 "File Creation Time: ..."
+        if len(fields) < len(header) or line.startswith("File Creation Time"):
+            continue
+        if test_col is not None and fields[test_col] == "Y":
+            continue
+        symbol = fields[symbol_col]
+        if "$" in symbol:
+            continue
+        # 클래스 주식은 Yahoo 에서 '-' 로 쓴다 (BRK.B -> BRK-B)
+        rows.append((symbol.replace(".", "-").replace("/", "-"), fields[name_col]))
+    return rows
+
+
+class SymbolIndex:
+    """티커/종목명 접두사 검색용 정렬 배열 인덱스
+
+    티커는 정렬된 배열에서 bisect 로 접두사 범위를 찾고, 종목명은 (단어, 종목 번호) 정렬 배열로
+    "micro" -> Microsoft, Micron 처럼 이름의 어느 단어든 앞부분으로 찾는다 ("glob ene" 처럼 여러 단어도 된다).
+    """
+
+    def __init__(self, entries=()):
+        names = {}
+        for symbol, name in entries:
+            symbol = symbol.strip().upper()
+            if symbol and (symbol not in names or not names[symbol]):
+                names[symbol] = name.strip()
+        self.symbols = sorted(names)
+        self.names = [names[symbol] for symbol in self.symbols]
+        self._symbol_set = set(self.symbols)
+        words = [name_words(name) for name in self.names]
+        # " apple inc common stock" 에서 " 단어" 를 찾으면 이름의 어느 단어가 그 단어로 시작하는지 알 수 있다
+        self._joined = [" " + " ".join(w) for w in words]
+        # 이름 첫 단어 인덱스와 모든 단어 인덱스 (단어, 종목 번호) 정렬 배열
+        first = sorted((w[0], i) for i, w in enumerate(words) if w)
+        self.first_keys = [word for word, _ in first]
+        self.first_ids = [i for _, i in first]
+        pairs = sorted((word, i) for i, w in enumerate(words) for word in set(w[1:]) - {w[0]})
+        self.word_keys = [word for word, _ in pairs]
+        self.word_ids = [i for _, i in pairs]
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, ticker):
+        return ticker in self._symbol_set
+
+    def name(self, ticker):
+        pos = bisect.bisect_left(self.symbols, ticker)
+        if pos < len(self.symbols) and self.symbols[pos] == ticker:
+            return self.names[pos]
+        return None
+
+    @staticmethod
+    def _range(keys, prefix):
+        return bisect.bisect_left(keys, prefix), bisect.bisect_left(keys, prefix + "\uffff")
+
+    def _collect(self, keys, ids, words, rank, ranked, limit):
+        """words[0] 으로 시작하는 범위에서 나머지 단어도 이름에 있는 종목을 limit 개까지 모으고, 살펴본 후보 수를 반환"""
+        start, end = self._range(keys, words[0])
+        candidates = ids[start:min(end, start + MAX_CANDIDATES)]
+        joined = self._joined
+        rest = [" " + word for word in words[1:]]
+        for scanned, i in enumerate(candidates):
+            if len(ranked) >= limit:
+                return scanned
+            if i in ranked:
+                continue
+            # 두 단어 입력이 가장 흔하므로 생성기 없이 바로 검사
+            if len(rest) == 1 and rest[0] not in joined[i]:
+                continue
+            if len(rest) > 1 and not all(word in joined[i] for word in rest):
+                continue
+            ranked[i] = rank
+        return len(candidates)
+
+    def search(self, query, limit=SUGGESTION_LIMIT):
+        """입력과 맞는 (티커, 종목명) 목록: 티커 일치 > 티커 접두사 > 이름 첫 단어 > 이름 다른 단어 > 오타 교정 순"""
+        query = query.strip()
+        if not query or not self.symbols:
+            return []
+        with tracing.span("symbol search", "compute"):
+            ranked = {}
+            prefix = query.upper()
+            start, end = self._range(self.symbols, prefix)
+            for i in range(start, min(end, start + limit)):
+                ranked[i] = 0 if self.symbols[i] == prefix else 1
+
+            words = name_words(query)
+            if words:
+                self._collect(self.first_keys, self.first_ids, words, 2, ranked, limit)
+                self._collect(self.word_keys, self.word_ids, words, 3, ranked, limit)
+                if not ranked and len(words[-1]) > 3:
+                    # 맞는 것이 없으면 마지막 단어의 오타를 하나 고쳐서 다시 찾는다 ("appel" -> Apple)
+                    budget = MAX_CANDIDATES
+                    for variant in typo_variants(words[-1]):
+                        fixed = [*words[:-1], variant]
+                        for keys, ids, rank in ((self.first_keys, self.first_ids, 4),
+                                                (self.word_keys, self.word_ids, 5)):
+                            if len(ranked) < limit and budget > 0:
+                                budget -= self._collect(keys, ids, fixed, rank, ranked, limit)
+
+            # 같은 순위에서는 짧은 티커(대개 더 잘 알려진 종목)를 먼저
+            best = sorted(ranked, key=lambda i: (ranked[i], len(self.symbols[i]), self.symbols[i]))[:limit]
+            return [(self.symbols[i], self.names[i]) for i in best]
+
+    def closest(self, ticker, n=3):
+        """목록에 없는 티커와 비슷한 티커 (오타 제안, 검증 실패 때만 쓰므로 느려도 된다)"""
+        import difflib
+
+        # 첫 글자는 맞게 쳤다고 보고 같은 글자로 시작하는 티커 중에서 찾는다
+        start, end = self._range(self.symbols, ticker[:1])
+        pool = self.symbols[start:end]
+        return difflib.get_close_matches(ticker, pool, n=n, cutoff=0.6)
+
+
+def validate(ticker):
+    """네트워크 요청 전에 형식만 검사 (종목 목록은 참고용: 암호화폐, OTC, 펀드 등 목록에 없는 티커도 있다)"""
+    if not is_valid_format(ticker):
+        raise ValueError(f"티커 형식이 올바르지 않습니다: '{ticker}'")
+
+
+def suggestions(ticker, index=None, n=3):
+    """요청이 실패한 티커와 비슷한 목록의 티커 (목록에 있거나 목록으로 판단할 수 없으면 빈 목록)"""
+    if index is None or ticker in index or is_listed_elsewhere(ticker):
+        return []
+    return index.closest(ticker, n) or [symbol for symbol, _ in index.search(ticker, n)]
+
+
+def suggestion_hint(ticker, index=None):
+    found = suggestions(ticker, index)
+    return f"혹시 {', '.join(found)} 인가요?" if found else ""
+
+
+def read_cache(path):
+    with open(path, encoding="utf-8") as f:
+        return [tuple(line.rstrip("\n").split("\t", 1)) for line in f if "\t" in line]
+
+
+def write_cache(path, entries):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(f"{symbol}\t{name}\n" for symbol, name in entries)
+    os.replace(tmp_path, path)
+
+
+class SymbolUniverse:
+    """종목 목록을 로컬 파일에 받아 두고 인덱스를 만들어 주는 곳
+
+    파일이 max_age 보다 오래됐으면 다시 받고, 받기에 실패하면 오래된 파일이라도 쓴다.
+    스냅샷 저장소에 기업정보가 있는 티커(미국 외 종목 포함)도 함께 넣는다.
+    """
+
+    def __init__(self, path=SYMBOLS_PATH, max_age=SYMBOLS_MAX_AGE, http=None, store=None):
+        self.path = path
+        self.max_age = max_age
+        self._http = http
+        self._store = store
+        self._index = None
+        self._lock = threading.Lock()
+
+    @property
+    def http(self):
+        if self._http is None:
+            from yahoo import create_http_session
+            self._http = create_http_session(pool_size=1)
+        return self._http
+
+    @property
+    def store(self):
+        return self._store if self._store is not None else snapshots.default_store
+
+    @property
+    def index(self):
+        """불러온 인덱스 (아직 안 불러왔으면 None)"""
+        return self._index
+
+    def download(self):
+        entries = []
+        for url in SOURCES:
+            tracing.count("symbols.download")
+            response = self.http.get(url, timeout=REQUEST_TIMEOUT)
+            if response.status_code != 200:
+                raise ConnectionError(f"종목 목록을 받을 수 없습니다 (HTTP {response.status_code}): {url}")
+            entries.extend(parse_directory(response.text))
+        if not entries:
+            raise ValueError("받은 종목 목록이 비어 있습니다.")
+        return entries
+
+    def _cached_entries(self):
+        try:
+            fresh = time.time() - os.path.getmtime(self.path) < self.max_age
+            return read_cache(self.path), fresh
+        except OSError:
+            return [], False
+
+    def load(self):
+        """종목 인덱스를 만들어 반환 (작업 스레드에서 호출)"""
+        with self._lock:
+            if self._index is not None:
+                return self._index
+            with tracing.span("load symbols", "io"):
+                entries, fresh = self._cached_entries()
+                if not fresh:
+                    try:
+                        entries = self.download()
+                        write_cache(self.path, entries)
+                    except (OSError, ValueError) as e:
+                        print(f"종목 목록 갱신 실패 (저장된 목록 사용): {e}")
+                entries = entries + self.store.known_names()
+            with tracing.span("build symbol index", "compute", symbols=len(entries)):
+                self._index = SymbolIndex(entries)
+            return self._index
+
+
+# 앱 전체가 함께 쓰는 종목 목록
+default_universe = SymbolUniverse()
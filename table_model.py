@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+def format_amount(value):
+    return f"${value:,.0f}" if not np.isnan(value) else "N/A"
+
+
+def header_label(value):
+    return value.strftime('%Y-%m-%d') if hasattr(value, "strftime") else str(value)
+
+
+class DataFrameModel(QAbstractTableModel):
+    """DataFrame 의 NumPy 값 배열을 그대로 감싸는 읽기 전용 모델. 셀 문자열은 화면에 보일 때만 만든다"""
+
+    def __init__(self, parent=None, formatter=format_amount):
+        super().__init__(parent)
+        self.formatter = formatter
+        self.values = np.empty((0, 0))
+        self.row_labels = []
+        self.column_labels = []
+
+    def set_frame(self, frame):
+        # 숫자가 아닌 값(None 등)은 NaN 으로 바꿔 float 배열 하나로 보관
+        values = frame.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+        self.beginResetModel()
+        self.values = values
+        self.row_labels = [str(label) for label in frame.index]
+        self.column_labels = [header_label(label) for label in frame.columns]
+        self.endResetModel()
+
+    def clear(self):
+        self.set_frame(pd.DataFrame())
+
+    def widest_text(self):
+        """가장 긴 셀 문자열 (열 너비 계산용, 모든 셀을 포맷하지 않고 절댓값 최대/최소값만 확인)"""
+        finite = self.values[np.isfinite(self.values)]
+        if finite.size == 0:
+            return self.formatter(np.nan)
+        return max((self.formatter(finite.min()), self.formatter(finite.max())), key=len)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.values.shape[0]
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.values.shape[1]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.formatter(self.values[index.row(), index.column()])
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.column_labels[section]
+        return self.row_labels[section]
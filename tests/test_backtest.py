@@ -0,0 +1,114 @@
+import math
+
+import numpy as np
+import pytest
+
+import backtest
+import fake_provider
+import indicators
+
+COST = 0.001
+
+
+def loop_positions(entries, exits):
+    """봉마다 진입/청산 신호를 따라가는 보유 여부 (hold_between 의 기준 구현)"""
+    holding = False
+    positions = []
+    for entry, exit_ in zip(entries, exits):
+        if exit_:
+            holding = False
+        elif entry:
+            holding = True
+        positions.append(holding)
+    return positions
+
+
+def loop_evaluate(closes, positions, cost):
+    """한 종목의 성과를 봉 하나씩 계산 (evaluate 의 기준 구현)"""
+    equity = peak = 0.0
+    max_drawdown = 0.0
+    trades = []
+    entry_equity = None
+    held_bars = 0
+    buy_hold = 0.0
+    n = len(closes)
+    for t in range(n):
+        ret = math.log(closes[t] / closes[t - 1]) if t > 0 else 0.0
+        buy_hold += ret
+        held = positions[t - 1] if t > 0 else False
+        held_bars += held
+        step = ret if held else 0.0
+        if positions[t] != held:
+            step += math.log1p(-cost)
+        if positions[t] and not held:
+            entry_equity = equity
+        equity += step
+        peak = max(peak, equity)
+        max_drawdown = min(max_drawdown, equity - peak)
+        if (held and not positions[t]) or (t == n - 1 and positions[t]):
+            trades.append(equity - entry_equity)
+
+    wins = sum(trade > 0 for trade in trades)
+    return {
+        "total_return": math.expm1(equity) * 100,
+        "annual_return": math.expm1(equity * backtest.TRADING_DAYS / max(n - 1, 1)) * 100,
+        "buy_hold_return": math.expm1(buy_hold) * 100,
+        "max_drawdown": math.expm1(max_drawdown) * 100,
+        "hit_rate": wins / len(trades) * 100 if trades else math.nan,
+        "trades": len(trades),
+        "exposure": held_bars / n * 100,
+    }
+
+
+def loop_signals(strategy, close, params):
+    if strategy == "rsi":
+        values = indicators.rsi(close, params["window"])
+        return loop_positions(values < params["lower"], values > params["upper"])
+    if strategy == "macd":
+        macd_line, signal_line = indicators.macd(close, params["fast"], params["slow"], params["signal"])
+        return list(macd_line > signal_line)
+    sums = indicators.RollingSums(close[None, :])
+    middle, std = sums.mean(params["window"])[0], sums.std(params["window"])[0]
+    return loop_positions(close < middle - params["dev"] * std, close > middle + params["dev"] * std)
+
+
+@pytest.fixture(scope="module")
+def closes():
+    # 길이가 다른 종목도 섞는다 (앞쪽을 NaN 으로 채워 쌓인다)
+    return {ticker: fake_provider.synthetic_ohlcv(ticker, bars)["Close"]
+            for ticker, bars in (("AAPL", 500), ("MSFT", 500), ("NEW", 180))}
+
+
+@pytest.mark.parametrize("cost", [0.0, COST])
+def test_backtest_matches_per_bar_loop(closes, cost):
+    results = backtest.backtest(closes, backtest.DEFAULT_GRIDS, cost=cost)
+    expected_rows = len(closes) * sum(len(backtest.param_grid(grid)) for grid in backtest.DEFAULT_GRIDS.values())
+    assert len(results) == expected_rows
+
+    for strategy, grid in backtest.DEFAULT_GRIDS.items():
+        for params in backtest.param_grid(grid):
+            label = backtest.params_label(params)
+            for ticker, series in closes.items():
+                close = series.to_numpy()
+                expected = loop_evaluate(close, loop_signals(strategy, close, params), cost)
+                row = results[(results.ticker == ticker) & (results.strategy == strategy)
+                              & (results.params == label)].iloc[0]
+                for metric, value in expected.items():
+                    assert row[metric] == pytest.approx(value, rel=1e-9, abs=1e-9, nan_ok=True), \
+                        f"{ticker} {strategy} {label} {metric}"
+
+
+def test_process_pool_matches_single_process(closes):
+    grids = {"rsi": {"window": [14], "lower": [30], "upper": [70]}, "macd": {"fast": [12], "slow": [26], "signal": [9]}}
+    single = backtest.backtest(closes, grids)
+    pooled = backtest.backtest(closes, grids, workers=2)
+    np.testing.assert_allclose(pooled[list(backtest.METRICS)].to_numpy(dtype=float),
+                               single[list(backtest.METRICS)].to_numpy(dtype=float), equal_nan=True)
+
+
+def test_hold_between_matches_loop():
+    rng = np.random.default_rng(1)
+    entries = rng.random((4, 300)) < 0.05
+    exits = rng.random((4, 300)) < 0.05
+    for row in range(4):
+        assert list(backtest.hold_between(entries[row], exits[row])) == loop_positions(entries[row], exits[row])
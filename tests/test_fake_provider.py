@@ -0,0 +1,40 @@
+import os
+
+import yfinance as yf
+
+import alerts
+import core
+import fake_provider
+import fonts
+import market_data
+import snapshots
+import stockist
+
+
+def test_installed_redirects_and_restores_globals():
+    saved = (yf.Ticker, yf.download, market_data.default_cache, snapshots.default_store,
+             alerts.ALERTS_PATH, fonts.FONT_CACHE_PATH)
+    with fake_provider.installed():
+        cache_dir = market_data.default_cache.cache_dir
+        assert yf.Ticker is fake_provider.FakeTicker
+        assert os.path.dirname(alerts.ALERTS_PATH) == cache_dir
+        assert os.path.dirname(fonts.FONT_CACHE_PATH) == cache_dir
+    assert (yf.Ticker, yf.download, market_data.default_cache, snapshots.default_store,
+            alerts.ALERTS_PATH, fonts.FONT_CACHE_PATH) == saved
+
+
+def test_analyze_runs_offline():
+    with fake_provider.installed():
+        report = core.analyze("AAPL")
+    assert report["errors"] == {}
+    assert set(report) >= {"info", "technical", "valuation", "statements"}
+    assert set(report["statements"]) == set(core.DEFAULT_STATEMENTS)
+    # 같은 티커는 항상 같은 가짜 데이터
+    with fake_provider.installed():
+        assert core.analyze("AAPL")["technical"] == report["technical"]
+
+
+def test_cli_exit_status(capsys):
+    with fake_provider.installed():
+        assert stockist.main(["analyze", "--workers", "1", "AAPL", "MSFT"]) == 0
+    assert "AAPL" in capsys.readouterr().out
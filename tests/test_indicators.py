@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import fake_provider
+import indicators
+
+ta = pytest.importorskip("ta")
+
+TOLERANCE = 1e-8
+
+
+def reference(close):
+    """ta 라이브러리로 계산한 같은 지표 (NumPy 엔진으로 바꾸기 전 구현)"""
+    macd = ta.trend.MACD(close, indicators.MACD_SLOW, indicators.MACD_FAST, indicators.MACD_SIGNAL)
+    bb = ta.volatility.BollingerBands(close, indicators.BB_WINDOW, indicators.BB_DEV)
+    result = {
+        "price": close,
+        "rsi": ta.momentum.RSIIndicator(close, indicators.RSI_WINDOW).rsi(),
+        "macd": macd.macd(),
+        "macd_signal": macd.macd_signal(),
+        "bb_upper": bb.bollinger_hband(),
+        "bb_middle": bb.bollinger_mavg(),
+        "bb_lower": bb.bollinger_lband(),
+    }
+    for window in indicators.MA_WINDOWS:
+        result[f"ma{window}"] = ta.trend.SMAIndicator(close, window).sma_indicator()
+    return {name: series.to_numpy() for name, series in result.items()}
+
+
+def assert_matches(actual, expected):
+    assert set(actual) == set(expected)
+    for name in expected:
+        np.testing.assert_array_equal(np.isnan(actual[name]), np.isnan(expected[name]), err_msg=name)
+        np.testing.assert_allclose(actual[name], expected[name], rtol=0, atol=TOLERANCE, equal_nan=True, err_msg=name)
+
+
+@pytest.mark.parametrize("bars", [30, 250, 1260])
+def test_compute_indicators_matches_ta(bars):
+    close = fake_provider.synthetic_ohlcv("AAPL", bars)["Close"]
+    assert_matches(indicators.compute_indicators(close.to_numpy()), reference(close))
+
+
+def test_batch_rows_match_single_ticker():
+    # 길이가 다른 종목은 앞쪽을 NaN 으로 채워 쌓으므로 각 행의 유효 구간이 단일 종목 계산과 같아야 한다
+    closes = [fake_provider.synthetic_ohlcv(ticker, bars)["Close"].to_numpy()
+              for ticker, bars in (("AAPL", 300), ("MSFT", 120), ("NVDA", 260))]
+    batch = indicators.compute_indicators(indicators.stack_closes(closes))
+    for row, close in enumerate(closes):
+        single = indicators.compute_indicators(close)
+        for name, values in single.items():
+            np.testing.assert_allclose(batch[name][row, -len(close):], values, rtol=0, atol=TOLERANCE,
+                                       equal_nan=True, err_msg=name)
+
+
+def test_gaps_match_ta():
+    # 중간에 빠진 봉(NaN)이 있어도 ta 와 같게 건너뛴다
+    close = fake_provider.synthetic_ohlcv("GAP", 300)["Close"].copy()
+    close.iloc[[50, 51, 140]] = np.nan
+    actual = indicators.compute_indicators(close.to_numpy())
+    expected = reference(close)
+    for name in ("rsi", "macd", "macd_signal"):
+        np.testing.assert_allclose(actual[name], expected[name], rtol=0, atol=TOLERANCE, equal_nan=True,
+                                   err_msg=name)
+
+
+def test_latest_is_last_bar():
+    close = pd.Series(np.linspace(100, 120, 60))
+    values = indicators.compute_indicators(close.to_numpy())
+    last = indicators.latest(values)
+    assert last["price"] == pytest.approx(120)
+    assert last["ma20"] == pytest.approx(close.iloc[-20:].mean())
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import resample
+
+TZ = "America/New_York"
+
+
+def session_bars(days, freq="15min", tz=TZ):
+    """정규장(9:30~16:00) 분봉 OHLCV. 값은 봉 번호로 채워 묶인 결과를 쉽게 확인할 수 있게 한다"""
+    index = pd.DatetimeIndex([])
+    for day in days:
+        start = pd.Timestamp(f"{day} 09:30", tz=tz)
+        index = index.append(pd.date_range(start, pd.Timestamp(f"{day} 15:59", tz=tz), freq=freq))
+    n = len(index)
+    values = np.arange(n, dtype=float)
+    return pd.DataFrame({
+        "Open": values + 0.1,
+        "High": values + 0.5,
+        "Low": values - 0.5,
+        "Close": values,
+        "Volume": np.full(n, 10.0),
+    }, index=index)
+
+
+def test_hourly_buckets_start_at_session_open():
+    hist = session_bars(["2026-03-02", "2026-03-03"])
+    hourly = resample.resample_ohlcv(hist, "15m", "1h")
+
+    times = [ts.strftime("%H:%M") for ts in hourly.index[:7]]
+    assert times == ["09:30", "10:30", "11:30", "12:30", "13:30", "14:30", "15:30"]
+    # 둘째 날도 장 시작부터 다시 센다
+    assert hourly.index[7] == pd.Timestamp("2026-03-03 09:30", tz=TZ)
+    assert len(hourly) == 14
+
+
+def test_ohlcv_aggregation():
+    hist = session_bars(["2026-03-02"])
+    hourly = resample.resample_ohlcv(hist, "15m", "1h")
+    first = hist.iloc[:4]
+    assert hourly["Open"].iloc[0] == first["Open"].iloc[0]
+    assert hourly["High"].iloc[0] == first["High"].max()
+    assert hourly["Low"].iloc[0] == first["Low"].min()
+    assert hourly["Close"].iloc[0] == first["Close"].iloc[-1]
+    assert hourly["Volume"].iloc[0] == first["Volume"].sum()
+    # 마지막 구간(15:30~16:00)은 봉 2개뿐
+    assert hourly["Volume"].iloc[-1] == 20
+    assert hourly["Volume"].sum() == hist["Volume"].sum()
+
+
+def test_daily_buckets_use_exchange_local_date():
+    hist = session_bars(["2026-03-02", "2026-03-03"])
+    daily = resample.resample_ohlcv(hist, "15m", "1d")
+    # 일봉 시각은 UTC 가 아닌 거래소 현지 날짜의 0시
+    assert list(daily.index) == [pd.Timestamp("2026-03-02", tz=TZ), pd.Timestamp("2026-03-03", tz=TZ)]
+    assert daily["Close"].iloc[0] == hist.loc["2026-03-02", "Close"].iloc[-1]
+
+
+def test_weekly_buckets_start_on_monday():
+    index = pd.bdate_range("2026-03-04", periods=10, tz=TZ)  # 수요일부터
+    hist = pd.DataFrame({"Open": 1.0, "High": 2.0, "Low": 0.5, "Close": np.arange(10.0), "Volume": 1.0}, index=index)
+    weekly = resample.resample_ohlcv(hist, "1d", "1wk")
+    assert all(ts.weekday() == 0 for ts in weekly.index)
+    assert list(weekly.index.date.astype(str)) == ["2026-03-02", "2026-03-09", "2026-03-16"]
+    assert list(weekly["Volume"]) == [3.0, 5.0, 2.0]
+    assert list(weekly["Close"]) == [2.0, 7.0, 9.0]
+
+
+def test_monthly_buckets_start_on_first_day():
+    index = pd.bdate_range("2026-01-15", "2026-03-10")
+    hist = pd.DataFrame({"Close": np.arange(len(index), dtype=float), "Volume": 1.0}, index=index)
+    monthly = resample.resample_ohlcv(hist, "1d", "1mo")
+    assert list(monthly.index) == [pd.Timestamp("2026-01-01"), pd.Timestamp("2026-02-01"), pd.Timestamp("2026-03-01")]
+    assert monthly["Volume"].sum() == len(index)
+
+
+def test_cannot_resample_to_finer_or_incompatible_bars():
+    assert not resample.can_resample("1h", "15m")
+    assert not resample.can_resample("1wk", "1mo")
+    assert resample.can_resample("15m", "1h")
+    hist = session_bars(["2026-03-02"], freq="1h")
+    with pytest.raises(ValueError):
+        resample.resample_ohlcv(hist, "1h", "15m")
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import result_cache
+from result_cache import ResultCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(result_cache, "time", fake)
+    return fake
+
+
+def block(kb):
+    return np.zeros(kb * 1024 // 8)
+
+
+def test_put_get_and_size_accounting(clock):
+    cache = ResultCache(max_bytes=1024 * 1024)
+    cache.put(("AAPL", "chart"), block(100))
+    assert cache.get(("AAPL", "chart")) is not None
+    assert cache.nbytes == 100 * 1024
+    cache.put(("AAPL", "chart"), block(50))
+    assert len(cache) == 1
+    assert cache.nbytes == 50 * 1024
+
+
+def test_evicts_least_recently_used_when_over_budget(clock):
+    cache = ResultCache(max_bytes=300 * 1024)
+    for ticker in ("A", "B", "C"):
+        cache.put((ticker, "chart"), block(100))
+    # A 를 다시 쓰면 가장 오래 안 쓴 것은 B
+    assert cache.get(("A", "chart")) is not None
+    cache.put(("D", "chart"), block(100))
+    assert cache.get(("B", "chart")) is None
+    assert all(cache.get((ticker, "chart")) is not None for ticker in ("A", "C", "D"))
+    assert cache.nbytes <= cache.max_bytes
+
+
+def test_entry_larger_than_budget_is_not_stored(clock):
+    cache = ResultCache(max_bytes=100 * 1024)
+    cache.put(("A", "chart"), block(50))
+    cache.put(("B", "chart"), block(200))
+    assert cache.get(("B", "chart")) is None
+    assert cache.get(("A", "chart")) is not None
+
+
+def test_ttl_expiry(clock):
+    cache = ResultCache(ttl=300)
+    cache.put(("AAPL", "info"), "text")
+    clock.now += 299
+    assert cache.get(("AAPL", "info")) == "text"
+    clock.now += 1
+    assert cache.get(("AAPL", "info")) is None
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_get_does_not_extend_ttl(clock):
+    cache = ResultCache(ttl=300)
+    cache.put(("AAPL", "info"), "text")
+    clock.now += 200
+    cache.get(("AAPL", "info"))
+    clock.now += 200
+    assert cache.get(("AAPL", "info")) is None
+
+
+def test_empty_results_are_not_cached(clock):
+    cache = ResultCache()
+    cache.put(("AAPL", "chart"), pd.DataFrame())
+    cache.put(("AAPL", "valuation"), None)
+    assert len(cache) == 0
+
+
+def test_invalidate_by_ticker(clock):
+    cache = ResultCache()
+    for key in (("AAPL", "info"), ("AAPL", "chart", "1년"), ("MSFT", "info")):
+        cache.put(key, "text")
+    cache.invalidate("AAPL")
+    assert cache.get(("AAPL", "info")) is None
+    assert cache.get(("AAPL", "chart", "1년")) is None
+    assert cache.get(("MSFT", "info")) == "text"
+    cache.invalidate()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
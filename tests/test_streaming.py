@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+import fake_provider
+import indicators
+
+TOLERANCE = 1e-9
+
+
+def assert_close(state, close):
+    """스트리밍 상태의 값이 전체 구간을 다시 계산한 마지막 봉 값과 같은지"""
+    expected = indicators.latest(indicators.compute_indicators(np.asarray(close, dtype=float)))
+    actual = state.values()
+    assert set(actual) == set(expected)
+    for name, value in expected.items():
+        if np.isnan(value):
+            assert np.isnan(actual[name]), name
+        else:
+            assert actual[name] == pytest.approx(float(value), rel=0, abs=TOLERANCE), name
+
+
+@pytest.fixture
+def close():
+    return fake_provider.synthetic_ohlcv("AAPL", 400)["Close"].to_numpy()
+
+
+def test_from_history_matches_full_recompute(close):
+    assert_close(indicators.IndicatorState.from_history(close), close)
+
+
+def test_update_matches_recompute_every_bar(close):
+    # 처음 몇 봉(지표가 아직 NaN)부터 200일 이동평균이 나온 뒤까지 봉마다 비교
+    state = indicators.IndicatorState()
+    for i, x in enumerate(close[:260]):
+        state.update(x)
+        assert_close(state, close[:i + 1])
+
+
+def test_replace_last_matches_recompute(close):
+    state = indicators.IndicatorState.from_history(close[:300])
+    live = close[:300].copy()
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        # 진행 중인 마지막 봉의 종가가 여러 번 바뀐 뒤 새 봉이 추가되는 흐름
+        live[-1] *= 1 + rng.normal(0, 0.01)
+        state.replace_last(live[-1])
+        assert_close(state, live)
+    state.update(close[300])
+    assert_close(state, np.r_[live, close[300]])
+
+
+def test_long_stream_does_not_drift():
+    close = fake_provider.synthetic_ohlcv("DRIFT", 5000)["Close"].to_numpy()
+    state = indicators.IndicatorState.from_history(close)
+    assert_close(state, close)
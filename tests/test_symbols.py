@@ -0,0 +1,98 @@
+import pytest
+
+import fake_provider
+import symbols
+from symbols import SymbolIndex
+
+ENTRIES = [
+    ("AAPL", "Apple Inc. - Common Stock"),
+    ("APLE", "Apple Hospitality REIT, Inc."),
+    ("APP", "Applovin Corporation"),
+    ("AMAT", "Applied Materials, Inc."),
+    ("PNPL", "Pineapple Energy Inc."),
+    ("MSFT", "Microsoft Corporation"),
+    ("MU", "Micron Technology, Inc."),
+    ("AMD", "Advanced Micro Devices, Inc."),
+    ("GE", "General Electric Company"),
+    ("GEV", "GE Vernova Inc."),
+    ("GLBE", "Global-E Online Ltd."),
+    ("GNE", "Genie Energy Ltd."),
+    ("brk-b", "Berkshire Hathaway Inc. "),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SymbolIndex(ENTRIES)
+
+
+def tickers(results):
+    return [symbol for symbol, _ in results]
+
+
+def test_exact_ticker_ranks_first(index):
+    assert tickers(index.search("GE"))[0] == "GE"
+    assert tickers(index.search("ge"))[:2] == ["GE", "GEV"]
+
+
+def test_ticker_prefix_before_name_words(index):
+    # 티커 접두사(AP...) > 이름 첫 단어(Apple...) 순, 같은 순위에서는 짧은 티커 먼저
+    assert tickers(index.search("ap")) == ["APP", "APLE", "AAPL", "AMAT"]
+
+
+def test_first_name_word_before_other_words(index):
+    # "micro": Microsoft/Micron 은 첫 단어, Advanced Micro Devices 는 두 번째 단어
+    assert tickers(index.search("micro")) == ["MU", "MSFT", "AMD"]
+
+
+def test_multi_word_query(index):
+    assert tickers(index.search("apple hosp")) == ["APLE"]
+    # 단어 순서는 상관없다
+    assert tickers(index.search("genie ener")) == ["GNE"]
+    assert tickers(index.search("energy gen")) == ["GNE"]
+    assert tickers(index.search("apple zzz")) == []
+
+
+def test_typo_is_corrected_only_without_matches(index):
+    found = tickers(index.search("appel"))
+    assert {"AAPL", "APLE"} <= set(found)
+    assert all(name.lower().startswith("appl") for name in map(index.name, found))
+    # 맞는 것이 있으면 오타 교정 결과는 섞지 않는다
+    assert tickers(index.search("apple")) == ["AAPL", "APLE"]
+    assert index.search("zzzzz") == []
+
+
+def test_limit_and_normalized_symbols(index):
+    assert len(index.search("a", limit=2)) == 2
+    assert "BRK-B" in index
+    assert index.name("BRK-B") == "Berkshire Hathaway Inc."
+
+
+def test_search_on_fake_directory_is_ordered():
+    directory = symbols.parse_directory(fake_provider.synthetic_directory(2000))
+    index = SymbolIndex(directory)
+    assert len(index) == 2000
+    assert tickers(index.search("AAPL"))[0] == "AAPL"
+    apple = index.search("apple")
+    assert "AAPL" in tickers(apple)
+    assert all(name.lower().startswith("apple") for _, name in apple)
+    # 같은 순위(이름 첫 단어)에서는 짧은 티커부터
+    assert [len(symbol) for symbol in tickers(apple)] == sorted(len(symbol) for symbol in tickers(apple))
+    results = index.search("micro", limit=10)
+    assert len(results) == 10
+    assert all("micro" in name.lower() for _, name in results)
+
+
+def test_validate_checks_format_only():
+    symbols.validate("ZZZZ")
+    symbols.validate("005930.KS")
+    with pytest.raises(ValueError):
+        symbols.validate("AA PL")
+
+
+def test_suggestions_only_for_unknown_us_tickers(index):
+    assert symbols.suggestions("AAPL", index) == []
+    assert symbols.suggestions("AAPK", index) == ["AAPL"]
+    assert symbols.suggestions("AAPK.KS", index) == []
+    assert symbols.suggestions("AAPK", None) == []
+    assert symbols.suggestion_hint("AAPK", index) == "혹시 AAPL 인가요?"
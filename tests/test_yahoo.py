@@ -0,0 +1,142 @@
+import threading
+import time
+
+import pytest
+
+import tracing
+import yahoo
+from yahoo import RateLimitError, YahooClient
+
+
+def wait_for_shared(before, waiting):
+    # 뒤따른 호출이 모두 진행 중인 요청을 기다리기 시작할 때까지
+    deadline = time.monotonic() + 5
+    while tracing.tracer.counters["yahoo.shared"] < before + waiting and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def make_client(**kwargs):
+    # 테스트에서는 속도 제한/백오프 대기 없이
+    return YahooClient(rate=1000, burst=1000, backoff=0, **kwargs)
+
+
+def test_concurrent_calls_with_same_key_share_one_request():
+    client = make_client()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "data"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(client.call(("info", "AAPL"), fetch)))
+    leader.start()
+    started.wait(5)
+    shared = tracing.tracer.counters["yahoo.shared"]
+    followers = [threading.Thread(target=lambda: results.append(client.call(("info", "AAPL"), fetch)))
+                 for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    wait_for_shared(shared, 4)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == ["data"] * 5
+    # 끝난 요청은 다시 보낸다
+    assert client.call(("info", "AAPL"), fetch) == "data"
+    assert len(calls) == 2
+
+
+def test_errors_are_shared_with_waiting_callers():
+    flights = yahoo.Singleflight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise ValueError("없는 티커")
+
+    errors = []
+
+    def call():
+        try:
+            flights.do("key", fail)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call)]
+    threads[0].start()
+    started.wait(5)
+    shared = tracing.tracer.counters["yahoo.shared"]
+    threads += [threading.Thread(target=call) for _ in range(2)]
+    for thread in threads[1:]:
+        thread.start()
+    wait_for_shared(shared, 2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert errors == ["없는 티커"] * 3
+
+
+def test_rate_limit_is_retried_and_slows_down():
+    client = make_client(max_retries=3)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("429 Too Many Requests")
+        return "ok"
+
+    assert client.call("history", flaky) == "ok"
+    assert len(attempts) == 3
+    # 429 두 번이면 속도를 두 번 절반으로 줄였다가 성공 한 번만큼 회복
+    assert client.limiter.rate == pytest.approx(1000 / 4 + yahoo.RATE_INCREASE)
+
+
+def test_persistent_rate_limit_raises_rate_limit_error():
+    client = make_client(max_retries=2)
+    attempts = []
+
+    def limited():
+        attempts.append(1)
+        raise RuntimeError("Too Many Requests. Rate limited. Try after a while.")
+
+    with pytest.raises(RateLimitError):
+        client.call("info", limited)
+    assert len(attempts) == 3
+
+
+def test_non_transient_errors_are_not_retried():
+    client = make_client(max_retries=3)
+    attempts = []
+
+    def missing():
+        attempts.append(1)
+        raise ValueError("데이터를 가져올 수 없습니다.")
+
+    with pytest.raises(ValueError):
+        client.call("history", missing)
+    assert len(attempts) == 1
+
+
+def test_backoff_uses_jittered_exponential_delay(monkeypatch):
+    client = YahooClient(rate=1000, burst=1000, backoff=1.0, max_backoff=3.0, max_retries=3)
+    delays = []
+    monkeypatch.setattr(yahoo.random, "uniform", lambda low, high: high)
+    monkeypatch.setattr(yahoo.time, "sleep", delays.append)
+
+    def down():
+        raise ConnectionError("connection reset")
+
+    with pytest.raises(ConnectionError):
+        client.call("info", down)
+    # 1, 2, 4 초지만 상한 3초
+    assert delays == [1.0, 2.0, 3.0]
@@ -0,0 +1,90 @@
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+
+# 보관하는 최근 구간(span) 수
+MAX_SPANS = 20000
+
+
+class Tracer:
+    """단계별 실행 시간(span)과 캐시 적중/실패 카운터를 모으는 기록기 (여러 스레드에서 호출 가능)"""
+
+    def __init__(self, max_spans=MAX_SPANS):
+        self.lock = threading.Lock()
+        self.spans = collections.deque(maxlen=max_spans)
+        self.counters = collections.Counter()
+        # 카운터 변화도 trace 에 남긴다 (시각, 이름, 값)
+        self.counter_events = collections.deque(maxlen=max_spans)
+        self.origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, name, category="", **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self.lock:
+                self.spans.append((name, category, start, end - start, threading.get_ident(),
+                                   threading.current_thread().name, args))
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] += n
+            self.counter_events.append((time.perf_counter(), name, self.counters[name]))
+
+    def reset(self):
+        with self.lock:
+            self.spans.clear()
+            self.counters.clear()
+            self.counter_events.clear()
+            self.origin = time.perf_counter()
+
+    def summary(self):
+        """이름별 (횟수, 합계 ms, 최대 ms, 마지막 ms) - 합계가 큰 순서"""
+        with self.lock:
+            spans = list(self.spans)
+        stats = {}
+        for name, category, _, duration, *_ in spans:
+            count, total, longest, _ = stats.get((category, name), (0, 0.0, 0.0, 0.0))
+            ms = duration * 1000
+            stats[(category, name)] = (count + 1, total + ms, max(longest, ms), ms)
+        return sorted(((category, name, *values) for (category, name), values in stats.items()),
+                      key=lambda row: row[3], reverse=True)
+
+    def chrome_trace(self):
+        """chrome://tracing / Perfetto 에서 열 수 있는 Trace Event 형식"""
+        with self.lock:
+            spans = list(self.spans)
+            counter_events = list(self.counter_events)
+            origin = self.origin
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for name, category, start, duration, tid, thread_name, args in spans:
+            threads[tid] = thread_name
+            events.append({
+                "name": name, "cat": category or "stockist", "ph": "X", "pid": pid, "tid": tid,
+                "ts": (start - origin) * 1e6, "dur": duration * 1e6,
+                "args": {key: str(value) for key, value in args.items()},
+            })
+        for at, name, value in counter_events:
+            events.append({"name": name, "ph": "C", "pid": pid, "tid": 0,
+                           "ts": (at - origin) * 1e6, "args": {"value": value}})
+        for tid, thread_name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": thread_name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+
+
+# 앱 전체가 함께 쓰는 기록기
+tracer = Tracer()
+span = tracer.span
+count = tracer.count
@@ -0,0 +1,115 @@
+import re
+
+import pandas as pd
+import yfinance as yf
+
+import analysis
+import tracing
+import fundamentals
+import yahoo
+from market_data import DAILY_PERIOD
+
+# yf.download 한 번에 받을 종목 수
+DOWNLOAD_CHUNK = 100
+
+
+def parse_tickers(text):
+    # 쉼표/공백/줄바꿈으로 구분된 티커를 중복 없이 순서대로 반환
+    tickers = []
+    for token in re.split(r"[\s,;]+", text.upper()):
+        if token and token not in tickers:
+            tickers.append(token)
+    return tickers
+
+
+def chunked(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def download_histories(tickers, period=DAILY_PERIOD):
+    """여러 종목의 일봉을 yf.download 한 번으로 받아 티커별로 나눠 반환"""
+    return yahoo.client.call(("download", tuple(tickers), period), lambda: _download_histories(tickers, period))
+
+
+def _download_histories(tickers, period):
+    with tracing.span("yahoo download", "network", tickers=len(tickers)):
+        data = yf.download(tickers, period=period, interval="1d", group_by="ticker",
+                           auto_adjust=True, threads=True, progress=False, session=yahoo.client.yf_session)
+
+    histories = {}
+    for ticker in tickers:
+        if isinstance(data.columns, pd.MultiIndex):
+            if ticker not in data.columns.get_level_values(0):
+                continue
+            hist = data[ticker]
+        else:
+            hist = data
+        hist = hist.dropna(subset=["Close"])
+        if not hist.empty:
+            histories[ticker] = hist
+
+    if tickers and not histories:
+        # yf.download 는 예외 대신 종목별 오류만 남기므로 전부 실패하면 그 사유를 올려보낸다
+        errors = set(getattr(yf.shared, "_ERRORS", {}).values())
+        message = " / ".join(errors) or "데이터를 가져올 수 없습니다."
+        # 요청 제한이면 재시도하고, 없는 티커 등은 바로 실패
+        if yahoo.is_rate_limited(message):
+            raise ConnectionError(message)
+        raise ValueError(message)
+    return histories
+
+
+def download_chunk(tickers):
+    """일봉 일괄 다운로드 + 묶음 전체의 기술적 지표를 한 번에 계산"""
+    histories = download_histories(tickers)
+    technicals = analysis.technical_indicators_batch(
+        {ticker: hist['Close'] for ticker, hist in histories.items()})
+    return histories, technicals
+
+
+def technical_row(ticker, values):
+    return {
+        "ticker": ticker,
+        "price": values["price"],
+        "rsi": values["rsi"],
+        "rsi_signal": analysis.rsi_signal(values["rsi"]),
+        "macd_signal": analysis.macd_signal(values["macd"], values["macd_signal"]),
+        "ma20": values["ma20"],
+        "ma50": values["ma50"],
+        "ma200": values["ma200"],
+    }
+
+
+def valuation_columns(price, suitable_price):
+    # 현재가가 바뀌면 적정주가는 그대로 두고 괴리율/판단만 다시 계산
+    return {
+        "suitable_price": suitable_price,
+        "discount": analysis.discount_ratio(price, suitable_price),
+        "category": analysis.valuation_category(price, suitable_price),
+    }
+
+
+def analyze_ticker(session, values=None):
+    """워치리스트 한 줄: 기술적 분석 탭과 같은 지표 + 적정주가"""
+    hist = session.daily_history()
+    close = hist['Close']
+    if values is None:
+        values = analysis.technical_indicators(close)
+
+    row = technical_row(session.ticker, values)
+
+    # 적정주가는 기업정보의 EPS/PER 로 계산 (종목마다 요청 1회, 캐시에 있으면 0회)
+    try:
+        eps, per = fundamentals.default_provider.per_eps(session)
+    except (ValueError, OSError):
+        return row
+
+    growth_rate = analysis.estimate_growth_rate(close, session.history(period="3mo")['Close'])
+    _, suitable_price = analysis.fair_price(eps, per, growth_rate)
+    row.update({
+        "eps": eps,
+        "per": per,
+        "growth_rate": growth_rate,
+    })
+    row.update(valuation_columns(values["price"], suitable_price))
+    return row
@@ -0,0 +1,110 @@
+import itertools
+import threading
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThread, QThreadPool, pyqtSignal, pyqtSlot
+
+import tracing
+
+
+class WorkerSignals(QObject):
+    # 작업 스레드에서 emit 되지만 GUI 스레드의 슬롯에서 처리된다 (작업 id, 결과)
+    finished = pyqtSignal(int, object)
+    error = pyqtSignal(int, str)
+
+
+class Worker(QRunnable):
+    """네트워크/계산 작업 하나를 스레드 풀에서 실행"""
+
+    def __init__(self, task_id, fn, signals, on_exit=None, name="task"):
+        super().__init__()
+        self.task_id = task_id
+        self.fn = fn
+        self.name = name
+        # signals 는 TaskRunner 가 소유 (작업이 끝나 GC 되어도 대기 중인 시그널이 사라지지 않도록)
+        self.signals = signals
+        self.on_exit = on_exit
+        self.cancelled = False
+        # 취소 시 tryTake 를 호출하므로 수명은 파이썬 쪽에서 관리
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self.cancelled = True
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            with tracing.span(self.name, "task"):
+                result = self.fn()
+        except Exception as e:
+            if not self.cancelled:
+                traceback.print_exc()
+                self.signals.error.emit(self.task_id, str(e))
+        else:
+            if not self.cancelled:
+                self.signals.finished.emit(self.task_id, result)
+        finally:
+            if self.on_exit is not None:
+                self.on_exit(self)
+
+
+class TaskRunner(QObject):
+    """채널(탭)별로 작업을 관리하고, 새 요청이 오면 이전 요청의 결과는 버린다"""
+
+    def __init__(self, parent=None, max_threads=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads or max(8, QThread.idealThreadCount()))
+        self.signals = WorkerSignals(self)
+        self.signals.finished.connect(self._handle_result)
+        self.signals.error.connect(self._handle_error)
+        self._ids = itertools.count()
+        self._workers = {}
+        self._callbacks = {}
+        # 풀에 들어간 작업은 실행이 끝날 때까지 참조를 유지 (도중에 GC 되면 크래시)
+        self._alive = set()
+        self._alive_lock = threading.Lock()
+
+    def _release(self, worker):
+        with self._alive_lock:
+            self._alive.discard(worker)
+
+    def cancel(self, channel=None):
+        channels = [channel] if channel is not None else list(self._workers)
+        for ch in channels:
+            for worker in self._workers.pop(ch, {}).values():
+                worker.cancel()
+                self._callbacks.pop(worker.task_id, None)
+                # 아직 시작하지 않은 작업은 큐에서 바로 제거
+                if self.pool.tryTake(worker):
+                    self._release(worker)
+
+    def submit(self, channel, fn, on_result, on_error=None):
+        task_id = next(self._ids)
+        worker = Worker(task_id, fn, self.signals, self._release, name=f"task {channel}")
+        self._workers.setdefault(channel, {})[task_id] = worker
+        self._callbacks[task_id] = (channel, on_result, on_error)
+
+        with self._alive_lock:
+            self._alive.add(worker)
+        self.pool.start(worker)
+        return worker
+
+    def _pop_callbacks(self, task_id):
+        # 취소된 작업의 늦은 결과는 콜백이 없으므로 버려진다
+        callbacks = self._callbacks.pop(task_id, None)
+        if callbacks is not None:
+            self._workers.get(callbacks[0], {}).pop(task_id, None)
+        return callbacks
+
+    def _handle_result(self, task_id, result):
+        callbacks = self._pop_callbacks(task_id)
+        if callbacks is not None:
+            callbacks[1](result)
+
+    def _handle_error(self, task_id, message):
+        callbacks = self._pop_callbacks(task_id)
+        if callbacks is not None and callbacks[2] is not None:
+            callbacks[2](message)
@@ -0,0 +1,204 @@
+import random
+import threading
+import time
+
+import tracing
+
+# 초당 요청 수 (요청 제한에 걸리면 줄였다가 성공할 때마다 조금씩 다시 늘린다)
+MAX_RATE = 8
+MIN_RATE = 0.5
+RATE_INCREASE = 0.25
+
+# 재시도 횟수와 지터 백오프 (초)
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+# 연결 풀 크기 (호스트별 유지 연결 수)
+POOL_SIZE = 8
+USER_AGENT = "Mozilla/5.0"
+
+RATE_LIMIT_MARKERS = ("Too Many Requests", "Rate limited", "429")
+
+# 일시적인 네트워크 오류를 내는 라이브러리 (이 모듈의 예외는 재시도)
+TRANSIENT_ERROR_MODULES = ("requests", "urllib3", "curl_cffi", "socket", "ssl")
+
+
+def is_rate_limited(message):
+    return any(marker.lower() in message.lower() for marker in RATE_LIMIT_MARKERS)
+
+
+def is_retryable(error):
+    if is_rate_limited(str(error)):
+        return True
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return type(error).__module__.split(".")[0] in TRANSIENT_ERROR_MODULES
+
+
+class RateLimitError(ConnectionError):
+    """재시도 후에도 Yahoo 요청 제한(429)이 풀리지 않음"""
+
+    def __init__(self, detail=""):
+        super().__init__(f"Yahoo 요청 제한(429 Too Many Requests)에 걸렸습니다. 잠시 후 다시 시도하세요. {detail}".strip())
+
+
+class RateLimiter:
+    """토큰 버킷 방식으로 초당 요청 수를 제한. 요청 제한에 걸리면 속도를 절반으로, 성공하면 조금씩 회복"""
+
+    def __init__(self, rate, burst, min_rate=MIN_RATE, increase=RATE_INCREASE):
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def slow_down(self):
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            # 쌓아 둔 토큰도 버려 바로 다음 요청이 몰리지 않게 한다
+            self.tokens = min(self.tokens, 0)
+
+    def speed_up(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+
+class Singleflight:
+    """같은 키로 동시에 들어온 요청은 한 번만 실행하고 결과(또는 예외)를 함께 받는다"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, fn):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = {"done": threading.Event(), "result": None, "error": None}
+
+        if not leader:
+            tracing.count("yahoo.shared")
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call["done"].set()
+
+
+def create_http_session(pool_size=POOL_SIZE):
+    """연결을 재사용(keep-alive)하는 requests.Session"""
+    # requests 는 HTTP 를 직접 쓸 때만 필요하므로 여기서 import
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    http = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    http.mount("https://", adapter)
+    http.mount("http://", adapter)
+    http.headers["User-Agent"] = USER_AGENT
+    return http
+
+
+def create_yfinance_session():
+    """yf.Ticker/yf.download 에 넘길 세션
+
+    yfinance 는 브라우저 TLS 지문을 흉내 내는 curl_cffi 세션을 쓰므로 같은 종류로 만든다
+    (requests 세션을 넘기면 Yahoo 가 요청을 막을 수 있다). curl_cffi 가 없으면 requests 세션.
+    """
+    try:
+        from curl_cffi import requests as curl_requests
+    except ImportError:
+        return create_http_session()
+    return curl_requests.Session(impersonate="chrome")
+
+
+class YahooClient:
+    """모든 Yahoo 요청이 지나가는 통로: 중복 요청 합치기 + 요청 속도 제한 + 지터 재시도 + 연결 재사용
+
+    연결은 두 세션이 나눠 쓴다: 시세 페이지/종목 목록은 requests 세션(http),
+    yfinance 요청은 curl_cffi 세션(yf_session). 둘 다 앱 전체에서 하나씩만 만든다.
+    """
+
+    def __init__(self, rate=MAX_RATE, burst=MAX_RATE, max_retries=MAX_RETRIES,
+                 backoff=BACKOFF_BASE, max_backoff=BACKOFF_MAX):
+        self.limiter = RateLimiter(rate, burst)
+        self.flights = Singleflight()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._http = None
+        self._yf_session = None
+        self._http_lock = threading.Lock()
+
+    @property
+    def http(self):
+        with self._http_lock:
+            if self._http is None:
+                self._http = create_http_session()
+            return self._http
+
+    @property
+    def yf_session(self):
+        with self._http_lock:
+            if self._yf_session is None:
+                self._yf_session = create_yfinance_session()
+            return self._yf_session
+
+    def call(self, key, fn):
+        """fn() 의 결과. 같은 key 로 진행 중인 요청이 있으면 그 결과를 함께 쓴다"""
+        return self.flights.do(key, lambda: self._call_with_retry(fn))
+
+    def _call_with_retry(self, fn):
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            tracing.count("yahoo.request")
+            try:
+                result = fn()
+            except Exception as e:
+                rate_limited = is_rate_limited(str(e))
+                if rate_limited:
+                    tracing.count("yahoo.rate_limited")
+                    self.limiter.slow_down()
+                if not is_retryable(e) or attempt == self.max_retries:
+                    if rate_limited and not isinstance(e, RateLimitError):
+                        raise RateLimitError(str(e)) from e
+                    raise
+                # full jitter: 동시에 실패한 요청들이 같은 시각에 다시 몰리지 않게 한다
+                delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+                tracing.count("yahoo.retry")
+                with tracing.span("yahoo retry wait", "network", attempt=attempt + 1):
+                    time.sleep(delay)
+            else:
+                self.limiter.speed_up()
+                return result
+
+
+# 앱 전체가 함께 쓰는 Yahoo 요청 통로
+client = YahooClient()